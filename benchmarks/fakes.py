@@ -0,0 +1,502 @@
+"""Offline stand-ins for the bot's external services.
+
+The container is wired exactly like in production, only the network edges
+are replaced: LLM adapters are registered through
+``LLMProvider.register_adapter``, aiogram gets a bot session that answers
+locally, Telethon and Phoenix get in-memory clients and Redis is fakeredis.
+"""
+
+import asyncio
+import base64
+import inspect
+import itertools
+import logging
+import math
+import os
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
+
+import structlog
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import TelegramMethod
+from aiogram.types import (
+    CallbackQuery,
+    Chat,
+    File,
+    Message,
+    PhotoSize,
+    Update,
+    User,
+)
+from anthropic.types import Message as AnthropicMessage
+from dependency_injector import providers
+from fakeredis import aioredis
+from phoenix.client.types import PromptVersion
+
+from little_turtle.app_config import AppConfig
+from little_turtle.container import Container
+from little_turtle.handlers.middlewares import telegram_metrics_middleware
+from little_turtle.handlers.routers.actions import ForwardAction, ForwardCallback
+from little_turtle.llm_provider import BaseLLMAdapter, ProviderType, Usage
+from little_turtle.llm_provider.anthropic_adapter import AnthropicAdapter
+from little_turtle.prompts.prompts_provider import PromptsProvider
+from little_turtle.services import TelegramService
+
+BOT_USER = User(id=1, is_bot=True, first_name="Little Turtle", username="turtle_bot")
+WORDS = "turtle sea shell wave sand story history day ocean calm slow".split()
+
+
+@dataclass
+class Distribution:
+    # Log-normal around the median, sigma 0 makes it constant
+    median: float
+    sigma: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        return self.median * math.exp(self.sigma * rng.gauss(0, 1))
+
+
+@dataclass
+class LLMProfile:
+    latency_ms: Distribution
+    text_chars: Distribution
+    image_bytes: Distribution
+    chunk_chars: int = 40
+
+
+class FakeLLMResponse:
+    def __init__(self, response: AnthropicMessage):
+        self.raw_response = response
+        self.content = next(
+            (block.text for block in response.content if block.type == "text"), ""
+        )
+
+
+class FakeImageResponse:
+    def __init__(self, content: str):
+        self.raw_response = None
+        self.content = content
+
+
+class FakeLLMAdapter(BaseLLMAdapter):
+    profile: LLMProfile
+    rng: random.Random
+    model = "fake"
+
+    @classmethod
+    def configure(
+        cls, provider: ProviderType, profile: LLMProfile, seed: int
+    ) -> type["FakeLLMAdapter"]:
+        return type(
+            f"Fake{provider.name.title()}Adapter",
+            (cls,),
+            {"provider": provider, "profile": profile, "rng": random.Random(seed)},
+        )
+
+    async def _create_completion(self, messages: list[dict[str, str]], **kwargs):
+        await self.__wait()
+        return FakeLLMResponse(self.__message(self.__text(), []))
+
+    async def _create_completion_with_tools(
+        self, messages: list[dict[str, str]], tools: list[dict[str, Any]], **kwargs
+    ):
+        await self.__wait()
+        events = [self.__text(0.05) for _ in range(10)]
+        tool_use = {
+            "type": "tool_use",
+            "id": "toolu_fake",
+            "name": tools[-1]["name"],
+            "input": {"events": events},
+        }
+
+        return FakeLLMResponse(self.__message("", [tool_use], web_searches=1))
+
+    async def _stream_completion(
+        self, messages: list[dict[str, str]], **kwargs
+    ) -> AsyncIterator[str | Usage]:
+        text = self.__text()
+        chunk_chars = self.profile.chunk_chars
+        chunks = [
+            text[start : start + chunk_chars]
+            for start in range(0, len(text), chunk_chars)
+        ]
+        # A third of the time goes to the first token, the rest is spread
+        latency = self.__sample_latency()
+        await asyncio.sleep(latency * 0.3)
+        for chunk in chunks:
+            yield chunk
+            await asyncio.sleep(latency * 0.7 / len(chunks))
+
+        yield Usage(input_tokens=500, output_tokens=len(text) // 4)
+
+    async def _generate_image(self, instructions: str, input_text: str, **kwargs):
+        await self.__wait()
+        size = max(1, int(self.profile.image_bytes.sample(self.rng)))
+
+        return FakeImageResponse(base64.b64encode(os.urandom(size)).decode("ascii"))
+
+    def _get_usage(self, response: Any) -> Optional[Usage]:
+        if isinstance(response, FakeImageResponse):
+            return Usage(input_tokens=300, output_tokens=50, images=1)
+
+        return AnthropicAdapter._to_usage(response.raw_response.usage)
+
+    def _deserialize_response(self, data: str):
+        return FakeLLMResponse(AnthropicMessage.model_validate_json(data))
+
+    def _deserialize_image(self, data: str):
+        return FakeImageResponse(data)
+
+    def get_search_tool(self):
+        return {"type": "web_search_20250305", "name": "web_search", "max_uses": 5}
+
+    def __sample_latency(self) -> float:
+        return self.profile.latency_ms.sample(self.rng) / 1000
+
+    async def __wait(self):
+        await asyncio.sleep(self.__sample_latency())
+
+    def __text(self, scale: float = 1.0) -> str:
+        chars = max(1, int(self.profile.text_chars.sample(self.rng) * scale))
+        words = itertools.cycle(self.rng.sample(WORDS, len(WORDS)))
+
+        text = ""
+        while len(text) < chars:
+            text += next(words) + " "
+
+        return text[:chars].strip() or "turtle"
+
+    @staticmethod
+    def __message(
+        text: str, tool_uses: list[dict[str, Any]], web_searches: int = 0
+    ) -> AnthropicMessage:
+        content = ([{"type": "text", "text": text}] if text else []) + tool_uses
+
+        return AnthropicMessage.model_validate(
+            {
+                "id": "msg_fake",
+                "type": "message",
+                "role": "assistant",
+                "model": "fake",
+                "content": content,
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {
+                    "input_tokens": 500,
+                    "output_tokens": len(text) // 4 + 50,
+                    "server_tool_use": {
+                        "web_search_requests": web_searches,
+                        "web_fetch_requests": 0,
+                    },
+                },
+            }
+        )
+
+
+class FakeBotSession(BaseSession):
+    def __init__(self, latency_ms: Distribution, seed: int):
+        super().__init__()
+        self.latency_ms = latency_ms
+        self.rng = random.Random(seed)
+        self.calls: dict[str, int] = {}
+        self._message_ids = itertools.count(1000)
+
+    async def make_request(
+        self, bot: Bot, method: TelegramMethod, timeout: Optional[int] = None
+    ) -> Any:
+        name = method.__api_method__
+        self.calls[name] = self.calls.get(name, 0) + 1
+        await asyncio.sleep(self.latency_ms.sample(self.rng) / 1000)
+
+        returning = method.__returning__
+        if returning is Message:
+            return self.__message(method)
+        if returning is File:
+            return File(
+                file_id=method.file_id,
+                file_unique_id=method.file_id,
+                file_path=f"photos/{method.file_id}.png",
+            )
+        if returning is User:
+            return BOT_USER
+
+        return True
+
+    async def stream_content(
+        self,
+        url: str,
+        headers: Optional[dict[str, Any]] = None,
+        timeout: int = 30,
+        chunk_size: int = 65536,
+        raise_for_status: bool = True,
+    ) -> AsyncIterator[bytes]:
+        await asyncio.sleep(self.latency_ms.sample(self.rng) / 1000)
+        data = os.urandom(256 * 1024)
+        for start in range(0, len(data), chunk_size):
+            yield data[start : start + chunk_size]
+
+    async def close(self):
+        pass
+
+    def __message(self, method: TelegramMethod) -> Message:
+        message_id = getattr(method, "message_id", None) or next(self._message_ids)
+        photo = None
+        if getattr(method, "photo", None) is not None or hasattr(method, "sticker"):
+            file_id = f"file_{message_id}"
+            photo = [
+                PhotoSize(
+                    file_id=file_id, file_unique_id=file_id, width=1024, height=1024
+                )
+            ]
+
+        return Message(
+            message_id=message_id,
+            date=datetime.now(),
+            chat=Chat(id=method.chat_id, type="private"),
+            from_user=BOT_USER,
+            text=getattr(method, "text", None),
+            caption=getattr(method, "caption", None),
+            photo=photo,
+        )
+
+
+class FakeTelethonClient:
+    def __init__(self, latency_ms: Distribution, seed: int):
+        self.latency_ms = latency_ms
+        self.rng = random.Random(seed)
+        self.sent_files = 0
+
+    def is_connected(self) -> bool:
+        return True
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def start(self):
+        pass
+
+    async def iter_messages(self, chat_id, **kwargs):
+        await self.__wait()
+        # Nothing scheduled, so the next story is always for tomorrow
+        for message in ():
+            yield message
+
+    async def upload_file(self, file, file_name: str):
+        while file.read(512 * 1024):
+            pass
+        await self.__wait()
+
+        return file_name
+
+    async def send_file(self, chat_id, file, **kwargs):
+        await self.__wait()
+        self.sent_files += 1
+
+    async def send_message(self, chat_id, message, **kwargs):
+        await self.__wait()
+
+    async def __wait(self):
+        await asyncio.sleep(self.latency_ms.sample(self.rng) / 1000)
+
+
+class FakeTelegramService(TelegramService):
+    def __init__(self, config: AppConfig, client: FakeTelethonClient):
+        # The real constructor opens a Telethon session file
+        self.fanout_concurrency = config.TELEGRAM_FANOUT_CONCURRENCY
+        self.client = client
+
+
+class FakePhoenixPrompts:
+    PROMPTS = {
+        "little_turtle_story": PromptVersion(
+            [
+                {"role": "system", "content": "Write a story in {{language}}."},
+                {
+                    "role": "user",
+                    "content": "{{current_date}}: {{historical_event}}",
+                },
+            ],
+            model_name="gpt-5",
+        ),
+        "little_turtle_image": PromptVersion(
+            [
+                {"role": "system", "content": "Draw a turtle."},
+                {"role": "user", "content": "{{story}}"},
+            ],
+            model_name="gpt-5",
+        ),
+        "little_turtle_historical_events": PromptVersion(
+            [{"role": "user", "content": "Events on {{date}} in {{language}}."}],
+            model_name="claude-sonnet-4",
+            model_provider="ANTHROPIC",
+        ),
+    }
+
+    async def get(self, prompt_identifier: str) -> PromptVersion:
+        return self.PROMPTS[prompt_identifier]
+
+
+class FakePhoenixClient:
+    def __init__(self):
+        self.prompts = FakePhoenixPrompts()
+        self._client = self
+
+    async def aclose(self):
+        pass
+
+
+@dataclass
+class FakeServices:
+    bot: Bot
+    bot_session: FakeBotSession
+    telethon: FakeTelethonClient
+
+
+def create_config(
+    admin_ids: list[int], image_folder: str, **overrides: Any
+) -> AppConfig:
+    ids = ",".join(str(admin_id) for admin_id in admin_ids)
+    settings = {
+        "OPENAI_API_KEY": "fake",
+        "ANTHROPIC_API_KEY": "fake",
+        "TELEGRAM_BOT_TOKEN": "123456:fake",
+        "TELEGRAM_API_ID": 1,
+        "TELEGRAM_API_HASH": "fake",
+        "TELEGRAM_PHONE_NUMBER": "+10000000000",
+        "TELEGRAM_ALLOWED_USERS": ids,
+        "CHAT_IDS_TO_SEND_STORIES": "-100,-200",
+        "USER_IDS_TO_SEND_MORNING_MSG": ids,
+        "PHOENIX_ENABLED": False,
+        "PROMPTS_SNAPSHOT_PATH": "",
+        "HISTORICAL_EVENTS_INDEX_PATH": "",
+        "BASE_IMAGE_FOLDER": image_folder,
+        "METRICS_ENABLED": False,
+        "WARMUP_ENABLED": False,
+        **overrides,
+    }
+
+    return AppConfig(_env_file=None, **settings)
+
+
+def build_container(
+    config: AppConfig,
+    llm_profile: LLMProfile,
+    telegram_latency_ms: Distribution,
+    seed: int = 0,
+    log_file: str = os.devnull,
+) -> tuple[Container, FakeServices]:
+    container = Container()
+    container.config.override(providers.Object(config))
+
+    # Logs are still rendered, they just don't flood the report
+    container.logger_service()
+    structlog.configure(
+        logger_factory=structlog.PrintLoggerFactory(file=open(log_file, "a"))
+    )
+    logging.getLogger("aiogram").setLevel(logging.WARNING)
+
+    bot_session = FakeBotSession(telegram_latency_ms, seed)
+    bot_session.middleware(telegram_metrics_middleware)
+    bot = Bot(config.TELEGRAM_BOT_TOKEN, session=bot_session)
+    telethon = FakeTelethonClient(telegram_latency_ms, seed + 1)
+
+    prompts_provider = PromptsProvider(config, container.logger_service())
+    prompts_provider.client = FakePhoenixClient()
+
+    container.bot.override(providers.Object(bot))
+    container.redis_client.override(providers.Object(aioredis.FakeRedis()))
+    container.telegram_service.override(
+        providers.Object(FakeTelegramService(config, telethon))
+    )
+    container.prompts_provider.override(providers.Object(prompts_provider))
+
+    llm_provider = container.llm_provider()
+    for offset, provider in enumerate(ProviderType):
+        llm_provider.register_adapter(
+            provider,
+            FakeLLMAdapter.configure(provider, llm_profile, seed + 10 + offset),
+        )
+
+    return container, FakeServices(bot=bot, bot_session=bot_session, telethon=telethon)
+
+
+async def init_dispatcher(container: Container):
+    await container.init_resources()
+
+    # Providers that depend on async resources hand out futures
+    async def resolve(provider):
+        instance = provider()
+        return await instance if inspect.isawaitable(instance) else instance
+
+    telegram_handlers = await resolve(container.telegram_handlers)
+    routers = [
+        await resolve(container.system_router),
+        await resolve(container.set_state_router),
+        await resolve(container.admin_commands_router),
+        await resolve(container.callback_query_handler_router),
+    ]
+    telegram_handlers.init_routers(*routers)
+
+    return telegram_handlers, routers
+
+
+_update_ids = itertools.count(1)
+
+
+def message_update(user_id: int, text: str) -> Update:
+    user = User(id=user_id, is_bot=False, first_name=f"Admin {user_id}")
+
+    return Update(
+        update_id=next(_update_ids),
+        message=Message(
+            message_id=next(_update_ids),
+            date=datetime.now(),
+            chat=Chat(id=user_id, type="private"),
+            from_user=user,
+            text=text,
+        ),
+    )
+
+
+def callback_update(
+    user_id: int,
+    action: ForwardAction,
+    payload: Optional[str] = None,
+    text: Optional[str] = None,
+    photo_id: Optional[str] = None,
+) -> Update:
+    user = User(id=user_id, is_bot=False, first_name=f"Admin {user_id}")
+    photo = None
+    if photo_id is not None:
+        photo = [
+            PhotoSize(file_id=photo_id, file_unique_id=photo_id, width=1, height=1)
+        ]
+
+    return Update(
+        update_id=next(_update_ids),
+        callback_query=CallbackQuery(
+            id=str(next(_update_ids)),
+            from_user=user,
+            chat_instance=str(user_id),
+            data=ForwardCallback(action=action, payload=payload).pack(),
+            message=Message(
+                message_id=next(_update_ids),
+                date=datetime.now(),
+                chat=Chat(id=user_id, type="private"),
+                from_user=BOT_USER,
+                text=text,
+                photo=photo,
+            ),
+        ),
+    )
+
+
+def monotonic_ms(started_at: float) -> float:
+    return (time.perf_counter() - started_at) * 1000
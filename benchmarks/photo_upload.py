@@ -0,0 +1,110 @@
+"""Compares the old temp-file photo upload path with the in-memory one.
+
+Only the local part of an upload is measured: preparing the photo and
+reading it in Telethon-sized parts. Network time is the same for both.
+
+    python -m benchmarks.photo_upload
+"""
+
+import argparse
+import io
+import os
+import time
+import tracemalloc
+from tempfile import NamedTemporaryFile
+
+from telethon import utils
+
+SIZES_MB = (1, 2, 3)
+
+
+def read_parts(stream: io.IOBase, size: int):
+    part_size = int(utils.get_appropriated_part_size(size) * 1024)
+    while stream.read(part_size):
+        pass
+
+
+def temp_file_upload(photo: io.BytesIO, size: int):
+    with NamedTemporaryFile(suffix=".png") as temp:
+        temp.write(photo.read())
+        temp.flush()
+        with open(temp.name, "rb") as stream:
+            read_parts(stream, size)
+
+
+def in_memory_upload(photo: io.BytesIO, size: int):
+    read_parts(photo, size)
+
+
+def read_proc_io() -> dict[str, int]:
+    try:
+        with open("/proc/self/io") as f:
+            return {
+                key: int(value)
+                for key, value in (line.split(": ") for line in f.read().splitlines())
+            }
+    except OSError:
+        return {}
+
+
+def downloaded_photo(data: bytes) -> io.BytesIO:
+    # aiogram fills the download buffer chunk by chunk, so it doesn't share
+    # memory with the source bytes the way io.BytesIO(data) would
+    photo = io.BytesIO()
+    photo.write(data)
+    photo.seek(0)
+
+    return photo
+
+
+def measure(upload: callable, data: bytes, rounds: int) -> dict[str, float]:
+    io_before = read_proc_io()
+    tracemalloc.start()
+    started_at = time.perf_counter()
+
+    for _ in range(rounds):
+        upload(downloaded_photo(data), len(data))
+
+    elapsed = time.perf_counter() - started_at
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    io_after = read_proc_io()
+
+    result = {
+        "ms_per_upload": elapsed / rounds * 1000,
+        "peak_alloc_mb": peak_memory / 1024 / 1024,
+    }
+    for key in ("syscr", "syscw", "wchar"):
+        if key in io_before:
+            result[key] = (io_after[key] - io_before[key]) / rounds
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    print(
+        f"{'size':>5} {'path':>10} {'ms/upload':>10} {'peak MB':>8} "
+        f"{'read sys':>9} {'write sys':>10} {'written KB':>11}"
+    )
+    for size_mb in SIZES_MB:
+        data = os.urandom(size_mb * 1024 * 1024)
+
+        for name, upload in (
+            ("temp file", temp_file_upload),
+            ("in-memory", in_memory_upload),
+        ):
+            result = measure(upload, data, args.rounds)
+            print(
+                f"{size_mb:>4}M {name:>10} {result['ms_per_upload']:>10.2f} "
+                f"{result['peak_alloc_mb']:>8.2f} {result.get('syscr', 0):>9.1f} "
+                f"{result.get('syscw', 0):>10.1f} "
+                f"{result.get('wchar', 0) / 1024:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
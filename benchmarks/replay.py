@@ -0,0 +1,357 @@
+"""Replays recorded updates through the Dispatcher to load test admin sessions.
+
+Updates are recorded by the bot itself when UPDATE_RECORDING_PATH is set.
+The recording is cloned for every session with its own user and chat ids
+and fed to TelegramHandlers.dp at the recorded pace times --speed, or at a
+fixed --rate. External clients are faked the same way as in
+benchmarks.story_flows. Without a recording a synthetic one with the
+/story, regenerate, set image, /preview and schedule flow is replayed.
+
+    python -m benchmarks.replay
+    python -m benchmarks.replay updates.jsonl --sessions 50 --speed 10
+    python -m benchmarks.replay updates.jsonl --sessions 50 --rate 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import defaultdict
+from tempfile import TemporaryDirectory
+from typing import Any, Optional
+
+from aiogram import Bot
+from aiogram.types import Update
+
+from benchmarks.fakes import (
+    Distribution,
+    LLMProfile,
+    build_container,
+    callback_update,
+    create_config,
+    init_dispatcher,
+    message_update,
+    monotonic_ms,
+)
+from benchmarks.story_flows import handler_errors, peak_rss_mb, percentile
+from little_turtle.handlers.middlewares import dump_update
+from little_turtle.handlers.routers.actions import ForwardAction
+
+SESSION_ID_STEP = 1_000_000
+SYNTHETIC_USER_ID = 10_001
+SAMPLE_INTERVAL_SECONDS = 0.02
+
+
+def write_synthetic_recording(path: str, rounds: int, think_seconds: float):
+    photo_id = f"photo_{SYNTHETIC_USER_ID}"
+    flow = [
+        lambda: message_update(SYNTHETIC_USER_ID, "/story"),
+        lambda: callback_update(SYNTHETIC_USER_ID, ForwardAction.REGENERATE_STORY),
+        lambda: callback_update(
+            SYNTHETIC_USER_ID, ForwardAction.SET_IMAGE, photo_id=photo_id
+        ),
+        lambda: message_update(SYNTHETIC_USER_ID, "/preview"),
+        lambda: callback_update(
+            SYNTHETIC_USER_ID, ForwardAction.SCHEDULE, photo_id=photo_id
+        ),
+    ]
+
+    received_at = time.time()
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(rounds):
+            for make_update in flow:
+                f.write(dump_update(make_update(), received_at) + "\n")
+                received_at += think_seconds
+
+
+def load_recording(path: str) -> list[tuple[float, dict[str, Any]]]:
+    with open(path, "r", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+
+    return [(entry["ts"], entry["update"]) for entry in entries]
+
+
+def remap_session(payload: Any, offset: int) -> Any:
+    # Users and chats of a session are shifted together, the bot stays as is
+    if isinstance(payload, list):
+        return [remap_session(item, offset) for item in payload]
+    if not isinstance(payload, dict):
+        return payload
+
+    remapped = {key: remap_session(value, offset) for key, value in payload.items()}
+    for key in ("from", "chat", "user"):
+        entity = remapped.get(key)
+        if isinstance(entity, dict) and not entity.get("is_bot"):
+            remapped[key] = {**entity, "id": entity["id"] + offset}
+
+    return remapped
+
+
+def build_schedule(
+    recording: list[tuple[float, dict[str, Any]]],
+    sessions: int,
+    speed: float,
+    rate: Optional[float],
+    spread: float,
+) -> list[tuple[float, dict[str, Any]]]:
+    started_at = min(ts for ts, _ in recording)
+    entries = sorted(
+        (
+            (
+                (ts - started_at) / speed + spread * session / sessions,
+                remap_session(payload, session * SESSION_ID_STEP),
+            )
+            for session in range(sessions)
+            for ts, payload in recording
+        ),
+        key=lambda entry: entry[0],
+    )
+    if rate is None:
+        return entries
+
+    return [(index / rate, payload) for index, (_, payload) in enumerate(entries)]
+
+
+def get_user_ids(schedule: list[tuple[float, dict[str, Any]]]) -> list[int]:
+    user_ids = set()
+    for _, payload in schedule:
+        event = payload.get("message") or payload.get("callback_query") or {}
+        user = event.get("from")
+        if user is not None and not user.get("is_bot"):
+            user_ids.add(user["id"])
+
+    return sorted(user_ids)
+
+
+class Replayer:
+    def __init__(self, telegram_handlers, routers: list, generation_jobs):
+        self.dp = telegram_handlers.dp
+        self.bot: Bot = telegram_handlers.bot
+        self.generation_jobs = generation_jobs
+
+        self.in_flight: set[asyncio.Task] = set()
+        self.fed = 0
+        self.failed = 0
+        self.loop_lag: list[float] = []
+        self.queue_depth: list[int] = []
+        self.jobs_depth: list[int] = []
+        self.router_latencies: dict[str, list[float]] = defaultdict(list)
+        self.router_errors: dict[str, int] = defaultdict(int)
+
+        for router in routers:
+            timer = self.__router_timer(type(router).__name__)
+            router.router.message.middleware(timer)
+            router.router.callback_query.middleware(timer)
+
+    async def run(self, schedule: list[tuple[float, Update]], user_ids: list[int]):
+        loop = asyncio.get_running_loop()
+        sampler = asyncio.create_task(self.__sample(user_ids))
+
+        started_at = loop.time()
+        for at, update in schedule:
+            delay = started_at + at - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            task = asyncio.create_task(self.__feed(update))
+            self.in_flight.add(task)
+            task.add_done_callback(self.in_flight.discard)
+
+        await asyncio.gather(*self.in_flight)
+        # Regenerations keep running as jobs after their update was handled
+        jobs = [
+            job.task
+            for user_id in user_ids
+            for job in self.generation_jobs.get_jobs(user_id)
+        ]
+        await asyncio.gather(*jobs, return_exceptions=True)
+        sampler.cancel()
+
+    async def __feed(self, update: Update):
+        self.fed += 1
+        try:
+            await self.dp.feed_update(self.bot, update)
+        except Exception:
+            self.failed += 1
+
+    async def __sample(self, user_ids: list[int]):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected_at = loop.time() + SAMPLE_INTERVAL_SECONDS
+            await asyncio.sleep(SAMPLE_INTERVAL_SECONDS)
+            self.loop_lag.append(max(0.0, loop.time() - expected_at) * 1000)
+            self.queue_depth.append(len(self.in_flight))
+            self.jobs_depth.append(
+                sum(len(self.generation_jobs.get_jobs(user_id)) for user_id in user_ids)
+            )
+
+    def __router_timer(self, name: str):
+        async def timer(handler, event, data):
+            started_at = time.perf_counter()
+            try:
+                return await handler(event, data)
+            except Exception:
+                self.router_errors[name] += 1
+                raise
+            finally:
+                self.router_latencies[name].append(monotonic_ms(started_at))
+
+        return timer
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+    return {
+        "p50": round(percentile(samples, 0.50), 1),
+        "p95": round(percentile(samples, 0.95), 1),
+        "p99": round(percentile(samples, 0.99), 1),
+        "max": round(max(samples), 1),
+    }
+
+
+async def run(args: argparse.Namespace, recording_path: str) -> dict:
+    schedule = build_schedule(
+        load_recording(recording_path),
+        args.sessions,
+        args.speed,
+        args.rate,
+        args.spread,
+    )
+    user_ids = get_user_ids(schedule)
+    llm_profile = LLMProfile(
+        latency_ms=Distribution(args.llm_latency_ms, args.sigma),
+        text_chars=Distribution(args.story_chars, args.sigma),
+        image_bytes=Distribution(args.image_kb * 1024, args.sigma),
+    )
+
+    with TemporaryDirectory() as image_folder:
+        config = create_config(user_ids, image_folder)
+        container, _ = build_container(
+            config,
+            llm_profile,
+            Distribution(args.telegram_latency_ms, args.sigma),
+            seed=args.seed,
+        )
+        telegram_handlers, routers = await init_dispatcher(container)
+        replayer = Replayer(telegram_handlers, routers, container.generation_jobs())
+
+        # Updates are mounted to the bot up front, like polling does
+        updates = [
+            (at, Update.model_validate(payload, context={"bot": telegram_handlers.bot}))
+            for at, payload in schedule
+        ]
+
+        errors_before = handler_errors()
+        started_at = time.perf_counter()
+        await replayer.run(updates, user_ids)
+        elapsed = time.perf_counter() - started_at
+
+        await container.shutdown_resources()
+
+    errors = int(handler_errors() - errors_before) + replayer.failed
+    return {
+        "sessions": args.sessions,
+        "updates": replayer.fed,
+        "elapsed_seconds": round(elapsed, 3),
+        "updates_per_second": round(replayer.fed / elapsed, 2),
+        "errors": errors,
+        "error_rate": round(errors / max(1, replayer.fed), 4),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "loop_lag_ms": summarize(replayer.loop_lag),
+        "queue_depth": summarize(replayer.queue_depth),
+        "generation_jobs": summarize(replayer.jobs_depth),
+        "routers": {
+            name: {
+                "count": len(samples),
+                "errors": replayer.router_errors[name],
+                **summarize(samples),
+            }
+            for name, samples in replayer.router_latencies.items()
+        },
+    }
+
+
+def print_report(report: dict):
+    for key in (
+        "sessions",
+        "updates",
+        "elapsed_seconds",
+        "updates_per_second",
+        "errors",
+        "error_rate",
+        "peak_rss_mb",
+    ):
+        print(f"{key:<20}{report[key]}")
+
+    print()
+    print(f"{'':<28}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for key, title in (
+        ("loop_lag_ms", "event loop lag, ms"),
+        ("queue_depth", "updates in flight"),
+        ("generation_jobs", "generation jobs"),
+    ):
+        stats = report[key]
+        print(
+            f"{title:<28}{stats['p50']:>10}{stats['p95']:>10}"
+            f"{stats['p99']:>10}{stats['max']:>10}"
+        )
+
+    print()
+    print(
+        f"{'router, ms':<28}{'count':>8}{'errors':>8}"
+        f"{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"
+    )
+    for name, stats in sorted(report["routers"].items()):
+        print(
+            f"{name:<28}{stats['count']:>8}{stats['errors']:>8}"
+            f"{stats['p50']:>10}{stats['p95']:>10}{stats['p99']:>10}{stats['max']:>10}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", nargs="?", help="JSONL written by the bot")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="multiplier of the recorded pace"
+    )
+    parser.add_argument(
+        "--rate", type=float, help="updates per second, ignores the recorded pace"
+    )
+    parser.add_argument(
+        "--spread", type=float, default=0.0, help="seconds to stagger sessions by"
+    )
+    parser.add_argument("--synthetic-rounds", type=int, default=3)
+    parser.add_argument("--synthetic-think-seconds", type=float, default=5.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=200)
+    parser.add_argument("--telegram-latency-ms", type=float, default=20)
+    parser.add_argument("--story-chars", type=float, default=1500)
+    parser.add_argument("--image-kb", type=float, default=512)
+    parser.add_argument(
+        "--sigma", type=float, default=0.5, help="log-normal spread of samples"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the raw report")
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as recording_folder:
+        recording_path = args.recording
+        if recording_path is None:
+            recording_path = os.path.join(recording_folder, "updates.jsonl")
+            write_synthetic_recording(
+                recording_path, args.synthetic_rounds, args.synthetic_think_seconds
+            )
+
+        report = asyncio.run(run(args, recording_path))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
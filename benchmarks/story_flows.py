@@ -0,0 +1,220 @@
+"""Drives the admin story flows end to end without touching the network.
+
+Every session is an allowed admin that runs /story, regenerates the story,
+sets the image, previews and schedules it. Updates go through the real
+Dispatcher, routers, FSM storage and controller; only the LLM providers,
+Telegram, Telethon, Phoenix and Redis are faked (see benchmarks.fakes).
+
+    python -m benchmarks.story_flows
+    python -m benchmarks.story_flows --sessions 50 --rounds 3 --save-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Optional
+
+from aiogram.types import Update
+
+from benchmarks.fakes import (
+    Distribution,
+    LLMProfile,
+    build_container,
+    callback_update,
+    create_config,
+    init_dispatcher,
+    message_update,
+    monotonic_ms,
+)
+from little_turtle import metrics
+from little_turtle.handlers.routers.actions import ForwardAction
+
+FLOWS = ("story", "regenerate", "set_image", "preview", "schedule")
+BASELINE_PATH = Path(__file__).parent / "baselines" / "story_flows.json"
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def handler_errors() -> float:
+    return sum(
+        sample.value
+        for metric in metrics.HANDLER_ERRORS.collect()
+        for sample in metric.samples
+        if sample.name.endswith("_total")
+    )
+
+
+class StoryFlows:
+    def __init__(self, telegram_handlers, container):
+        self.dp = telegram_handlers.dp
+        self.bot = telegram_handlers.bot
+        self.generation_jobs = container.generation_jobs()
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+
+    async def run_session(self, user_id: int, rounds: int):
+        for _ in range(rounds):
+            # Generations run as background jobs, a flow ends with its jobs
+            await self.__timed(
+                "story", message_update(user_id, "/story"), wait_for_jobs=user_id
+            )
+            await self.__timed(
+                "regenerate",
+                callback_update(user_id, ForwardAction.REGENERATE_STORY),
+                wait_for_jobs=user_id,
+            )
+            await self.__timed(
+                "set_image",
+                callback_update(
+                    user_id, ForwardAction.SET_IMAGE, photo_id=f"photo_{user_id}"
+                ),
+            )
+            await self.__timed("preview", message_update(user_id, "/preview"))
+            await self.__timed(
+                "schedule",
+                callback_update(
+                    user_id, ForwardAction.SCHEDULE, photo_id=f"photo_{user_id}"
+                ),
+            )
+
+    async def __timed(
+        self, flow: str, update: Update, wait_for_jobs: Optional[int] = None
+    ):
+        started_at = time.perf_counter()
+        await self.dp.feed_update(self.bot, update)
+        if wait_for_jobs is not None:
+            jobs = self.generation_jobs.get_jobs(wait_for_jobs)
+            await asyncio.gather(*(job.task for job in jobs), return_exceptions=True)
+
+        self.latencies[flow].append(monotonic_ms(started_at))
+
+
+async def run(args: argparse.Namespace) -> dict:
+    user_ids = list(range(10_001, 10_001 + args.sessions))
+    llm_profile = LLMProfile(
+        latency_ms=Distribution(args.llm_latency_ms, args.sigma),
+        text_chars=Distribution(args.story_chars, args.sigma),
+        image_bytes=Distribution(args.image_kb * 1024, args.sigma),
+    )
+
+    with TemporaryDirectory() as image_folder:
+        config = create_config(user_ids, image_folder)
+        container, fakes = build_container(
+            config,
+            llm_profile,
+            Distribution(args.telegram_latency_ms, args.sigma),
+            seed=args.seed,
+        )
+        telegram_handlers, _ = await init_dispatcher(container)
+
+        errors_before = handler_errors()
+        started_at = time.perf_counter()
+        flows = StoryFlows(telegram_handlers, container)
+        await asyncio.gather(
+            *(flows.run_session(user_id, args.rounds) for user_id in user_ids)
+        )
+        elapsed = time.perf_counter() - started_at
+
+        await container.shutdown_resources()
+
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "errors": int(handler_errors() - errors_before),
+        "scheduled_posts": fakes.telethon.sent_files,
+        "telegram_calls": dict(sorted(fakes.bot_session.calls.items())),
+        "flows": {
+            flow: {
+                "count": len(samples),
+                "throughput": round(len(samples) / elapsed, 2),
+                "p50_ms": round(percentile(samples, 0.50), 1),
+                "p95_ms": round(percentile(samples, 0.95), 1),
+                "p99_ms": round(percentile(samples, 0.99), 1),
+            }
+            for flow, samples in flows.latencies.items()
+        },
+    }
+
+
+def delta(value: float, baseline: float | None) -> str:
+    if not baseline:
+        return ""
+
+    return f" ({(value - baseline) / baseline * 100:+.0f}%)"
+
+
+def print_report(report: dict, baseline: dict | None):
+    base_flows = (baseline or {}).get("flows", {})
+
+    print(
+        f"{'flow':<12}{'count':>7}{'ops/s':>16}"
+        f"{'p50 ms':>18}{'p95 ms':>18}{'p99 ms':>18}"
+    )
+    for flow in FLOWS:
+        stats = report["flows"].get(flow)
+        if stats is None:
+            continue
+
+        base = base_flows.get(flow, {})
+        cells = [
+            f"{stats[key]}{delta(stats[key], base.get(key))}"
+            for key in ("throughput", "p50_ms", "p95_ms", "p99_ms")
+        ]
+        print(
+            f"{flow:<12}{stats['count']:>7}{cells[0]:>16}"
+            f"{cells[1]:>18}{cells[2]:>18}{cells[3]:>18}"
+        )
+
+    print()
+    for key in ("elapsed_seconds", "peak_rss_mb", "errors", "scheduled_posts"):
+        base = (baseline or {}).get(key)
+        print(f"{key:<16}{report[key]}{delta(report[key], base)}")
+    print(f"{'telegram_calls':<16}{report['telegram_calls']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--llm-latency-ms", type=float, default=200)
+    parser.add_argument("--telegram-latency-ms", type=float, default=20)
+    parser.add_argument("--story-chars", type=float, default=1500)
+    parser.add_argument("--image-kb", type=float, default=512)
+    parser.add_argument(
+        "--sigma", type=float, default=0.5, help="log-normal spread of samples"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    baseline = None
+    if not args.save_baseline and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+    print_report(report, baseline)
+
+    if args.save_baseline:
+        os.makedirs(args.baseline.parent, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nBaseline saved to {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
-from typing import TypedDict
+from typing import Any, TypedDict
 from pydantic import BaseModel, Field
 
 from little_turtle.prompts.prompts_provider import PromptsProvider
-from little_turtle.llm_provider import LLMClient
+from little_turtle.llm_provider import (
+    BatchOperation,
+    BatchRequest,
+    CacheMode,
+    LLMClient,
+    agent_context,
+)
 
 RECORD_HISTORICAL_EVENTS_TOOL = "record_historical_events"
+HISTORICAL_EVENTS_PROMPT = "little_turtle_historical_events"
 
 
 class HistoricalEvents(BaseModel):
@@ -52,17 +59,49 @@ def extract_structured_output(response) -> HistoricalEvents:
 
 
 class HistoricalEventsAgent:
-    def __init__(self, llm_client: LLMClient, prompts_provider: PromptsProvider):
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        prompts_provider: PromptsProvider,
+        cache_mode: CacheMode = CacheMode.OFF,
+    ):
         self.prompts_provider = prompts_provider
         self.llm_client = llm_client
+        self.cache_mode = cache_mode
 
-    def run(self, prompt_vars: HistoricalEventsAgentVariables) -> HistoricalEvents:
-        search_tool = self.llm_client.get_search_tool()
-        resp = self.llm_client.create_completion_with_tools(
-            tools=[search_tool, get_structured_output_tool()],
-            **self.prompts_provider.format(
-                "little_turtle_historical_events", prompt_vars
-            ),
-        )
+    async def run(
+        self, prompt_vars: HistoricalEventsAgentVariables
+    ) -> HistoricalEvents:
+        with agent_context("historical_events"):
+            resp = await self.llm_client.create_completion_with_tools(
+                **await self.__get_params(prompt_vars)
+            )
 
         return extract_structured_output(resp)
+
+    async def build_request(
+        self, custom_id: str, prompt_vars: HistoricalEventsAgentVariables
+    ) -> BatchRequest:
+        return BatchRequest(
+            custom_id=custom_id,
+            operation=BatchOperation.COMPLETION_WITH_TOOLS,
+            params=await self.__get_params(prompt_vars),
+        )
+
+    async def get_prompt_version(self) -> str:
+        prompt = await self.prompts_provider.get_prompt(HISTORICAL_EVENTS_PROMPT)
+        return prompt.id or "latest"
+
+    async def __get_params(
+        self, prompt_vars: HistoricalEventsAgentVariables
+    ) -> dict[str, Any]:
+        prompt = await self.prompts_provider.format(
+            HISTORICAL_EVENTS_PROMPT, prompt_vars
+        )
+
+        return {
+            "tools": [self.llm_client.get_search_tool(), get_structured_output_tool()],
+            "cache_mode": self.cache_mode,
+            "cache_prompt": True,
+            **prompt,
+        }
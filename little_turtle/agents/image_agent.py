@@ -1,7 +1,13 @@
-from typing import TypedDict
+from typing import Any, TypedDict
 
 from little_turtle.prompts.prompts_provider import PromptsProvider
-from little_turtle.llm_provider import LLMClient
+from little_turtle.llm_provider import (
+    BatchOperation,
+    BatchRequest,
+    CacheMode,
+    LLMClient,
+    agent_context,
+)
 
 
 class ImageAgentVariables(TypedDict):
@@ -9,15 +15,37 @@ class ImageAgentVariables(TypedDict):
 
 
 class ImageAgent:
-    def __init__(self, llm_client: LLMClient, prompts_provider: PromptsProvider):
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        prompts_provider: PromptsProvider,
+        cache_mode: CacheMode = CacheMode.OFF,
+    ):
         self.prompts_provider = prompts_provider
         self.llm_client = llm_client
+        self.cache_mode = cache_mode
 
-    def run(self, prompt_vars: ImageAgentVariables) -> str:
-        prompt = self.prompts_provider.format("little_turtle_image", prompt_vars)
+    async def run(self, prompt_vars: ImageAgentVariables) -> str:
+        with agent_context("image"):
+            return await self.llm_client.generate_image(
+                **await self.__get_params(prompt_vars)
+            )
 
-        return self.llm_client.generate_image(
-            prompt.messages[0]["content"],
-            prompt.messages[1]["content"],
-            model="gpt-5",
+    async def build_request(
+        self, custom_id: str, prompt_vars: ImageAgentVariables
+    ) -> BatchRequest:
+        return BatchRequest(
+            custom_id=custom_id,
+            operation=BatchOperation.IMAGE,
+            params=await self.__get_params(prompt_vars),
         )
+
+    async def __get_params(self, prompt_vars: ImageAgentVariables) -> dict[str, Any]:
+        prompt = await self.prompts_provider.format("little_turtle_image", prompt_vars)
+
+        return {
+            "instructions": prompt.messages[0]["content"],
+            "input_text": prompt.messages[1]["content"],
+            "model": "gpt-5",
+            "cache_mode": self.cache_mode,
+        }
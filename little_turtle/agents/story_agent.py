@@ -1,7 +1,13 @@
-from typing import TypedDict
+from typing import Any, TypedDict, AsyncIterator
 
 from little_turtle.prompts.prompts_provider import PromptsProvider
-from little_turtle.llm_provider import LLMClient
+from little_turtle.llm_provider import (
+    BatchOperation,
+    BatchRequest,
+    CacheMode,
+    LLMClient,
+    agent_context,
+)
 
 
 class StoryAgentVariables(TypedDict):
@@ -11,17 +17,50 @@ class StoryAgentVariables(TypedDict):
 
 
 class StoryAgent:
-    def __init__(self, llm_client: LLMClient, prompts_provider: PromptsProvider):
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        prompts_provider: PromptsProvider,
+        cache_mode: CacheMode = CacheMode.OFF,
+    ):
         self.llm_client = llm_client
         self.prompts_provider = prompts_provider
+        self.cache_mode = cache_mode
 
-    def run(self, prompt_vars: StoryAgentVariables) -> str:
-        prompt = self.prompts_provider.format("little_turtle_story", prompt_vars)
+    async def run(self, prompt_vars: StoryAgentVariables) -> str:
+        with agent_context("story"):
+            resp = await self.llm_client.create_completion(
+                **await self.__get_params(prompt_vars)
+            )
 
-        resp = self.llm_client.create_completion(
-            messages=prompt.messages,
-            temperature=1,
-            model="gpt-5",
+        return resp.content
+
+    async def build_request(
+        self, custom_id: str, prompt_vars: StoryAgentVariables
+    ) -> BatchRequest:
+        return BatchRequest(
+            custom_id=custom_id,
+            operation=BatchOperation.COMPLETION,
+            params=await self.__get_params(prompt_vars),
         )
 
-        return resp.content
+    async def stream(self, prompt_vars: StoryAgentVariables) -> AsyncIterator[str]:
+        prompt = await self.prompts_provider.format("little_turtle_story", prompt_vars)
+
+        with agent_context("story"):
+            async for chunk in self.llm_client.stream_completion(
+                messages=prompt.messages,
+                temperature=1,
+                model="gpt-5",
+            ):
+                yield chunk
+
+    async def __get_params(self, prompt_vars: StoryAgentVariables) -> dict[str, Any]:
+        prompt = await self.prompts_provider.format("little_turtle_story", prompt_vars)
+
+        return {
+            "messages": prompt.messages,
+            "temperature": 1,
+            "model": "gpt-5",
+            "cache_mode": self.cache_mode,
+        }
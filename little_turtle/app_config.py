@@ -1,4 +1,4 @@
-from typing import List, Annotated, Union
+from typing import List, Annotated, Literal, Union
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict, NoDecode
 
@@ -25,7 +25,56 @@ class AppConfig(BaseSettings):
     ANTHROPIC_API_KEY: str = ""
     ANTHROPIC_MODEL: str = "claude-3-5-sonnet-20241022"
 
+    OPENAI_RPM_LIMIT: int = 0
+    OPENAI_TPM_LIMIT: int = 0
+    ANTHROPIC_RPM_LIMIT: int = 0
+    ANTHROPIC_TPM_LIMIT: int = 0
+    LLM_MAX_RETRIES: int = 5
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 1
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 60
+
+    LLM_HEDGING_ENABLED: bool = False
+    LLM_HEDGE_INITIAL_DELAY_SECONDS: float = 30
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 2
+    LLM_HEDGE_LATENCY_WINDOW: int = 100
+    LLM_CIRCUIT_BREAKER_FAILURES: int = 3
+    LLM_CIRCUIT_BREAKER_RESET_SECONDS: float = 60
+
+    BATCH_BACKEND: Literal["provider", "local"] = "provider"
+    BATCH_POLL_INTERVAL_SECONDS: float = 60
+    BATCH_LOCAL_CONCURRENCY: int = 4
+
+    LLM_CACHE_BACKEND: Literal["local", "redis"] = "local"
+    LLM_CACHE_MAX_ENTRIES: int = 256
+    LLM_CACHE_TTL_SECONDS: int = 60 * 60 * 24 * 7
+    LLM_USAGE_STREAM_MAX_LEN: int = 100_000
+    USAGE_MAX_DAYS: int = 90
+    STORY_AGENT_CACHE_MODE: Literal["off", "auto", "force"] = "off"
+    IMAGE_AGENT_CACHE_MODE: Literal["off", "auto", "force"] = "off"
+    HISTORICAL_EVENTS_AGENT_CACHE_MODE: Literal["off", "auto", "force"] = "auto"
+
     REDIS_URL: str = "redis://localhost:6379/0"
+    HISTORICAL_EVENTS_CACHE_TTL_SECONDS: int = 60 * 60 * 24 * 30
+    HISTORICAL_EVENTS_INDEX_PATH: str = "/app/little_turtle/data/historical_events.db"
+    HISTORICAL_EVENTS_IMPORT_CONCURRENCY: int = 8
+    FAST_TOPICS_COUNT: int = 10
+    STORY_POOL_SIZE: int = 2
+    STORY_STREAMING_ENABLED: bool = True
+    STREAM_EDIT_INTERVAL_SECONDS: float = 1.5
+    DRAFTS_TTL_SECONDS: int = 60 * 60 * 24 * 14
+    PREGENERATE_DRAFT_ENABLED: bool = True
+    PREGENERATE_DRAFT_HOUR: int = 4
+    GENERATION_WORKERS: int = 4
+    GENERATION_PROVIDER_CONCURRENCY: int = 2
+    DRAFT_PROVIDER_CONCURRENCY: int = 3
+    PLAN_DEFAULT_DAYS: int = 7
+    PLAN_MAX_DAYS: int = 14
+    WARMUP_ENABLED: bool = True
+    METRICS_ENABLED: bool = False
+    METRICS_HOST: str = "0.0.0.0"
+    METRICS_PORT: int = 9464
+    UPDATE_RECORDING_PATH: str = ""
+    WARMUP_TIMEOUT_SECONDS: float = 10
     BASE_IMAGE_FOLDER: str = "/app/little_turtle/images"
 
     TELEGRAM_BOT_TOKEN: str
@@ -34,6 +83,7 @@ class AppConfig(BaseSettings):
     TELEGRAM_PHONE_NUMBER: str
     TELEGRAM_SESSION_NAME: str = "little_turtle"
     TELEGRAM_ALLOWED_USERS: Annotated[list[int], NoDecode]
+    TELEGRAM_FANOUT_CONCURRENCY: int = 4
 
     CHAT_IDS_TO_SEND_STORIES: Annotated[list[int], NoDecode]
     USER_IDS_TO_SEND_MORNING_MSG: Annotated[list[int], NoDecode]
@@ -47,6 +97,8 @@ class AppConfig(BaseSettings):
     PHOENIX_COLLECTOR_ENDPOINT: str = ""
     PHOENIX_PROJECT_NAME: str = "little-turtle"
     PHOENIX_ENABLED: bool = True
+    PROMPTS_CACHE_TTL_SECONDS: int = 300
+    PROMPTS_SNAPSHOT_PATH: str = "/app/little_turtle/data/prompts_snapshot.json"
 
     APPLICATION_TZ: str = "Europe/Warsaw"
     DEBUG: bool = False
@@ -0,0 +1,70 @@
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from dependency_injector.wiring import inject, Provide
+from dotenv import load_dotenv
+
+from little_turtle.container import Container
+from little_turtle.controlles import StoriesController
+from little_turtle.llm_provider import BatchBackend
+from little_turtle.services import LoggerService
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Prepare story drafts for several days with provider batch APIs"
+    )
+    parser.add_argument(
+        "--start",
+        default=(datetime.now() + timedelta(days=1)).strftime("%d.%m.%Y"),
+        help="First date in DD.MM.YYYY format, defaults to tomorrow",
+    )
+    parser.add_argument("--days", type=int, default=7, help="Number of days")
+
+    return parser.parse_args()
+
+
+@inject
+async def main(
+    dates: list[str],
+    stories_controller: StoriesController = Provide[Container.stories_controller],
+    topics_backend: BatchBackend = Provide[Container.anthropic_batch_backend],
+    generation_backend: BatchBackend = Provide[Container.openai_batch_backend],
+    logger_service: LoggerService = Provide[Container.logger_service],
+):
+    logger_service.info("Preparing drafts in batch", dates=dates)
+
+    results = await stories_controller.prepare_drafts_in_batch(
+        dates, topics_backend, generation_backend
+    )
+
+    for date, result in results.items():
+        if isinstance(result, Exception):
+            logger_service.error("Failed to prepare draft", date=date, exc_info=result)
+        else:
+            logger_service.info("Draft prepared", date=date, image=result.image)
+
+
+async def run(container: Container, dates: list[str]):
+    await container.init_resources()
+    try:
+        await main(dates)
+    finally:
+        await container.shutdown_resources()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    args = parse_args()
+
+    start = datetime.strptime(args.start, "%d.%m.%Y")
+    batch_dates = [
+        (start + timedelta(days=offset)).strftime("%d.%m.%Y")
+        for offset in range(args.days)
+    ]
+
+    container = Container()
+    container.wire(modules=[__name__])
+
+    asyncio.run(run(container, batch_dates))
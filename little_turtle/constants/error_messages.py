@@ -14,3 +14,13 @@ ERR_IMAGE_GENERATION = "Sorry, I'm having trouble generating your image! 🐢
 ERR_UNKNOWN_USER = "Sorry, I don't know you! 🐢🤔"
 UNHANDLED_ERROR = "Sorry, I'm having trouble handling your request! 🐢🤔\n\n{err}"
 ERR_NO_REPLY_MSG = "Please, reply to the text message with the message! 🐢🤔"
+ERR_SCHEDULE_STORY = (
+    "Sorry, I couldn't schedule the story for these chats! 🐢🤔\n\n{chats}"
+)
+ERR_INVALID_PLAN_RANGE = (
+    "Sorry, I can plan from 1 to {max_days} days, like /plan 01.11.2025 7! 🐢🤔"
+)
+ERR_NO_DRAFT = "Sorry, I don't have a draft for this date! 🐢🤔"
+ERR_INVALID_USAGE_DAYS = (
+    "Sorry, I can summarize from 1 to {max_days} days, like /usage 30! 🐢🤔"
+)
@@ -18,3 +18,10 @@ NO_STATE = "Sorry, I don't have any story state in memory! 🐢🤔"
 SET_COMMENT = "Alright, I'll remember this generation comment! 🐢📝"
 CLEAR_COMMENT = "Alright, I'll forget generation comment! 🐢🤔"
 SUGGEST_TARGET_TOPICS = "Hmm, I can suggest some topics for the next story! 🐢📝"
+INVALIDATE_TOPICS = "Alright, I'll look for fresh topics for this date! 🐢🔄"
+PLAN_IN_PROGRESS = "Alright, drafting stories from {start} to {end}! 🐢📆 Hang tight!"
+PLAN_REVIEW = "Here is the plan! 🐢📆 ✅ previews a day, 🔄 drafts it again\n\n{days}"
+USAGE_SUMMARY = (
+    "Here is what I spent on LLMs in the last {days} days! 🐢💸\n\n{summary}"
+)
+NO_USAGE = "I haven't called any LLMs in the last {days} days! 🐢🤔"
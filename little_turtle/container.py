@@ -1,14 +1,22 @@
-
+from aiogram.fsm.storage.redis import RedisStorage
 from dependency_injector import containers, providers
 
-from little_turtle.llm_provider import LLMProvider, ProviderType
+from little_turtle.llm_provider import (
+    CacheMode,
+    HedgedLLMClient,
+    LLMProvider,
+    LocalResponseCache,
+    ProviderType,
+    RedisResponseCache,
+    UsageTracker,
+)
 from little_turtle.agents import (
     StoryAgent,
     HistoricalEventsAgent,
     ImageAgent,
 )
-from little_turtle.controlles import StoriesController
-from little_turtle.handlers import TelegramHandlers
+from little_turtle.controlles import GenerationJobManager, StoriesController
+from little_turtle.handlers import InstrumentedStorage, TelegramHandlers
 from little_turtle.handlers.routers import (
     SystemRouter,
     AdminCommandsRouter,
@@ -17,87 +25,189 @@ from little_turtle.handlers.routers import (
 from little_turtle.handlers.routers.callback_query_handler_router import (
     CallbackQueryHandlerRouter,
 )
-from little_turtle.prompts.prompts_provider import PromptsProvider
 from little_turtle.app_config import create_app_config
 from little_turtle.services import (
+    DraftsStorage,
+    HistoricalEventsCache,
+    HistoricalEventsService,
     LoggerService,
-    TelegramService,
+)
+from little_turtle.resources import (
+    init_bot,
+    init_llm_client,
+    init_metrics_server,
+    init_prompts_provider,
+    init_redis_client,
+    init_telegram_service,
 )
 
 
 class Container(containers.DeclarativeContainer):
-    logger_service = providers.Factory(LoggerService)
+    logger_service = providers.Singleton(LoggerService)
 
     config = providers.Singleton(create_app_config)
-    telegram_service = providers.Singleton(TelegramService, config=config)
+    telegram_service = providers.Resource(init_telegram_service, config=config)
+    redis_client = providers.Resource(init_redis_client, config=config)
+    historical_events_cache = providers.Singleton(
+        HistoricalEventsCache, redis_client=redis_client, config=config
+    )
+    drafts_storage = providers.Singleton(
+        DraftsStorage, redis_client=redis_client, config=config
+    )
+    historical_events_service = providers.Singleton(
+        HistoricalEventsService, config=config
+    )
 
-    llm_provider = providers.Singleton(LLMProvider, config=config)
+    response_cache = providers.Selector(
+        config.provided.LLM_CACHE_BACKEND,
+        local=providers.Singleton(
+            LocalResponseCache, max_entries=config.provided.LLM_CACHE_MAX_ENTRIES
+        ),
+        redis=providers.Singleton(
+            RedisResponseCache,
+            redis_client=redis_client,
+            ttl=config.provided.LLM_CACHE_TTL_SECONDS,
+        ),
+    )
+    usage_tracker = providers.Singleton(
+        UsageTracker,
+        redis_client=redis_client,
+        max_len=config.provided.LLM_USAGE_STREAM_MAX_LEN,
+        tz_offset=config.provided.DEFAULT_TZ,
+        logger_service=logger_service,
+    )
+    llm_provider = providers.Singleton(
+        LLMProvider,
+        config=config,
+        response_cache=response_cache,
+        logger_service=logger_service,
+        usage_tracker=usage_tracker,
+    )
 
-    openai_client = providers.Factory(
-        lambda provider: provider.build(ProviderType.OPENAI), provider=llm_provider
+    openai_client = providers.Resource(
+        init_llm_client, provider=llm_provider, provider_type=ProviderType.OPENAI
     )
 
-    anthropic_client = providers.Factory(
-        lambda provider: provider.build(ProviderType.ANTHROPIC), provider=llm_provider
+    anthropic_client = providers.Resource(
+        init_llm_client, provider=llm_provider, provider_type=ProviderType.ANTHROPIC
     )
 
-    prompts_provider = providers.Singleton(PromptsProvider)
+    openai_batch_backend = providers.Singleton(
+        lambda provider, client: provider.build_batch_backend(
+            ProviderType.OPENAI, client
+        ),
+        provider=llm_provider,
+        client=openai_client,
+    )
+    anthropic_batch_backend = providers.Singleton(
+        lambda provider, client: provider.build_batch_backend(
+            ProviderType.ANTHROPIC, client
+        ),
+        provider=llm_provider,
+        client=anthropic_client,
+    )
 
-    story_agent = providers.Factory(
-        StoryAgent, llm_client=openai_client, prompts_provider=prompts_provider
+    story_llm_client = providers.Callable(
+        lambda config, primary, secondary, logger_service: (
+            HedgedLLMClient(primary, secondary, config, logger_service)
+            if config.LLM_HEDGING_ENABLED
+            else primary
+        ),
+        config=config,
+        primary=openai_client,
+        secondary=anthropic_client,
+        logger_service=logger_service,
+    )
+
+    prompts_provider = providers.Resource(
+        init_prompts_provider, config=config, logger_service=logger_service
     )
-    historical_events_agent = providers.Factory(
+
+    story_agent = providers.Singleton(
+        StoryAgent,
+        llm_client=story_llm_client,
+        prompts_provider=prompts_provider,
+        cache_mode=providers.Callable(
+            CacheMode, config.provided.STORY_AGENT_CACHE_MODE
+        ),
+    )
+    historical_events_agent = providers.Singleton(
         HistoricalEventsAgent,
         llm_client=anthropic_client,
         prompts_provider=prompts_provider,
+        cache_mode=providers.Callable(
+            CacheMode, config.provided.HISTORICAL_EVENTS_AGENT_CACHE_MODE
+        ),
     )
-    image_agent = providers.Factory(
-        ImageAgent, llm_client=openai_client, prompts_provider=prompts_provider
+    image_agent = providers.Singleton(
+        ImageAgent,
+        llm_client=openai_client,
+        prompts_provider=prompts_provider,
+        cache_mode=providers.Callable(
+            CacheMode, config.provided.IMAGE_AGENT_CACHE_MODE
+        ),
     )
 
-    stories_controller = providers.Factory(
+    stories_controller = providers.Singleton(
         StoriesController,
         config=config,
         story_agent=story_agent,
         telegram_service=telegram_service,
         image_agent=image_agent,
         historical_events_agent=historical_events_agent,
+        historical_events_cache=historical_events_cache,
+        historical_events_service=historical_events_service,
+        drafts_storage=drafts_storage,
     )
 
-    telegram_handlers = providers.Factory(
+    generation_jobs = providers.Singleton(
+        GenerationJobManager, config=config, logger_service=logger_service
+    )
+
+    bot = providers.Resource(init_bot, config=config)
+    fsm_storage = providers.Singleton(
+        InstrumentedStorage, providers.Singleton(RedisStorage, redis=redis_client)
+    )
+    metrics_server = providers.Resource(
+        init_metrics_server, config=config, logger_service=logger_service
+    )
+    telegram_handlers = providers.Singleton(
         TelegramHandlers,
         config=config,
         logger_service=logger_service,
-    )
-    bot = providers.Callable(
-        lambda telegram_handlers: telegram_handlers.bot,
-        telegram_handlers=telegram_handlers,
+        bot=bot,
+        storage=fsm_storage,
     )
 
-    system_router = providers.Factory(
+    system_router = providers.Singleton(
         SystemRouter,
         bot=bot,
         config_service=config,
         logger_service=logger_service,
     )
-    admin_commands_router = providers.Factory(
+    admin_commands_router = providers.Singleton(
         AdminCommandsRouter,
         bot=bot,
         config_service=config,
+        logger_service=logger_service,
         telegram_service=telegram_service,
         story_controller=stories_controller,
+        generation_jobs=generation_jobs,
+        usage_tracker=usage_tracker,
     )
-    callback_query_handler_router = providers.Factory(
+    callback_query_handler_router = providers.Singleton(
         CallbackQueryHandlerRouter,
         bot=bot,
         config_service=config,
         logger_service=logger_service,
         telegram_service=telegram_service,
         story_controller=stories_controller,
+        generation_jobs=generation_jobs,
     )
-    set_state_router = providers.Factory(
+    set_state_router = providers.Singleton(
         SetStateRouter,
         bot=bot,
         config_service=config,
         story_controller=stories_controller,
+        generation_jobs=generation_jobs,
     )
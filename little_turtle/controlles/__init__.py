@@ -1,3 +1,9 @@
+from .generation_jobs import GenerationJob, GenerationJobManager, GenerationKind
 from .stories_controller import StoriesController
 
-__all__ = ["StoriesController"]
+__all__ = [
+    "GenerationJob",
+    "GenerationJobManager",
+    "GenerationKind",
+    "StoriesController",
+]
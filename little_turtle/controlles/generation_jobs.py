@@ -0,0 +1,152 @@
+import asyncio
+import uuid
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Optional
+
+from little_turtle import metrics
+from little_turtle.app_config import AppConfig
+from little_turtle.services import LoggerService
+
+
+class GenerationKind(str, Enum):
+    PIPELINE = "pipeline"
+    STORY = "story"
+    IMAGE = "image"
+    TOPICS = "topics"
+    PLAN = "plan"
+    DRAFT = "draft"
+
+
+# A pipeline only sequences other stages, whose LLM calls are already limited
+# per provider, so holding a worker for its whole run would starve the rest
+UNGATED_KINDS = {GenerationKind.PIPELINE}
+
+
+@dataclass
+class GenerationJob:
+    id: str
+    chat_id: int
+    kind: GenerationKind
+    provider: Optional[str]
+    task: asyncio.Task
+    scope: Optional[str] = None
+
+
+class GenerationJobManager:
+    def __init__(self, config: AppConfig, logger_service: LoggerService):
+        self.logger_service = logger_service
+        self.provider_concurrency = config.GENERATION_PROVIDER_CONCURRENCY
+        self._workers = asyncio.Semaphore(config.GENERATION_WORKERS)
+        self._provider_limits: dict[str, asyncio.Semaphore] = {}
+        self._jobs: dict[
+            int, dict[tuple[GenerationKind, Optional[str]], GenerationJob]
+        ] = {}
+
+    def submit(
+        self,
+        chat_id: int,
+        kind: GenerationKind,
+        call: Callable[[], Awaitable[Any]],
+        provider: Optional[str] = None,
+        scope: Optional[str] = None,
+    ) -> GenerationJob:
+        # A new job of the same kind and scope supersedes the one still running
+        self.cancel(chat_id, kind, scope)
+
+        job_id = uuid.uuid4().hex[:8]
+        job = GenerationJob(
+            id=job_id,
+            chat_id=chat_id,
+            kind=kind,
+            provider=provider,
+            task=asyncio.create_task(self.__run(kind, provider, call)),
+            scope=scope,
+        )
+        job.task.add_done_callback(lambda task: self.__finish(job, task))
+        self._jobs.setdefault(chat_id, {})[(kind, scope)] = job
+
+        self.logger_service.info(
+            "Generation job submitted",
+            job_id=job_id,
+            chat_id=chat_id,
+            kind=kind,
+            provider=provider,
+            scope=scope,
+        )
+
+        return job
+
+    def cancel(
+        self,
+        chat_id: int,
+        kind: Optional[GenerationKind] = None,
+        scope: Optional[str] = None,
+    ) -> int:
+        jobs = self._jobs.get(chat_id, {})
+        keys = [(kind, scope)] if kind is not None else list(jobs)
+
+        cancelled = 0
+        for key in keys:
+            job = jobs.pop(key, None)
+            if job is not None and job.task.cancel():
+                cancelled += 1
+
+        if not jobs:
+            self._jobs.pop(chat_id, None)
+
+        return cancelled
+
+    def get_jobs(self, chat_id: int) -> list[GenerationJob]:
+        return list(self._jobs.get(chat_id, {}).values())
+
+    async def __run(
+        self,
+        kind: GenerationKind,
+        provider: Optional[str],
+        call: Callable[[], Awaitable[Any]],
+    ):
+        async with AsyncExitStack() as stack:
+            if kind not in UNGATED_KINDS:
+                await stack.enter_async_context(self._workers)
+            if provider is not None:
+                await stack.enter_async_context(self.__get_provider_limit(provider))
+
+            return await call()
+
+    def __get_provider_limit(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._provider_limits:
+            self._provider_limits[provider] = asyncio.Semaphore(
+                self.provider_concurrency
+            )
+
+        return self._provider_limits[provider]
+
+    def __finish(self, job: GenerationJob, task: asyncio.Task):
+        jobs = self._jobs.get(job.chat_id, {})
+        key = (job.kind, job.scope)
+        if jobs.get(key) is job:
+            del jobs[key]
+            if not jobs:
+                self._jobs.pop(job.chat_id, None)
+
+        if task.cancelled():
+            metrics.GENERATION_JOBS.labels(job.kind.value, "cancelled").inc()
+            self.logger_service.info(
+                "Generation job cancelled", job_id=job.id, chat_id=job.chat_id
+            )
+        elif task.exception() is not None:
+            metrics.GENERATION_JOBS.labels(job.kind.value, "error").inc()
+            self.logger_service.error(
+                "Generation job failed",
+                job_id=job.id,
+                chat_id=job.chat_id,
+                kind=job.kind,
+                exc_info=task.exception(),
+            )
+        else:
+            metrics.GENERATION_JOBS.labels(job.kind.value, "ok").inc()
+            self.logger_service.info(
+                "Generation job finished", job_id=job.id, chat_id=job.chat_id
+            )
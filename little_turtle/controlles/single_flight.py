@@ -0,0 +1,41 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._waiters: dict[Hashable, int] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(call())
+            # Callers that gave up may leave the shared task unobserved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            task.add_done_callback(lambda t: self.__forget(key, t))
+            self._inflight[key] = task
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            # One caller being cancelled must not cancel the call for the others
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters.get(key) == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self.__release(key)
+
+    def __release(self, key: Hashable):
+        waiters = self._waiters.get(key, 0) - 1
+        if waiters > 0:
+            self._waiters[key] = waiters
+        else:
+            self._waiters.pop(key, None)
+
+    def __forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
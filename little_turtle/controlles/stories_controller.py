@@ -1,5 +1,8 @@
+import asyncio
+import base64
 from datetime import timedelta, datetime
-from typing import TypedDict, List
+from functools import partial
+from typing import Any, TypedDict, List, Optional, AsyncIterator
 
 from little_turtle.agents import (
     HistoricalEventsAgent,
@@ -9,12 +12,33 @@ from little_turtle.agents import (
 from little_turtle.agents.historical_events_agent import (
     HistoricalEvents,
     HistoricalEventsAgentVariables,
+    extract_structured_output,
 )
 from little_turtle.agents.story_agent import StoryAgentVariables
 from little_turtle.agents.image_agent import ImageAgentVariables
 from little_turtle.app_config import AppConfig
-from little_turtle.services import TelegramService
-from little_turtle.utils import get_day_of_week
+from little_turtle.llm_provider import (
+    BatchBackend,
+    BatchError,
+    ProviderType,
+    run_batch,
+    story_date_context,
+)
+from little_turtle.controlles.single_flight import SingleFlight
+from little_turtle.controlles.story_pool import StoryPool
+from little_turtle.services import (
+    DraftsStorage,
+    HistoricalEventsCache,
+    HistoricalEventsService,
+    StoryDraft,
+    TelegramService,
+)
+from little_turtle.utils import (
+    get_day_of_week,
+    get_image_path,
+    random_pick_n,
+    write_file_to_disk,
+)
 
 
 class StoryResponse(TypedDict):
@@ -31,44 +55,190 @@ class StoriesController:
         image_agent: ImageAgent,
         historical_events_agent: HistoricalEventsAgent,
         telegram_service: TelegramService,
+        historical_events_cache: HistoricalEventsCache,
+        historical_events_service: HistoricalEventsService,
+        drafts_storage: DraftsStorage,
     ):
         self.config = config
         self.story_agent = story_agent
         self.historical_events_agent = historical_events_agent
         self.image_agent = image_agent
         self.telegram_service = telegram_service
+        self.historical_events_cache = historical_events_cache
+        self.historical_events_service = historical_events_service
+        self.drafts_storage = drafts_storage
+        self._story_pools: dict[int, StoryPool] = {}
+        self._single_flight = SingleFlight()
+        self._provider_limits = {
+            provider: asyncio.Semaphore(config.DRAFT_PROVIDER_CONCURRENCY)
+            for provider in ProviderType
+        }
+
+    async def suggest_on_this_day_events(
+        self, date: str, force_refresh: bool = False
+    ) -> HistoricalEvents:
+        return await self._single_flight.do(
+            ("topics", date, None, force_refresh),
+            partial(self.__suggest_on_this_day_events, date, force_refresh),
+        )
 
-    def suggest_on_this_day_events(self, date: str) -> HistoricalEvents:
+    async def __suggest_on_this_day_events(
+        self, date: str, force_refresh: bool
+    ) -> HistoricalEvents:
         date_object = datetime.strptime(date, "%d.%m.%Y")
-        formatted_date = date_object.strftime("%d %B")
+        language = self.config.GENERATION_LANGUAGE
+        prompt_version = await self.historical_events_agent.get_prompt_version()
 
-        return self.historical_events_agent.run(
-            HistoricalEventsAgentVariables(
-                language=self.config.GENERATION_LANGUAGE,
-                date=formatted_date,
+        if not force_refresh:
+            cached_events = await self.historical_events_cache.get(
+                date_object.day, date_object.month, language, prompt_version
             )
+            if cached_events is not None:
+                return HistoricalEvents.model_validate_json(cached_events)
+
+        with story_date_context(date):
+            events = await self.historical_events_agent.run(
+                self.__get_historical_events_variables(date)
+            )
+        await self.historical_events_cache.set(
+            date_object.day,
+            date_object.month,
+            language,
+            prompt_version,
+            events.model_dump_json(),
         )
 
-    def imagine_story(self, story: str) -> str:
-        return self.image_agent.run(
-            ImageAgentVariables(
-                story=story,
+        return events
+
+    def suggest_indexed_on_this_day_events(self, date: str) -> HistoricalEvents:
+        events = self.historical_events_service.get_by_date(date)
+
+        return HistoricalEvents(
+            events=random_pick_n(
+                events, min(self.config.FAST_TOPICS_COUNT, len(events))
             )
         )
 
-    def suggest_story(
+    async def invalidate_on_this_day_events(self, date: str) -> int:
+        date_object = datetime.strptime(date, "%d.%m.%Y")
+
+        return await self.historical_events_cache.invalidate(
+            date_object.day, date_object.month, self.config.GENERATION_LANGUAGE
+        )
+
+    async def imagine_story(self, story: str, date: Optional[str] = None) -> str:
+        return await self._single_flight.do(
+            ("image", None, story, None),
+            partial(self.__imagine_story, story, date),
+        )
+
+    async def __imagine_story(self, story: str, date: Optional[str]) -> str:
+        with story_date_context(date):
+            return await self.image_agent.run(ImageAgentVariables(story=story))
+
+    async def suggest_story(
         self,
         date: str,
         target_topics: List[str],
+        chat_id: Optional[int] = None,
+    ) -> str:
+        return await self._single_flight.do(
+            ("story", date, target_topics[0], chat_id),
+            partial(self.__suggest_story, date, target_topics, chat_id),
+        )
+
+    async def __suggest_story(
+        self, date: str, target_topics: List[str], chat_id: Optional[int]
     ) -> str:
-        return self.story_agent.run(
-            StoryAgentVariables(
-                current_date=f"{date} ({get_day_of_week(date)})",
-                language=self.config.GENERATION_LANGUAGE,
-                historical_event=target_topics[0],
+        pool = self.__get_story_pool(date, target_topics, chat_id)
+        if pool is None:
+            return await self.__generate_story(date, target_topics)
+
+        return await pool.pop()
+
+    async def stream_story(
+        self,
+        date: str,
+        target_topics: List[str],
+        chat_id: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        pool = self.__get_story_pool(date, target_topics, chat_id)
+        if pool is not None:
+            story = pool.take_ready()
+            if story is None and pool.has_pending():
+                # Waiting for a candidate that is already being generated is
+                # cheaper than streaming yet another one next to it
+                story = await self.suggest_story(date, target_topics, chat_id)
+            if story is not None:
+                yield story
+                return
+
+        with story_date_context(date):
+            async for chunk in self.story_agent.stream(
+                self.__get_story_variables(date, target_topics)
+            ):
+                yield chunk
+
+        # Candidates for the next regeneration only start once the streamed
+        # story is done, so streaming doesn't add STORY_POOL_SIZE calls to it
+        if pool is not None and self._story_pools.get(chat_id) is pool:
+            pool.refill()
+
+    def discard_story_pool(self, chat_id: int):
+        pool = self._story_pools.pop(chat_id, None)
+        if pool is not None:
+            pool.discard()
+
+    def __get_story_pool(
+        self, date: str, target_topics: List[str], chat_id: Optional[int]
+    ) -> Optional[StoryPool]:
+        if chat_id is None or self.config.STORY_POOL_SIZE <= 0:
+            return None
+
+        key = (date, target_topics[0])
+        pool = self._story_pools.get(chat_id)
+        if pool is None or pool.key != key:
+            self.discard_story_pool(chat_id)
+            pool = StoryPool(
+                key,
+                self.config.STORY_POOL_SIZE,
+                partial(self.__generate_story, date, target_topics),
             )
+            self._story_pools[chat_id] = pool
+
+        return pool
+
+    async def __generate_story(self, date: str, target_topics: List[str]) -> str:
+        with story_date_context(date):
+            return await self.story_agent.run(
+                self.__get_story_variables(date, target_topics)
+            )
+
+    def __get_historical_events_variables(
+        self, date: str
+    ) -> HistoricalEventsAgentVariables:
+        return HistoricalEventsAgentVariables(
+            language=self.config.GENERATION_LANGUAGE,
+            date=datetime.strptime(date, "%d.%m.%Y").strftime("%d %B"),
         )
 
+    def __get_story_variables(
+        self, date: str, target_topics: List[str]
+    ) -> StoryAgentVariables:
+        return StoryAgentVariables(
+            current_date=f"{date} ({get_day_of_week(date)})",
+            language=self.config.GENERATION_LANGUAGE,
+            historical_event=target_topics[0],
+        )
+
+    @staticmethod
+    def get_target_topics(date: str, topics: HistoricalEvents) -> List[str]:
+        # Stories are written about the first topic, without one they can't be
+        if not topics.events:
+            raise ValueError(f"No topics were found for {date}")
+
+        return topics.events[:1]
+
     async def get_next_story_date(self) -> str:
         last_scheduled_story_date = (
             await self.telegram_service.get_last_scheduled_message_date(
@@ -79,3 +249,161 @@ class StoriesController:
 
         raw_next_story_date = last_scheduled_story_date + timedelta(days=1)
         return raw_next_story_date.strftime("%d.%m.%Y")
+
+    async def prepare_draft(self, date: Optional[str] = None) -> StoryDraft:
+        date = date or await self.get_next_story_date()
+
+        return await self._single_flight.do(
+            ("draft", date, None, None), partial(self.__prepare_draft, date)
+        )
+
+    async def __prepare_draft(self, date: str) -> StoryDraft:
+        async with self._provider_limits[ProviderType.ANTHROPIC]:
+            topics = await self.suggest_on_this_day_events(date)
+        target_topics = self.get_target_topics(date, topics)
+
+        async with self._provider_limits[ProviderType.OPENAI]:
+            story = await self.suggest_story(date, target_topics)
+        async with self._provider_limits[ProviderType.OPENAI]:
+            image_base64 = await self.imagine_story(story, date)
+
+        return await self.__save_draft(date, target_topics, story, image_base64)
+
+    async def prepare_drafts(
+        self, dates: List[str], force: bool = False
+    ) -> dict[str, StoryDraft | Exception]:
+        # Every day goes through its stages on its own, so the range takes
+        # about as long as its slowest day within the provider limits
+        drafts = await asyncio.gather(
+            *(self.__get_or_prepare_draft(date, force) for date in dates),
+            return_exceptions=True,
+        )
+
+        return dict(zip(dates, drafts))
+
+    async def __get_or_prepare_draft(self, date: str, force: bool) -> StoryDraft:
+        draft = None if force else await self.get_draft(date)
+
+        return draft or await self.prepare_draft(date)
+
+    async def get_next_story_dates(
+        self, days: int, start: Optional[str] = None
+    ) -> List[str]:
+        start_date = datetime.strptime(
+            start or await self.get_next_story_date(), "%d.%m.%Y"
+        )
+
+        return [
+            (start_date + timedelta(days=day)).strftime("%d.%m.%Y")
+            for day in range(days)
+        ]
+
+    async def prepare_drafts_in_batch(
+        self,
+        dates: List[str],
+        topics_backend: BatchBackend,
+        generation_backend: BatchBackend,
+    ) -> dict[str, StoryDraft | Exception]:
+        poll_interval = self.config.BATCH_POLL_INTERVAL_SECONDS
+        results: dict[str, StoryDraft | Exception] = {}
+
+        topic_requests = [
+            await self.historical_events_agent.build_request(
+                self.__get_custom_id(date),
+                self.__get_historical_events_variables(date),
+            )
+            for date in dates
+        ]
+        topic_responses = await run_batch(topics_backend, topic_requests, poll_interval)
+        target_topics: dict[str, List[str]] = {}
+        for date in dates:
+            try:
+                response = self.__unwrap_batch_result(topic_responses, date)
+                target_topics[date] = self.get_target_topics(
+                    date, extract_structured_output(response)
+                )
+            except Exception as e:
+                results[date] = e
+
+        story_requests = [
+            await self.story_agent.build_request(
+                self.__get_custom_id(date), self.__get_story_variables(date, topics)
+            )
+            for date, topics in target_topics.items()
+        ]
+        story_responses = await run_batch(
+            generation_backend, story_requests, poll_interval
+        )
+        stories: dict[str, str] = {}
+        for date in target_topics:
+            try:
+                stories[date] = self.__unwrap_batch_result(
+                    story_responses, date
+                ).content
+            except Exception as e:
+                results[date] = e
+
+        image_requests = [
+            await self.image_agent.build_request(
+                self.__get_custom_id(date), ImageAgentVariables(story=story)
+            )
+            for date, story in stories.items()
+        ]
+        image_responses = await run_batch(
+            generation_backend, image_requests, poll_interval
+        )
+        for date, story in stories.items():
+            try:
+                image_base64 = self.__unwrap_batch_result(image_responses, date)
+                if not image_base64:
+                    raise BatchError("No image was generated")
+
+                results[date] = await self.__save_draft(
+                    date, target_topics[date], story, image_base64
+                )
+            except Exception as e:
+                results[date] = e
+
+        return results
+
+    async def __save_draft(
+        self, date: str, target_topics: List[str], story: str, image_base64: str
+    ) -> StoryDraft:
+        image_path = get_image_path(
+            self.config.BASE_IMAGE_FOLDER, f"draft_{date.replace('.', '_')}.png"
+        )
+        # Images are several megabytes, decoding and writing them would
+        # block the event loop
+        await asyncio.to_thread(self.__write_image, image_path, image_base64)
+
+        draft = StoryDraft(
+            date=date, target_topics=target_topics, story=story, image=image_path
+        )
+        await self.drafts_storage.save(draft)
+
+        return draft
+
+    @staticmethod
+    def __write_image(image_path: str, image_base64: str):
+        write_file_to_disk(image_path, base64.b64decode(image_base64))
+
+    @staticmethod
+    def __get_custom_id(date: str) -> str:
+        # Batch APIs only accept ids matching ^[a-zA-Z0-9_-]{1,64}$
+        return "d_" + date.replace(".", "_")
+
+    @staticmethod
+    def __unwrap_batch_result(responses: dict[str, Any], date: str) -> Any:
+        response = responses.get(StoriesController.__get_custom_id(date))
+        if response is None:
+            raise BatchError(f"No batch result for {date}")
+        if isinstance(response, Exception):
+            raise response
+
+        return response
+
+    async def get_draft(self, date: str) -> Optional[StoryDraft]:
+        return await self.drafts_storage.get(date)
+
+    async def delete_draft(self, date: str):
+        await self.drafts_storage.delete(date)
@@ -0,0 +1,65 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+
+class StoryPool:
+    def __init__(
+        self,
+        key: tuple[str, str],
+        size: int,
+        generate: Callable[[], Awaitable[str]],
+    ):
+        self.key = key
+        self.size = size
+        self.generate = generate
+        self.candidates: list[asyncio.Task] = []
+
+    async def pop(self) -> str:
+        if not self.candidates:
+            self.candidates.append(self.__create_candidate())
+
+        candidate = self.__pick_candidate()
+        self.candidates.remove(candidate)
+        self.refill()
+
+        return await candidate
+
+    def take_ready(self) -> Optional[str]:
+        for candidate in self.candidates:
+            if candidate.done() and candidate.exception() is None:
+                self.candidates.remove(candidate)
+                self.refill()
+                return candidate.result()
+
+        return None
+
+    def has_pending(self) -> bool:
+        return any(not candidate.done() for candidate in self.candidates)
+
+    def refill(self):
+        while len(self.candidates) < self.size:
+            self.candidates.append(self.__create_candidate())
+
+    def discard(self):
+        for candidate in self.candidates:
+            candidate.cancel()
+
+        self.candidates.clear()
+
+    def __pick_candidate(self) -> asyncio.Task:
+        for candidate in self.candidates:
+            if candidate.done() and candidate.exception() is None:
+                return candidate
+
+        for candidate in self.candidates:
+            if not candidate.done():
+                return candidate
+
+        return self.candidates[0]
+
+    def __create_candidate(self) -> asyncio.Task:
+        candidate = asyncio.create_task(self.generate())
+        # Unused candidates may fail or be dropped, mark their errors as seen
+        candidate.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+        return candidate
@@ -1,7 +1,9 @@
+from .instrumented_storage import InstrumentedStorage
 from .scheduler_handler import SchedulerHandler
 from .telegram_handlers import TelegramHandlers
 
 __all__ = [
+    "InstrumentedStorage",
     "SchedulerHandler",
     "TelegramHandlers",
 ]
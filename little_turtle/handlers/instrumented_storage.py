@@ -0,0 +1,39 @@
+from typing import Any, Awaitable, Mapping, TypeVar
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+
+from little_turtle import metrics
+
+T = TypeVar("T")
+
+
+class InstrumentedStorage(BaseStorage):
+    def __init__(self, storage: BaseStorage):
+        self.storage = storage
+
+    async def set_state(self, key: StorageKey, state: str | State | None = None):
+        await self.__track("set_state", self.storage.set_state(key, state))
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        return await self.__track("get_state", self.storage.get_state(key))
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]):
+        await self.__track("set_data", self.storage.set_data(key, data))
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        return await self.__track("get_data", self.storage.get_data(key))
+
+    async def close(self):
+        await self.storage.close()
+
+    @staticmethod
+    async def __track(operation: str, call: Awaitable[T]) -> T:
+        try:
+            result = await call
+        except Exception:
+            metrics.FSM_OPERATIONS.labels(operation, "error").inc()
+            raise
+
+        metrics.FSM_OPERATIONS.labels(operation, "ok").inc()
+        return result
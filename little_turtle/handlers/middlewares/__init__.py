@@ -1,3 +1,11 @@
 from .context_middleware import context_middleware, BotContext
+from .metrics_middleware import telegram_metrics_middleware
+from .recording_middleware import dump_update, update_recording_middleware
 
-__all__ = ["context_middleware", "BotContext"]
+__all__ = [
+    "context_middleware",
+    "BotContext",
+    "telegram_metrics_middleware",
+    "dump_update",
+    "update_recording_middleware",
+]
@@ -4,6 +4,8 @@ from typing import Callable, Dict, Any, Awaitable
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Update, Message
 
+from little_turtle.llm_provider import chat_context
+
 
 @dataclass
 class BotContext:
@@ -34,4 +36,6 @@ async def context_middleware(
         state=state,
     )
 
-    return await handler(event, data)
+    # Generations started while handling the update are accounted to its chat
+    with chat_context(chat_id):
+        return await handler(event, data)
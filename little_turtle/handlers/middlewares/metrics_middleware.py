@@ -0,0 +1,29 @@
+import time
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import NextRequestMiddlewareType
+from aiogram.methods import Response, TelegramMethod
+
+from little_turtle import metrics
+
+
+async def telegram_metrics_middleware(
+    make_request: NextRequestMiddlewareType,
+    bot: Bot,
+    method: TelegramMethod,
+) -> Response:
+    name = method.__api_method__
+    started_at = time.perf_counter()
+
+    try:
+        response = await make_request(bot, method)
+    except Exception:
+        metrics.TELEGRAM_REQUESTS.labels(name, "error").inc()
+        raise
+    finally:
+        metrics.TELEGRAM_REQUEST_SECONDS.labels(name).observe(
+            time.perf_counter() - started_at
+        )
+
+    metrics.TELEGRAM_REQUESTS.labels(name, "ok").inc()
+    return response
@@ -0,0 +1,29 @@
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram.types import Update
+
+
+def dump_update(update: Update, received_at: float) -> str:
+    payload = update.model_dump(mode="json", by_alias=True, exclude_none=True)
+    return json.dumps({"ts": received_at, "update": payload}, ensure_ascii=False)
+
+
+def update_recording_middleware(path: str):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Line buffered, so a recording survives the bot being killed
+    recording = open(path, "a", buffering=1, encoding="utf-8")
+
+    async def record_update(
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any],
+    ):
+        recording.write(dump_update(event, time.time()) + "\n")
+        return await handler(event, data)
+
+    return record_update
@@ -13,6 +13,8 @@ class ForwardAction(str, Enum):
     SCHEDULE = "schedule"
     TARGET_TOPIC = "target_topic"
     SELECT_TARGET_TOPIC = "select_target_topic"
+    APPROVE_DRAFT = "approve_draft"
+    REGENERATE_DRAFT = "regenerate_draft"
 
 
 class ForwardCallback(CallbackData, prefix="turtle_forward"):
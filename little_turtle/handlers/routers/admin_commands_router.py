@@ -1,14 +1,26 @@
+import asyncio
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Optional
+
 from aiogram import Router, Bot
-from aiogram.filters import Command
+from aiogram.filters import Command, CommandObject
 from aiogram.filters.callback_data import CallbackData
 from aiogram.fsm.state import StatesGroup, State
 from aiogram.types import Message
 
-from little_turtle.controlles import StoriesController
+from little_turtle.constants import error_messages, messages
+from little_turtle.controlles import (
+    GenerationJobManager,
+    GenerationKind,
+    StoriesController,
+)
 from little_turtle.handlers.middlewares import BotContext
+from little_turtle.llm_provider import UsageTotals, UsageTracker
 from little_turtle.handlers.routers.base.base_stories_router import BaseStoriesRouter
 from little_turtle.app_config import AppConfig
-from little_turtle.services import TelegramService
+from little_turtle.services import LoggerService, TelegramService
+from little_turtle.utils import StageTimer, validate_date
 
 
 class ImageCallback(CallbackData, prefix="turtle_image"):
@@ -29,17 +41,24 @@ class AdminCommandsRouter(BaseStoriesRouter):
         self,
         bot: Bot,
         config_service: AppConfig,
+        logger_service: LoggerService,
         telegram_service: TelegramService,
         story_controller: StoriesController,
+        generation_jobs: GenerationJobManager,
+        usage_tracker: UsageTracker,
     ):
-        super().__init__(bot, story_controller, config_service)
+        super().__init__(bot, story_controller, config_service, generation_jobs)
 
         self.config = config_service
+        self.logger_service = logger_service
         self.telegram_service = telegram_service
+        self.usage_tracker = usage_tracker
 
     def get_router(self) -> Router:
         self.router.message(Command("story"))(self.story_handler)
         self.router.message(Command("preview"))(self.preview_handler)
+        self.router.message(Command("plan"))(self.plan_handler)
+        self.router.message(Command("usage"))(self.usage_handler)
 
         return self.router
 
@@ -47,18 +66,189 @@ class AdminCommandsRouter(BaseStoriesRouter):
         for chat_id in self.config.USER_IDS_TO_SEND_MORNING_MSG:
             await self.telegram_service.send_message(chat_id, "/story")
 
-    async def story_handler(self, _: Message, ctx: BotContext):
-        next_story_date = await self.story_controller.get_next_story_date()
-        await ctx.state.update_data(date=next_story_date)
-        await self.send_message(next_story_date, ctx.chat_id)
-
-        topics = await self.suggest_target_topics(ctx)
-        await self.set_target_topic(topics.events[0], ctx)
+    async def pregenerate_draft(self):
+        try:
+            draft = await self.story_controller.prepare_draft()
+        except Exception as e:
+            self.logger_service.error("Failed to pre-generate draft", exc_info=e)
+            return
 
-        story = await self.generate_story(ctx)
-        await ctx.state.update_data(story=story)
+        self.logger_service.info("Draft pre-generated", date=draft.date)
 
-        await self.generate_image(ctx)
+    async def story_handler(self, _: Message, ctx: BotContext):
+        # Runs as a job so /cancel can stop the topics, story and image stages
+        self.async_generate_action(
+            ctx, self.__run_story_pipeline, GenerationKind.PIPELINE
+        )
+
+    async def __run_story_pipeline(self, ctx: BotContext):
+        timer = StageTimer()
+
+        # The next date is almost always tomorrow, so topics for it are
+        # requested while the scheduled messages are still being looked up
+        speculative_date = (datetime.now() + timedelta(days=1)).strftime("%d.%m.%Y")
+        speculative_topics = asyncio.create_task(
+            self.story_controller.suggest_on_this_day_events(speculative_date)
+        )
+        speculative_topics.add_done_callback(lambda t: t.cancelled() or t.exception())
+        pending_messages: list[asyncio.Task] = []
+        next_story_date = None
+
+        try:
+            next_story_date = await self.story_controller.get_next_story_date()
+            timer.mark("date")
+            await ctx.state.update_data(date=next_story_date)
+            await self.send_message(next_story_date, ctx.chat_id)
+
+            draft = await self.story_controller.get_draft(next_story_date)
+            if draft is not None:
+                await ctx.state.update_data(**draft.model_dump())
+                await self.preview_story(ctx)
+                return
+
+            if next_story_date == speculative_date:
+                topics = await speculative_topics
+            else:
+                speculative_topics.cancel()
+                topics = await self.story_controller.suggest_on_this_day_events(
+                    next_story_date
+                )
+            timer.mark("topics")
+
+            target_topics = self.story_controller.get_target_topics(
+                next_story_date, topics
+            )
+            await self.set_target_topic(target_topics[0], ctx)
+            topics_message = asyncio.create_task(self.send_target_topics(topics, ctx))
+            pending_messages.append(topics_message)
+
+            if self.config.STORY_STREAMING_ENABLED:
+                await topics_message
+                story = await self.generate_story(ctx)
+            else:
+                story = await self.story_controller.suggest_story(
+                    next_story_date, target_topics, chat_id=ctx.chat_id
+                )
+                await topics_message
+                pending_messages.append(
+                    asyncio.create_task(self.send_story(story, ctx))
+                )
+            timer.mark("story")
+            await ctx.state.update_data(story=story)
+
+            image_base64 = await self.story_controller.imagine_story(
+                story, next_story_date
+            )
+            timer.mark("image")
+
+            await asyncio.gather(*pending_messages)
+            await self.send_image(image_base64, ctx)
+        finally:
+            speculative_topics.cancel()
+            for message_task in pending_messages:
+                message_task.cancel()
+
+            self.logger_service.info(
+                "Story pipeline finished",
+                date=next_story_date,
+                speculative_date_hit=next_story_date == speculative_date,
+                **timer.report(),
+            )
 
     async def preview_handler(self, _: Message, ctx: BotContext):
         await self.preview_story(ctx)
+
+    async def plan_handler(self, _: Message, command: CommandObject, ctx: BotContext):
+        args = (command.args or "").split()
+        start = args.pop(0) if args and validate_date(args[0]) else None
+        days = args.pop(0) if args else str(self.config.PLAN_DEFAULT_DAYS)
+
+        if args or not days.isdigit() or not 0 < int(days) <= self.config.PLAN_MAX_DAYS:
+            await self.send_message(
+                error_messages.ERR_INVALID_PLAN_RANGE.format(
+                    max_days=self.config.PLAN_MAX_DAYS
+                ),
+                ctx.chat_id,
+            )
+            return
+
+        self.async_generate_action(
+            ctx, partial(self.__plan_drafts, int(days), start), GenerationKind.PLAN
+        )
+
+    async def __plan_drafts(self, days: int, start: Optional[str], ctx: BotContext):
+        timer = StageTimer()
+        dates = await self.story_controller.get_next_story_dates(days, start)
+        await self.send_message(
+            messages.PLAN_IN_PROGRESS.format(start=dates[0], end=dates[-1]),
+            ctx.chat_id,
+        )
+
+        drafts = await self.story_controller.prepare_drafts(dates)
+        timer.mark("drafts")
+
+        self.logger_service.info(
+            "Plan drafted",
+            start=dates[0],
+            days=days,
+            failed=[
+                date for date, draft in drafts.items() if isinstance(draft, Exception)
+            ],
+            **timer.report(),
+        )
+        await self.send_drafts_review(drafts, ctx)
+
+    async def usage_handler(self, _: Message, command: CommandObject, ctx: BotContext):
+        days = (command.args or "7").strip()
+        if not days.isdigit() or not 0 < int(days) <= self.config.USAGE_MAX_DAYS:
+            await self.send_message(
+                error_messages.ERR_INVALID_USAGE_DAYS.format(
+                    max_days=self.config.USAGE_MAX_DAYS
+                ),
+                ctx.chat_id,
+            )
+            return
+
+        summary = await self.usage_tracker.summarize(int(days))
+        if not summary:
+            await self.send_message(messages.NO_USAGE.format(days=days), ctx.chat_id)
+            return
+
+        lines = []
+        total = UsageTotals()
+        for day, agents in summary.items():
+            lines.append(f"📅 {day}: ${sum(t.cost_usd for t in agents.values()):.2f}")
+            for agent, totals in agents.items():
+                lines.append(f"  {agent}: {self.__format_usage(totals)}")
+                total.cost_usd += totals.cost_usd
+                total.calls += totals.calls
+            lines.append("")
+        lines.append(f"Total: ${total.cost_usd:.2f} for {total.calls} calls")
+
+        await self.send_message(
+            messages.USAGE_SUMMARY.format(days=days, summary="\n".join(lines)),
+            ctx.chat_id,
+        )
+
+    @staticmethod
+    def __format_usage(totals: UsageTotals) -> str:
+        parts = [
+            f"${totals.cost_usd:.3f}",
+            f"{totals.calls} calls",
+            f"{totals.input_tokens + totals.cached_tokens} in",
+            f"{totals.output_tokens} out",
+            f"avg {totals.avg_latency_ms / 1000:.1f}s",
+            f"max {totals.max_latency_ms / 1000:.1f}s",
+        ]
+        if totals.cache_hits:
+            parts.append(f"{totals.cache_hits} cached")
+        if totals.cached_tokens:
+            parts.append(f"{totals.cached_tokens} prompt cache")
+        if totals.web_searches:
+            parts.append(f"{totals.web_searches} searches")
+        if totals.images:
+            parts.append(f"{totals.images} images")
+        if totals.errors:
+            parts.append(f"{totals.errors} errors")
+
+        return ", ".join(parts)
@@ -1,4 +1,6 @@
+import time
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 from aiogram import Router, Bot
 from aiogram.types import (
@@ -55,3 +57,41 @@ class BaseRouter(ABC):
             disable_notification=silent,
             reply_markup=buttons,
         )
+
+    async def stream_message(
+        self,
+        chunks: AsyncIterator[str],
+        chat_id: int,
+        placeholder: str,
+        edit_interval: float,
+        buttons: InlineKeyboardMarkup = None,
+    ) -> str:
+        message = await self.send_message(placeholder, chat_id)
+
+        text = ""
+        sent_text = placeholder
+        last_edit_at = time.monotonic()
+
+        async for chunk in chunks:
+            text += chunk
+
+            # Telegram throttles frequent edits, so only push the latest text
+            # once per interval and let the final edit catch up
+            if time.monotonic() - last_edit_at < edit_interval or not text.strip():
+                continue
+
+            await self.bot.edit_message_text(
+                text, chat_id=chat_id, message_id=message.message_id
+            )
+            sent_text = text
+            last_edit_at = time.monotonic()
+
+        if text != sent_text or buttons is not None:
+            await self.bot.edit_message_text(
+                text or sent_text,
+                chat_id=chat_id,
+                message_id=message.message_id,
+                reply_markup=buttons,
+            )
+
+        return text
@@ -1,18 +1,28 @@
 from abc import abstractmethod
 import base64
+from functools import partial
+from textwrap import shorten
 from typing import Optional, Callable
 
 from aiogram import Bot, Router
-from aiogram.types import BufferedInputFile
+from aiogram.types import BufferedInputFile, InlineKeyboardMarkup, Message
 
 from little_turtle.agents.historical_events_agent import HistoricalEvents
-from little_turtle.constants import Stickers, error_messages
-from little_turtle.controlles import StoriesController
+from little_turtle.constants import Stickers, error_messages, messages
+from little_turtle.controlles import (
+    GenerationJob,
+    GenerationJobManager,
+    GenerationKind,
+    StoriesController,
+)
 from little_turtle.handlers.middlewares import BotContext
+from little_turtle.llm_provider import ProviderType
 from little_turtle.handlers.routers.actions import ForwardCallback, ForwardAction
 from little_turtle.handlers.routers.base.base_router import BaseRouter
 from little_turtle.app_config import AppConfig
+from little_turtle.services import StoryDraft
 from little_turtle.utils import (
+    get_day_of_week,
     prepare_buttons,
     validate_date,
     read_file_from_disk,
@@ -22,25 +32,43 @@ from little_turtle.utils import (
 
 class BaseStoriesRouter(BaseRouter):
     def __init__(
-        self, bot: Bot, story_controller: StoriesController, config_service: AppConfig
+        self,
+        bot: Bot,
+        story_controller: StoriesController,
+        config_service: AppConfig,
+        generation_jobs: GenerationJobManager,
     ):
         super().__init__(bot)
 
         self.story_controller = story_controller
         self.config = config_service
+        self.generation_jobs = generation_jobs
 
     @abstractmethod
     def get_router(self) -> Router:
         pass
 
-    async def suggest_target_topics(self, ctx: BotContext) -> HistoricalEvents:
+    async def suggest_target_topics(
+        self, ctx: BotContext, force_refresh: bool = False, fast: bool = False
+    ) -> HistoricalEvents:
         data = await ctx.state.get_data()
-        date = data.get("date")
+        date = data.get("date") or ctx.message.reply_to_message.text
 
-        topics = self.story_controller.suggest_on_this_day_events(
-            date or ctx.message.reply_to_message.text
+        topics = (
+            self.story_controller.suggest_indexed_on_this_day_events(date)
+            if fast
+            else None
         )
+        if not topics or not topics.events:
+            topics = await self.story_controller.suggest_on_this_day_events(
+                date, force_refresh=force_refresh
+            )
 
+        await self.send_target_topics(topics, ctx)
+
+        return topics
+
+    async def send_target_topics(self, topics: HistoricalEvents, ctx: BotContext):
         topics_str = "\n\n".join(
             f"{event + 1}. {event_name}"
             for event, event_name in enumerate(topics.events)
@@ -57,27 +85,69 @@ class BaseStoriesRouter(BaseRouter):
             topics_str, ctx.chat_id, buttons=prepare_buttons(buttons)
         )
 
-        return topics
+    async def send_drafts_review(
+        self, drafts: dict[str, StoryDraft | Exception], ctx: BotContext
+    ):
+        days, buttons, rows = [], {}, []
+        for date, draft in drafts.items():
+            short_date = date[:5]
+            if isinstance(draft, StoryDraft):
+                topic = draft.target_topics[0] if draft.target_topics else ""
+                days.append(f"{date} ({get_day_of_week(date)}): {shorten(topic, 80)}")
+                buttons[f"✅ {short_date}"] = ForwardCallback(
+                    action=ForwardAction.APPROVE_DRAFT, payload=date
+                )
+            else:
+                days.append(f"{date}: ❌ {shorten(str(draft), 80)}")
+
+            buttons[f"🔄 {short_date}"] = ForwardCallback(
+                action=ForwardAction.REGENERATE_DRAFT, payload=date
+            )
+            rows.append(2 if isinstance(draft, StoryDraft) else 1)
+
+        await self.send_message(
+            messages.PLAN_REVIEW.format(days="\n".join(days)),
+            ctx.chat_id,
+            buttons=prepare_buttons(buttons, rows=rows),
+        )
 
     async def generate_story(self, ctx: BotContext) -> Optional[str]:
         data = await ctx.state.get_data()
         date = data.get("date")
         target_topics = data.get("target_topics", list())
 
-        story = self.story_controller.suggest_story(date, target_topics)
-        await self.send_message(
-            story,
-            chat_id=ctx.chat_id,
-            buttons=prepare_buttons(
-                {
-                    "👎": ForwardCallback(action=ForwardAction.REGENERATE_STORY),
-                    "👍": ForwardCallback(action=ForwardAction.SET_STORY),
-                }
-            ),
+        if self.config.STORY_STREAMING_ENABLED:
+            return await self.stream_message(
+                self.story_controller.stream_story(
+                    date, target_topics, chat_id=ctx.chat_id
+                ),
+                ctx.chat_id,
+                placeholder=messages.STORY_GENERATION_IN_PROGRESS,
+                edit_interval=self.config.STREAM_EDIT_INTERVAL_SECONDS,
+                buttons=self.__story_buttons(),
+            )
+
+        story = await self.story_controller.suggest_story(
+            date, target_topics, chat_id=ctx.chat_id
         )
+        await self.send_story(story, ctx)
 
         return story
 
+    async def send_story(self, story: str, ctx: BotContext) -> Message:
+        return await self.send_message(
+            story, chat_id=ctx.chat_id, buttons=self.__story_buttons()
+        )
+
+    @staticmethod
+    def __story_buttons() -> InlineKeyboardMarkup:
+        return prepare_buttons(
+            {
+                "👎": ForwardCallback(action=ForwardAction.REGENERATE_STORY),
+                "👍": ForwardCallback(action=ForwardAction.SET_STORY),
+            }
+        )
+
     def _base64_to_input_file(
         self, base64_data: str, filename: str = "generated_image.png"
     ) -> BufferedInputFile:
@@ -86,8 +156,14 @@ class BaseStoriesRouter(BaseRouter):
         return BufferedInputFile(file=image_bytes, filename=filename)
 
     async def generate_image(self, ctx: BotContext):
-        story = (await ctx.state.get_data()).get("story")
-        image_base64 = self.story_controller.imagine_story(story)
+        data = await ctx.state.get_data()
+        image_base64 = await self.story_controller.imagine_story(
+            data.get("story"), data.get("date")
+        )
+
+        return await self.send_image(image_base64, ctx)
+
+    async def send_image(self, image_base64: str, ctx: BotContext) -> Message:
         image = self._base64_to_input_file(image_base64)
 
         return await self.bot.send_photo(
@@ -153,10 +229,33 @@ class BaseStoriesRouter(BaseRouter):
             ),
         )
 
-    async def async_generate_action(self, ctx: BotContext, action: Callable):
+    def async_generate_action(
+        self,
+        ctx: BotContext,
+        action: Callable,
+        kind: GenerationKind,
+        provider: Optional[ProviderType] = None,
+        scope: Optional[str] = None,
+    ) -> GenerationJob:
+        return self.generation_jobs.submit(
+            ctx.chat_id,
+            kind,
+            partial(self.__run_generate_action, ctx, action),
+            provider,
+            scope,
+        )
+
+    async def __run_generate_action(self, ctx: BotContext, action: Callable):
         msg = await self.bot.send_sticker(ctx.chat_id, Stickers.WIP)
-        await action(ctx)
-        await self.bot.delete_message(ctx.chat_id, msg.message_id)
+        try:
+            await action(ctx)
+        except Exception as e:
+            await self.send_message(
+                error_messages.UNHANDLED_ERROR.format(err=e), ctx.chat_id
+            )
+            raise
+        finally:
+            await self.bot.delete_message(ctx.chat_id, msg.message_id)
 
     async def save_file_to_disk(self, file_id: str) -> str:
         file = await self.bot.get_file(file_id)
@@ -1,15 +1,21 @@
 from datetime import timezone, timedelta, datetime
+from functools import partial
 from os.path import basename
 from typing import BinaryIO
 
 from aiogram import Bot, Router, F
 from aiogram.types import CallbackQuery, Message
 
-from little_turtle.constants import Reactions, ReplyKeyboardItems
-from little_turtle.controlles import StoriesController
+from little_turtle.constants import Reactions, ReplyKeyboardItems, error_messages
+from little_turtle.controlles import (
+    GenerationJobManager,
+    GenerationKind,
+    StoriesController,
+)
 from little_turtle.handlers.middlewares import BotContext
 from little_turtle.handlers.routers.actions import ForwardAction, ForwardCallback
 from little_turtle.handlers.routers.base import BaseStoriesRouter
+from little_turtle.llm_provider import ProviderType
 from little_turtle.app_config import AppConfig
 from little_turtle.services import LoggerService, TelegramService
 
@@ -22,8 +28,9 @@ class CallbackQueryHandlerRouter(BaseStoriesRouter):
         config_service: AppConfig,
         logger_service: LoggerService,
         telegram_service: TelegramService,
+        generation_jobs: GenerationJobManager,
     ):
-        super().__init__(bot, story_controller, config_service)
+        super().__init__(bot, story_controller, config_service, generation_jobs)
 
         self.config = config_service
         self.logger_service = logger_service
@@ -56,6 +63,16 @@ class CallbackQueryHandlerRouter(BaseStoriesRouter):
             self.set_topic_handler
         )
 
+        draft_filter = F.action.in_(
+            {
+                ForwardAction.APPROVE_DRAFT,
+                ForwardAction.REGENERATE_DRAFT,
+            }
+        )
+        self.router.callback_query(ForwardCallback.filter(draft_filter))(
+            self.draft_query_handler
+        )
+
         schedule_filter = F.action == ForwardAction.SCHEDULE
         self.router.callback_query(ForwardCallback.filter(schedule_filter))(
             self.schedule_new_story
@@ -73,10 +90,20 @@ class CallbackQueryHandlerRouter(BaseStoriesRouter):
 
         match callback_data.action:
             case ForwardAction.REGENERATE_STORY:
-                await self.async_generate_action(ctx, self.generate_story)
+                self.async_generate_action(
+                    ctx,
+                    self.generate_story,
+                    GenerationKind.STORY,
+                    ProviderType.OPENAI,
+                )
 
             case ForwardAction.REGENERATE_IMAGE:
-                await self.async_generate_action(ctx, self.generate_image)
+                self.async_generate_action(
+                    ctx,
+                    self.generate_image,
+                    GenerationKind.IMAGE,
+                    ProviderType.OPENAI,
+                )
 
         await self.set_message_reaction(
             msg.chat.id, msg.message_id, Reactions.SALUTE_FACE
@@ -93,6 +120,7 @@ class CallbackQueryHandlerRouter(BaseStoriesRouter):
 
             case ForwardAction.SET_STORY:
                 await ctx.state.update_data(story=msg.text)
+                self.story_controller.discard_story_pool(ctx.chat_id)
 
             case ForwardAction.SET_IMAGE:
                 image_path = await self.save_file_to_disk(msg.photo[-1].file_id)
@@ -114,13 +142,55 @@ class CallbackQueryHandlerRouter(BaseStoriesRouter):
         )
         await query.answer("Done!")
 
+    async def draft_query_handler(
+        self, query: CallbackQuery, callback_data: ForwardCallback, ctx: BotContext
+    ):
+        date = callback_data.payload
+
+        match callback_data.action:
+            case ForwardAction.APPROVE_DRAFT:
+                draft = await self.story_controller.get_draft(date)
+                if draft is None:
+                    await query.answer("Failed!")
+                    await self.send_message(error_messages.ERR_NO_DRAFT, ctx.chat_id)
+                    return
+
+                await ctx.state.update_data(**draft.model_dump())
+                self.story_controller.discard_story_pool(ctx.chat_id)
+                await query.answer("Done!")
+                await self.preview_story(ctx)
+
+            case ForwardAction.REGENERATE_DRAFT:
+                await query.answer("Generating...")
+                # Each day is its own job so redrafting one doesn't stop another
+                self.async_generate_action(
+                    ctx,
+                    partial(self.__regenerate_draft, date),
+                    GenerationKind.DRAFT,
+                    scope=date,
+                )
+
+    async def __regenerate_draft(self, date: str, ctx: BotContext):
+        drafts = await self.story_controller.prepare_drafts([date], force=True)
+        await self.send_drafts_review(drafts, ctx)
+
     async def sticker_action_handler(self, _: Message, ctx: BotContext):
         match ctx.message.text:
             case ReplyKeyboardItems.STORY.value:
-                await self.async_generate_action(ctx, self.generate_story)
+                self.async_generate_action(
+                    ctx,
+                    self.generate_story,
+                    GenerationKind.STORY,
+                    ProviderType.OPENAI,
+                )
 
             case ReplyKeyboardItems.IMAGE.value:
-                await self.async_generate_action(ctx, self.generate_image)
+                self.async_generate_action(
+                    ctx,
+                    self.generate_image,
+                    GenerationKind.IMAGE,
+                    ProviderType.OPENAI,
+                )
 
             case ReplyKeyboardItems.PREVIEW.value:
                 await self.preview_story(ctx)
@@ -132,26 +202,58 @@ class CallbackQueryHandlerRouter(BaseStoriesRouter):
         date = await self.__prepare_schedule_date(state.get("date"))
         photo, photo_name = await self.__get_file(query.message.photo[-1].file_id)
 
-        for chat_id in self.config.CHAT_IDS_TO_SEND_STORIES:
-            self.logger_service.info(
-                "Sending scheduled story",
-                chat_id=chat_id,
-                date=date,
+        # Chats that already got the story on a previous partially failed try
+        scheduled_chat_ids = state.get("scheduled_chat_ids", list())
+        chat_ids = [
+            chat_id
+            for chat_id in self.config.CHAT_IDS_TO_SEND_STORIES
+            if chat_id not in scheduled_chat_ids
+        ]
+
+        self.logger_service.info(
+            "Sending scheduled story",
+            chat_ids=chat_ids,
+            date=date,
+        )
+        results = await self.telegram_service.send_photo_to_chats(
+            chat_ids,
+            photo,
+            photo_name,
+            text,
+            date,
+        )
+
+        failed_chats = {
+            chat_id: err for chat_id, err in results.items() if err is not None
+        }
+        for chat_id, err in failed_chats.items():
+            self.logger_service.error(
+                "Failed to send scheduled story", chat_id=chat_id, exc_info=err
+            )
+
+        if failed_chats:
+            await ctx.state.update_data(
+                scheduled_chat_ids=scheduled_chat_ids
+                + [chat_id for chat_id in chat_ids if chat_id not in failed_chats]
             )
-            await self.telegram_service.send_photo(
-                chat_id,
-                photo,
-                photo_name,
-                text,
-                date,
+            await self.send_message(
+                error_messages.ERR_SCHEDULE_STORY.format(
+                    chats="\n".join(
+                        f"{chat_id}: {err}" for chat_id, err in failed_chats.items()
+                    )
+                ),
+                ctx.chat_id,
             )
-            photo.seek(0)
+            await query.answer("Failed!")
+            return
 
         await self.set_message_reaction(
             ctx.message.chat.id, ctx.message.message_id, Reactions.LIKE
         )
         await query.answer("Done!")
         await ctx.state.clear()
+        await self.story_controller.delete_draft(state.get("date"))
+        self.story_controller.discard_story_pool(ctx.chat_id)
 
     async def __get_file(self, file_id: str) -> [BinaryIO, str]:
         file = await self.bot.get_file(file_id)
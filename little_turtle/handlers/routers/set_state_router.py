@@ -1,12 +1,18 @@
+from functools import partial
 
 from aiogram import Bot, Router
-from aiogram.filters import Command
+from aiogram.filters import Command, CommandObject
 from aiogram.types import Message
 
 from little_turtle.constants import Reactions, error_messages, messages
-from little_turtle.controlles import StoriesController
+from little_turtle.controlles import (
+    GenerationJobManager,
+    GenerationKind,
+    StoriesController,
+)
 from little_turtle.handlers.middlewares import BotContext
 from little_turtle.handlers.routers.base.base_stories_router import BaseStoriesRouter
+from little_turtle.llm_provider import ProviderType
 from little_turtle.app_config import AppConfig
 from little_turtle.utils import validate_date, pretty_print_json
 
@@ -17,8 +23,9 @@ class SetStateRouter(BaseStoriesRouter):
         bot: Bot,
         story_controller: StoriesController,
         config_service: AppConfig,
+        generation_jobs: GenerationJobManager,
     ):
-        super().__init__(bot, story_controller, config_service)
+        super().__init__(bot, story_controller, config_service, generation_jobs)
 
         self.config = config_service
         self.story_controller = story_controller
@@ -34,6 +41,10 @@ class SetStateRouter(BaseStoriesRouter):
             self.__set_target_topic_handler
         )
         self.router.message(Command("suggest_topics"))(self.__suggest_topics_handler)
+        self.router.message(Command("fast_topics"))(self.__fast_topics_handler)
+        self.router.message(Command("invalidate_topics"))(
+            self.__invalidate_topics_handler
+        )
         self.router.message(Command("get_next_date"))(self.__get_next_date)
         self.router.message(Command("set_image"))(self.__set_image_handler)
         self.router.message(Command("set_story"))(self.__set_story_handler)
@@ -47,11 +58,34 @@ class SetStateRouter(BaseStoriesRouter):
         await ctx.state.update_data(target_topics=list())
         await self.set_message_reaction(msg.chat.id, msg.message_id, Reactions.LIKE)
 
-    async def __suggest_topics_handler(self, msg: Message, ctx: BotContext):
+    async def __suggest_topics_handler(
+        self, msg: Message, command: CommandObject, ctx: BotContext
+    ):
+        if not await self.__validate_date(msg, msg.chat.id):
+            return
+
+        force_refresh = command.args == "refresh"
+        self.async_generate_action(
+            ctx,
+            partial(self.suggest_target_topics, force_refresh=force_refresh),
+            GenerationKind.TOPICS,
+            ProviderType.ANTHROPIC,
+        )
+
+    async def __fast_topics_handler(self, msg: Message, ctx: BotContext):
+        if not await self.__validate_date(msg, msg.chat.id):
+            return
+
+        await self.suggest_target_topics(ctx, fast=True)
+
+    async def __invalidate_topics_handler(self, msg: Message, ctx: BotContext):
         if not await self.__validate_date(msg, msg.chat.id):
             return
 
-        await self.async_generate_action(ctx, self.suggest_target_topics)
+        await self.story_controller.invalidate_on_this_day_events(
+            msg.reply_to_message.text
+        )
+        await self.send_message(messages.INVALIDATE_TOPICS, ctx.chat_id)
 
     async def __add_target_topic_handler(self, msg: Message, ctx: BotContext):
         if not msg.reply_to_message or not msg.reply_to_message.text:
@@ -86,6 +120,7 @@ class SetStateRouter(BaseStoriesRouter):
             return
 
         await ctx.state.update_data(story=msg.reply_to_message.text)
+        self.story_controller.discard_story_pool(ctx.chat_id)
         await self.set_message_reaction(msg.chat.id, msg.message_id, Reactions.LIKE)
 
     async def __set_image_handler(self, msg: Message, ctx: BotContext):
@@ -118,6 +153,8 @@ class SetStateRouter(BaseStoriesRouter):
 
     async def __cancel_handler(self, msg: Message, ctx: BotContext):
         await ctx.state.clear()
+        self.generation_jobs.cancel(ctx.chat_id)
+        self.story_controller.discard_story_pool(ctx.chat_id)
         await self.set_message_reaction(ctx.chat_id, msg.message_id, Reactions.LIKE)
 
     async def __validate_date(self, message: Message, chat_id: int) -> bool:
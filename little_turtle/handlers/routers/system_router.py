@@ -3,6 +3,7 @@ from aiogram.filters import Command, CommandStart
 from aiogram.types import Message, ErrorEvent
 from aiogram.utils.keyboard import ReplyKeyboardBuilder
 
+from little_turtle import metrics
 from little_turtle.constants import error_messages, messages, ReplyKeyboardItems
 from little_turtle.handlers.routers.base.base_router import BaseRouter
 from little_turtle.app_config import AppConfig
@@ -45,6 +46,7 @@ class SystemRouter(BaseRouter):
         self.logger_service.error(
             "Error while handling update", exc_info=event.exception
         )
+        metrics.HANDLER_ERRORS.labels(type(event.exception).__name__).inc()
 
         if event.update.callback_query is not None:
             chat_id = event.update.callback_query.message.chat.id
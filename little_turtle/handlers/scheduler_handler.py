@@ -4,14 +4,30 @@ from apscheduler.triggers.cron import CronTrigger
 
 
 class SchedulerHandler:
-    def __init__(self, morning_callback: callable):
+    def __init__(
+        self,
+        morning_callback: callable,
+        pregenerate_callback: callable = None,
+        pregenerate_hour: int = 4,
+    ):
         self.scheduler = AsyncIOScheduler()
 
         self.morning_callback = morning_callback
+        self.pregenerate_callback = pregenerate_callback
+        self.pregenerate_hour = pregenerate_hour
 
     def start(self):
         self.scheduler.add_job(
             self.morning_callback,
             CronTrigger(hour=8, minute=0, timezone=pytz.timezone("Europe/Warsaw")),
         )
+        if self.pregenerate_callback is not None:
+            self.scheduler.add_job(
+                self.pregenerate_callback,
+                CronTrigger(
+                    hour=self.pregenerate_hour,
+                    minute=0,
+                    timezone=pytz.timezone("Europe/Warsaw"),
+                ),
+            )
         self.scheduler.start()
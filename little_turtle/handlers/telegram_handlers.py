@@ -1,10 +1,12 @@
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.redis import RedisStorage
-from redis import asyncio as redis
+from aiogram.fsm.storage.base import BaseStorage
 
 from little_turtle.controlles import StoriesController
 from little_turtle.handlers import SchedulerHandler
-from little_turtle.handlers.middlewares import context_middleware
+from little_turtle.handlers.middlewares import (
+    context_middleware,
+    update_recording_middleware,
+)
 from little_turtle.handlers.routers import (
     SystemRouter,
     AdminCommandsRouter,
@@ -20,13 +22,24 @@ class TelegramHandlers:
     logger_service: LoggerService
     bot: Bot
 
-    def __init__(self, config: AppConfig, logger_service: LoggerService):
+    def __init__(
+        self,
+        config: AppConfig,
+        logger_service: LoggerService,
+        bot: Bot,
+        storage: BaseStorage,
+    ):
+        self.config = config
         self.logger_service = logger_service
 
-        self.bot = Bot(config.TELEGRAM_BOT_TOKEN)
+        self.bot = bot
         self.scheduler_handler = None
 
-        self.dp = Dispatcher(storage=RedisStorage(redis.from_url(config.REDIS_URL)))
+        self.dp = Dispatcher(storage=storage)
+        if config.UPDATE_RECORDING_PATH:
+            self.dp.update.outer_middleware()(
+                update_recording_middleware(config.UPDATE_RECORDING_PATH)
+            )
         self.dp.update.outer_middleware()(context_middleware)
 
     def init_routers(
@@ -41,7 +54,13 @@ class TelegramHandlers:
         self.dp.include_router(admin_commands_router.get_router())
         self.dp.include_router(callback_query_handler_router.get_router())
         self.scheduler_handler = SchedulerHandler(
-            admin_commands_router.send_morning_message
+            admin_commands_router.send_morning_message,
+            (
+                admin_commands_router.pregenerate_draft
+                if self.config.PREGENERATE_DRAFT_ENABLED
+                else None
+            ),
+            self.config.PREGENERATE_DRAFT_HOUR,
         )
 
     async def run(self):
@@ -49,4 +68,4 @@ class TelegramHandlers:
             "Telegram turtle is all set and eager to assist! 🐢📲 Just send a command!"
         )
         self.scheduler_handler.start()
-        await self.dp.start_polling(self.bot)
+        await self.dp.start_polling(self.bot, close_bot_session=False)
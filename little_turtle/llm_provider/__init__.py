@@ -3,7 +3,18 @@ from .base import BaseLLMAdapter
 from .openai_adapter import OpenAIAdapter
 from .anthropic_adapter import AnthropicAdapter
 from .provider import LLMProvider
-from .types import ProviderType
+from .hedged_client import HedgedLLMClient
+from .batch import (
+    BatchBackend,
+    BatchError,
+    BatchOperation,
+    BatchRequest,
+    run_batch,
+)
+from .types import CacheMode, ProviderType
+from .cache import LocalResponseCache, RedisResponseCache, ResponseCache
+from .context import agent_context, chat_context, story_date_context
+from .usage import Usage, UsageTotals, UsageTracker
 
 __all__ = [
     "LLMClient",
@@ -12,5 +23,21 @@ __all__ = [
     "OpenAIAdapter",
     "AnthropicAdapter",
     "LLMProvider",
+    "HedgedLLMClient",
+    "BatchBackend",
+    "BatchError",
+    "BatchOperation",
+    "BatchRequest",
+    "run_batch",
     "ProviderType",
+    "CacheMode",
+    "ResponseCache",
+    "LocalResponseCache",
+    "RedisResponseCache",
+    "Usage",
+    "UsageTotals",
+    "UsageTracker",
+    "agent_context",
+    "chat_context",
+    "story_date_context",
 ]
@@ -1,9 +1,15 @@
-from typing import Any, Optional
-from anthropic import Anthropic
+from typing import Any, Optional, AsyncIterator
+import anthropic
+from anthropic import AsyncAnthropic
+from anthropic.types import Message, Usage as AnthropicUsage
 
 from little_turtle.app_config import AppConfig
+from little_turtle.services import LoggerService
 from .base import BaseLLMAdapter
+from .cache import ResponseCache
+from .types import ProviderType
 from .protocols import LLMResponse, Tool
+from .usage import Usage, UsageTracker
 
 
 class AnthropicResponse:
@@ -12,63 +18,155 @@ class AnthropicResponse:
         self.content = response.content[0].text if response.content else ""
         self.tool_calls = None
 
+        usage = getattr(response, "usage", None)
+        self.cache_creation_input_tokens = (
+            getattr(usage, "cache_creation_input_tokens", None) or 0
+        )
+        self.cache_read_input_tokens = (
+            getattr(usage, "cache_read_input_tokens", None) or 0
+        )
+
     def __str__(self):
         return self.content
 
 
 class AnthropicAdapter(BaseLLMAdapter):
 
-    def __init__(self, config: AppConfig):
-        super().__init__(config)
-        self.client = Anthropic(api_key=config.ANTHROPIC_API_KEY)
+    provider = ProviderType.ANTHROPIC
+    retryable_errors = (anthropic.APIConnectionError,)
+
+    def __init__(
+        self,
+        config: AppConfig,
+        response_cache: Optional[ResponseCache] = None,
+        logger_service: Optional[LoggerService] = None,
+        usage_tracker: Optional[UsageTracker] = None,
+    ):
+        super().__init__(config, response_cache, logger_service, usage_tracker)
+        # Retries are handled by the adapter so they share its rate limits
+        self.client = AsyncAnthropic(api_key=config.ANTHROPIC_API_KEY, max_retries=0)
+        self.rpm_limit = config.ANTHROPIC_RPM_LIMIT
+        self.tpm_limit = config.ANTHROPIC_TPM_LIMIT
         self.model = config.ANTHROPIC_MODEL
 
-    def create_completion(
+    async def _create_completion(
         self, messages: list[dict[str, str]], **kwargs
     ) -> LLMResponse:
-        anthropic_messages = self._convert_messages(messages)
-
-        response = self.client.messages.create(
-            model=kwargs.get("model", self.model),
-            messages=anthropic_messages,
-            max_tokens=kwargs.get("max_tokens", 1024),
-            **{k: v for k, v in kwargs.items() if k not in ["model", "max_tokens"]},
+        response = await self.client.messages.create(
+            **self._prepare_request(messages, **kwargs)
         )
 
         return AnthropicResponse(response)
 
-    def create_completion_with_tools(
+    async def _create_completion_with_tools(
         self, messages: list[dict[str, str]], tools: list[dict[str, Any]], **kwargs
     ) -> LLMResponse:
-        anthropic_messages = self._convert_messages(messages)
-
-        response = self.client.messages.create(
-            model=kwargs.get("model", self.model),
-            messages=anthropic_messages,
-            tools=tools,
-            max_tokens=kwargs.get("max_tokens", 1024),
-            **{
-                k: v
-                for k, v in kwargs.items()
-                if k not in ["model", "tools", "max_tokens"]
-            },
+        response = await self.client.messages.create(
+            **self._prepare_request(messages, tools=tools, **kwargs)
         )
 
         return AnthropicResponse(response)
 
-    def _convert_messages(self, messages: list[dict[str, str]]) -> list[dict[str, str]]:
-        converted = []
+    async def _stream_completion(
+        self, messages: list[dict[str, str]], **kwargs
+    ) -> AsyncIterator[str | Usage]:
+        async with self.client.messages.stream(
+            **self._prepare_request(messages, **kwargs)
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+            message = await stream.get_final_message()
+            yield self._to_usage(message.usage)
+
+    def _prepare_request(
+        self,
+        messages: list[dict[str, Any]],
+        cache_prompt: bool = False,
+        **kwargs,
+    ) -> dict[str, Any]:
+        system = self._to_text_blocks(kwargs.pop("system", None))
+        conversation = []
         for msg in messages:
             if msg["role"] == "system":
-                converted.append(
-                    {"role": "user", "content": f"System: {msg['content']}"}
-                )
+                system.extend(self._to_text_blocks(msg["content"]))
             else:
-                converted.append(msg)
-        return converted
-
-    def generate_image(self, instructions: str, input_text: str, **kwargs) -> str:
+                conversation.append(msg)
+
+        tools = [dict(tool) for tool in kwargs.pop("tools", None) or []]
+
+        # Tools come before the system prompt in the cached prefix, so one
+        # breakpoint after the last fixed block covers both of them
+        if cache_prompt and system:
+            system[-1]["cache_control"] = {"type": "ephemeral"}
+        elif cache_prompt and tools:
+            tools[-1]["cache_control"] = {"type": "ephemeral"}
+
+        request = {
+            **kwargs,
+            "model": kwargs.get("model", self.model),
+            "messages": conversation,
+            "max_tokens": kwargs.get("max_tokens", 1024),
+        }
+        if system:
+            request["system"] = system
+        if tools:
+            request["tools"] = tools
+
+        return request
+
+    @staticmethod
+    def _to_text_blocks(content: Any) -> list[dict[str, Any]]:
+        if not content:
+            return []
+
+        if isinstance(content, str):
+            return [{"type": "text", "text": content}]
+
+        return [dict(block) for block in content]
+
+    async def _generate_image(
+        self, instructions: str, input_text: str, **kwargs
+    ) -> LLMResponse:
         raise NotImplementedError("Anthropic adapter does not support image generation")
 
     def get_search_tool(self) -> Optional[Tool]:
         return {"type": "web_search_20250305", "name": "web_search", "max_uses": 5}
+
+    def _count_tokens(self, response: Any) -> Optional[int]:
+        usage = getattr(getattr(response, "raw_response", None), "usage", None)
+        if usage is None:
+            return None
+
+        # Cache reads don't count towards Anthropic's input token limits
+        return (
+            usage.input_tokens
+            + usage.output_tokens
+            + (usage.cache_creation_input_tokens or 0)
+        )
+
+    def _get_usage(self, response: Any) -> Optional[Usage]:
+        usage = getattr(getattr(response, "raw_response", None), "usage", None)
+        return self._to_usage(usage) if usage is not None else None
+
+    @staticmethod
+    def _to_usage(usage: AnthropicUsage) -> Usage:
+        server_tool_use = getattr(usage, "server_tool_use", None)
+
+        return Usage(
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            cached_tokens=usage.cache_read_input_tokens or 0,
+            cache_creation_tokens=usage.cache_creation_input_tokens or 0,
+            web_searches=(server_tool_use.web_search_requests if server_tool_use else 0)
+            or 0,
+        )
+
+    def _deserialize_response(self, data: str) -> LLMResponse:
+        return AnthropicResponse(Message.model_validate_json(data))
+
+    async def warm_up(self) -> None:
+        await self.client.models.list(limit=1)
+
+    async def close(self) -> None:
+        await self.client.close()
@@ -1,26 +1,343 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from dataclasses import asdict
+from typing import Any, Optional, AsyncIterator, Awaitable, Callable
 
+from little_turtle import metrics
 from little_turtle.app_config import AppConfig
+from little_turtle.services import LoggerService
+from .cache import ResponseCache, make_cache_key
+from .context import current_agent, current_chat_id, current_story_date
+from .pricing import estimate_cost
 from .protocols import LLMResponse, Tool
+from .rate_limit import RateLimiter, RetryPolicy, is_retryable_status
+from .types import CacheMode
+from .usage import Usage, UsageTracker
 
 
 class BaseLLMAdapter(ABC):
+    provider: str
+    model: str
+    retryable_errors: tuple[type[Exception], ...] = ()
 
-    def __init__(self, config: AppConfig):
+    def __init__(
+        self,
+        config: AppConfig,
+        response_cache: Optional[ResponseCache] = None,
+        logger_service: Optional[LoggerService] = None,
+        usage_tracker: Optional[UsageTracker] = None,
+    ):
         self.config = config
+        self.response_cache = response_cache
+        self.logger_service = logger_service
+        self.usage_tracker = usage_tracker
+        self.retry_policy = RetryPolicy(
+            config.LLM_MAX_RETRIES,
+            config.LLM_RETRY_BASE_DELAY_SECONDS,
+            config.LLM_RETRY_MAX_DELAY_SECONDS,
+        )
+        self.rpm_limit = 0
+        self.tpm_limit = 0
+
+        self.throttled_seconds = 0.0
+        self.retries = 0
+        self.retry_wait_seconds = 0.0
+        self._limiters: dict[str, RateLimiter] = {}
+
+    async def create_completion(
+        self, messages: list[dict[str, str]], **kwargs
+    ) -> LLMResponse:
+        return await self.__cached(
+            "completion",
+            self._create_completion,
+            self._serialize_response,
+            self._deserialize_response,
+            messages=messages,
+            **kwargs,
+        )
+
+    async def create_completion_with_tools(
+        self, messages: list[dict[str, str]], tools: list[dict[str, Any]], **kwargs
+    ) -> LLMResponse:
+        return await self.__cached(
+            "completion_with_tools",
+            self._create_completion_with_tools,
+            self._serialize_response,
+            self._deserialize_response,
+            messages=messages,
+            tools=tools,
+            **kwargs,
+        )
+
+    async def generate_image(self, instructions: str, input_text: str, **kwargs) -> str:
+        response = await self.__cached(
+            "image",
+            self._generate_image,
+            lambda image: image.content,
+            self._deserialize_image,
+            instructions=instructions,
+            input_text=input_text,
+            **kwargs,
+        )
+
+        return response.content
+
+    async def stream_completion(
+        self, messages: list[dict[str, str]], **kwargs
+    ) -> AsyncIterator[str]:
+        kwargs.pop("cache_mode", None)
+        model = kwargs.get("model", self.model)
+        limiter = self.__get_limiter(model)
+        estimated_tokens = self._estimate_tokens(messages=messages, **kwargs)
+        started_at = time.perf_counter()
+
+        attempt = 0
+        while True:
+            await self.__throttle(limiter, estimated_tokens)
+
+            started = False
+            usage = None
+            try:
+                async for chunk in self._stream_completion(messages, **kwargs):
+                    # Adapters report the usage of a stream as its last item
+                    if isinstance(chunk, Usage):
+                        usage = chunk
+                        continue
+
+                    started = True
+                    yield chunk
+                await self.__observe("stream", model, started_at, "ok", usage)
+                return
+            except Exception as e:
+                # Chunks that were already yielded can't be taken back
+                if started or not self.__should_retry(attempt, e):
+                    await self.__observe("stream", model, started_at, "error")
+                    raise
+
+                attempt += 1
+                await self.__wait_before_retry(attempt, e)
 
     @abstractmethod
-    def create_completion(
+    async def _create_completion(
         self, messages: list[dict[str, str]], **kwargs
     ) -> LLMResponse:
         pass
 
     @abstractmethod
-    def create_completion_with_tools(
+    async def _create_completion_with_tools(
         self, messages: list[dict[str, str]], tools: list[dict[str, Any]], **kwargs
     ) -> LLMResponse:
         pass
 
+    @abstractmethod
+    def _stream_completion(
+        self, messages: list[dict[str, str]], **kwargs
+    ) -> AsyncIterator[str | Usage]:
+        pass
+
+    @abstractmethod
+    async def _generate_image(
+        self, instructions: str, input_text: str, **kwargs
+    ) -> LLMResponse:
+        pass
+
+    def _estimate_tokens(self, **kwargs) -> int:
+        text = "".join(
+            str(message.get("content", "")) for message in kwargs.get("messages", [])
+        )
+        text += kwargs.get("instructions", "") + kwargs.get("input_text", "")
+
+        # Roughly four characters per token, plus the completion budget
+        return len(text) // 4 + kwargs.get("max_tokens", 0)
+
+    def _count_tokens(self, response: Any) -> Optional[int]:
+        return None
+
+    def _get_usage(self, response: Any) -> Optional[Usage]:
+        return None
+
+    def _serialize_response(self, response: LLMResponse) -> str:
+        return response.raw_response.model_dump_json()
+
+    def _deserialize_response(self, data: str) -> LLMResponse:
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support cached responses"
+        )
+
+    def _deserialize_image(self, data: str) -> LLMResponse:
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support cached images"
+        )
+
     def get_search_tool(self) -> Optional[Tool]:
         return None
+
+    async def warm_up(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "retries": self.retries,
+            "retry_wait_seconds": round(self.retry_wait_seconds, 3),
+        }
+
+    async def __cached(
+        self,
+        operation: str,
+        call: Callable[..., Awaitable[Any]],
+        serialize: Callable[[Any], str],
+        deserialize: Callable[[str], Any],
+        **kwargs,
+    ) -> Any:
+        cache_mode = CacheMode(kwargs.pop("cache_mode", CacheMode.OFF))
+        if not self.__is_cacheable(cache_mode, kwargs):
+            return await self.__call(operation, call, **kwargs)
+
+        key = make_cache_key(self.provider, operation, {"model": self.model, **kwargs})
+        cached = await self.response_cache.get(key)
+        metrics.LLM_CACHE_REQUESTS.labels(
+            self.provider, operation, "miss" if cached is None else "hit"
+        ).inc()
+        if cached is not None:
+            await self.__record_usage(
+                operation, kwargs.get("model", self.model), "cached", 0, Usage()
+            )
+            return deserialize(cached)
+
+        response = await self.__call(operation, call, **kwargs)
+        await self.response_cache.set(key, serialize(response))
+
+        return response
+
+    async def __call(
+        self, operation: str, call: Callable[..., Awaitable[Any]], **kwargs
+    ) -> Any:
+        model = kwargs.get("model", self.model)
+        limiter = self.__get_limiter(model)
+        estimated_tokens = self._estimate_tokens(**kwargs)
+        started_at = time.perf_counter()
+
+        attempt = 0
+        while True:
+            await self.__throttle(limiter, estimated_tokens)
+
+            try:
+                response = await call(**kwargs)
+            except Exception as e:
+                if not self.__should_retry(attempt, e):
+                    await self.__observe(operation, model, started_at, "error")
+                    raise
+
+                attempt += 1
+                await self.__wait_before_retry(attempt, e)
+                continue
+
+            await self.__observe(
+                operation, model, started_at, "ok", self._get_usage(response)
+            )
+            limiter.record_usage(estimated_tokens, self._count_tokens(response))
+            return response
+
+    async def __observe(
+        self,
+        operation: str,
+        model: str,
+        started_at: float,
+        status: str,
+        usage: Optional[Usage] = None,
+    ):
+        latency = time.perf_counter() - started_at
+        agent = current_agent.get() or "unknown"
+        metrics.LLM_REQUESTS.labels(
+            self.provider, model, operation, agent, status
+        ).inc()
+        metrics.LLM_REQUEST_SECONDS.labels(
+            self.provider, model, operation, agent
+        ).observe(latency)
+
+        await self.__record_usage(
+            operation, model, status, round(latency * 1000), usage or Usage()
+        )
+
+    async def __record_usage(
+        self, operation: str, model: str, status: str, latency_ms: int, usage: Usage
+    ):
+        if self.usage_tracker is None:
+            return
+
+        await self.usage_tracker.record(
+            {
+                "provider": self.provider,
+                "model": model,
+                "operation": operation,
+                "agent": current_agent.get(),
+                "date": current_story_date.get(),
+                "chat_id": current_chat_id.get(),
+                "status": status,
+                "latency_ms": latency_ms,
+                **asdict(usage),
+                "cost_usd": estimate_cost(model, usage),
+            }
+        )
+
+    def __get_limiter(self, model: str) -> RateLimiter:
+        if model not in self._limiters:
+            self._limiters[model] = RateLimiter(self.rpm_limit, self.tpm_limit)
+
+        return self._limiters[model]
+
+    async def __throttle(self, limiter: RateLimiter, estimated_tokens: int):
+        waited = await limiter.acquire(estimated_tokens)
+        if waited <= 0:
+            return
+
+        self.throttled_seconds += waited
+        metrics.LLM_THROTTLED_SECONDS.labels(self.provider).inc(waited)
+        if self.logger_service is not None:
+            self.logger_service.info(
+                "LLM request throttled",
+                provider=self.provider,
+                waited=round(waited, 3),
+                **self.stats(),
+            )
+
+    def __should_retry(self, attempt: int, error: Exception) -> bool:
+        if attempt >= self.retry_policy.max_retries:
+            return False
+
+        return isinstance(error, self.retryable_errors) or is_retryable_status(
+            getattr(error, "status_code", None)
+        )
+
+    async def __wait_before_retry(self, attempt: int, error: Exception):
+        delay = self.retry_policy.get_delay(attempt - 1, error)
+        self.retries += 1
+        self.retry_wait_seconds += delay
+        metrics.LLM_RETRIES.labels(self.provider).inc()
+
+        if self.logger_service is not None:
+            self.logger_service.info(
+                "Retrying LLM request",
+                provider=self.provider,
+                attempt=attempt,
+                delay=round(delay, 3),
+                error=repr(error),
+            )
+
+        await asyncio.sleep(delay)
+
+    def __is_cacheable(self, cache_mode: CacheMode, kwargs: dict[str, Any]) -> bool:
+        if self.response_cache is None or cache_mode == CacheMode.OFF:
+            return False
+
+        if cache_mode == CacheMode.FORCE:
+            return True
+
+        # Providers sample at a non-zero temperature when it isn't set
+        temperature = kwargs.get("temperature")
+        return temperature is not None and temperature <= 0
@@ -0,0 +1,223 @@
+import asyncio
+import json
+import uuid
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Protocol
+
+from openai.types.chat import ChatCompletion
+from openai.types.responses import Response
+
+from .anthropic_adapter import AnthropicAdapter, AnthropicResponse
+from .openai_adapter import OpenAIAdapter, OpenAIResponse
+from .protocols import LLMClient
+
+
+class BatchOperation(str, Enum):
+    COMPLETION = "completion"
+    COMPLETION_WITH_TOOLS = "completion_with_tools"
+    IMAGE = "image"
+
+
+OPENAI_BATCH_URLS = {
+    BatchOperation.COMPLETION: "/v1/chat/completions",
+    BatchOperation.COMPLETION_WITH_TOOLS: "/v1/chat/completions",
+    BatchOperation.IMAGE: "/v1/responses",
+}
+
+
+@dataclass
+class BatchRequest:
+    custom_id: str
+    operation: BatchOperation
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+class BatchError(Exception):
+    pass
+
+
+class BatchBackend(Protocol):
+    async def submit(self, requests: list[BatchRequest]) -> str: ...
+
+    async def is_done(self, batch_id: str) -> bool: ...
+
+    async def get_results(self, batch_id: str) -> dict[str, Any]: ...
+
+
+class OpenAIBatchBackend:
+    def __init__(self, adapter: OpenAIAdapter):
+        self.adapter = adapter
+        self.client = adapter.client
+        self._operations: dict[str, dict[str, BatchOperation]] = {}
+
+    async def submit(self, requests: list[BatchRequest]) -> str:
+        # A batch file may only target one endpoint
+        endpoints = {OPENAI_BATCH_URLS[request.operation] for request in requests}
+        if len(endpoints) != 1:
+            raise BatchError(f"Requests target several endpoints: {endpoints}")
+        endpoint = endpoints.pop()
+
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": request.custom_id,
+                    "method": "POST",
+                    "url": endpoint,
+                    "body": self.__prepare_body(request),
+                },
+                ensure_ascii=False,
+            )
+            for request in requests
+        ]
+        batch_file = await self.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=endpoint,
+            completion_window="24h",
+        )
+
+        self._operations[batch.id] = {
+            request.custom_id: request.operation for request in requests
+        }
+        return batch.id
+
+    async def is_done(self, batch_id: str) -> bool:
+        batch = await self.client.batches.retrieve(batch_id)
+        return batch.status in ("completed", "failed", "expired", "cancelled")
+
+    async def get_results(self, batch_id: str) -> dict[str, Any]:
+        batch = await self.client.batches.retrieve(batch_id)
+        operations = self._operations.pop(batch_id, {})
+
+        results: dict[str, Any] = {
+            custom_id: BatchError(f"Batch {batch.status}") for custom_id in operations
+        }
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+
+            content = await self.client.files.content(file_id)
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+
+                entry = json.loads(line)
+                results[entry["custom_id"]] = self.__parse_entry(
+                    entry, operations.get(entry["custom_id"])
+                )
+
+        return results
+
+    def __prepare_body(self, request: BatchRequest) -> dict[str, Any]:
+        params = {k: v for k, v in request.params.items() if k != "cache_mode"}
+        if request.operation == BatchOperation.IMAGE:
+            return self.adapter._prepare_image_request(**params)
+
+        return self.adapter._prepare_request(**params)
+
+    def __parse_entry(self, entry: dict[str, Any], operation: BatchOperation) -> Any:
+        response = entry.get("response") or {}
+        if entry.get("error") or response.get("status_code") != 200:
+            return BatchError(entry.get("error") or response.get("body"))
+
+        if operation == BatchOperation.IMAGE:
+            return self.adapter._extract_image(
+                Response.model_validate(response["body"])
+            )
+
+        return OpenAIResponse(ChatCompletion.model_validate(response["body"]))
+
+
+class AnthropicBatchBackend:
+    def __init__(self, adapter: AnthropicAdapter):
+        self.adapter = adapter
+        self.client = adapter.client
+
+    async def submit(self, requests: list[BatchRequest]) -> str:
+        if any(request.operation == BatchOperation.IMAGE for request in requests):
+            raise BatchError("Anthropic does not support image generation")
+
+        batch = await self.client.messages.batches.create(
+            requests=[
+                {
+                    "custom_id": request.custom_id,
+                    "params": self.adapter._prepare_request(
+                        **{k: v for k, v in request.params.items() if k != "cache_mode"}
+                    ),
+                }
+                for request in requests
+            ]
+        )
+
+        return batch.id
+
+    async def is_done(self, batch_id: str) -> bool:
+        batch = await self.client.messages.batches.retrieve(batch_id)
+        return batch.processing_status == "ended"
+
+    async def get_results(self, batch_id: str) -> dict[str, Any]:
+        results = {}
+        async for entry in await self.client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                results[entry.custom_id] = AnthropicResponse(entry.result.message)
+            else:
+                results[entry.custom_id] = BatchError(entry.result.type)
+
+        return results
+
+
+class LocalBatchBackend:
+    def __init__(self, client: LLMClient, concurrency: int):
+        self.client = client
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self._batches: dict[str, dict[str, asyncio.Task]] = {}
+
+    async def submit(self, requests: list[BatchRequest]) -> str:
+        batch_id = f"local_{uuid.uuid4().hex[:8]}"
+        self._batches[batch_id] = {
+            request.custom_id: asyncio.create_task(self.__run(request))
+            for request in requests
+        }
+
+        return batch_id
+
+    async def is_done(self, batch_id: str) -> bool:
+        return all(task.done() for task in self._batches[batch_id].values())
+
+    async def get_results(self, batch_id: str) -> dict[str, Any]:
+        tasks = self._batches.pop(batch_id)
+        return {
+            custom_id: (
+                task.exception() if task.exception() is not None else task.result()
+            )
+            for custom_id, task in tasks.items()
+        }
+
+    async def __run(self, request: BatchRequest) -> Any:
+        async with self.semaphore:
+            match request.operation:
+                case BatchOperation.COMPLETION:
+                    return await self.client.create_completion(**request.params)
+                case BatchOperation.COMPLETION_WITH_TOOLS:
+                    return await self.client.create_completion_with_tools(
+                        **request.params
+                    )
+                case BatchOperation.IMAGE:
+                    return await self.client.generate_image(**request.params)
+
+
+async def run_batch(
+    backend: BatchBackend, requests: list[BatchRequest], poll_interval: float
+) -> dict[str, Any]:
+    if not requests:
+        return {}
+
+    batch_id = await backend.submit(requests)
+    while not await backend.is_done(batch_id):
+        await asyncio.sleep(poll_interval)
+
+    return await backend.get_results(batch_id)
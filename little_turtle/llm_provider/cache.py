@@ -0,0 +1,58 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Optional, Protocol
+
+from redis.asyncio import Redis
+
+KEY_PREFIX = "little_turtle:llm_cache"
+
+
+class ResponseCache(Protocol):
+    async def get(self, key: str) -> Optional[str]: ...
+
+    async def set(self, key: str, value: str) -> None: ...
+
+
+class LocalResponseCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class RedisResponseCache:
+    def __init__(self, redis_client: Redis, ttl: int):
+        self.redis_client = redis_client
+        self.ttl = ttl
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.redis_client.get(f"{KEY_PREFIX}:{key}")
+        return value.decode("utf-8") if value is not None else None
+
+    async def set(self, key: str, value: str) -> None:
+        await self.redis_client.set(f"{KEY_PREFIX}:{key}", value, ex=self.ttl)
+
+
+def make_cache_key(provider: str, operation: str, request: dict[str, Any]) -> str:
+    payload = json.dumps(
+        {"provider": provider, "operation": operation, "request": request},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,32 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+current_agent: ContextVar[Optional[str]] = ContextVar("current_agent", default=None)
+current_story_date: ContextVar[Optional[str]] = ContextVar(
+    "current_story_date", default=None
+)
+current_chat_id: ContextVar[Optional[int]] = ContextVar("current_chat_id", default=None)
+
+
+@contextmanager
+def bind_context(var: ContextVar[T], value: T) -> Iterator[None]:
+    token = var.set(value)
+    try:
+        yield
+    finally:
+        var.reset(token)
+
+
+def agent_context(agent: str):
+    return bind_context(current_agent, agent)
+
+
+def story_date_context(date: Optional[str]):
+    return bind_context(current_story_date, date)
+
+
+def chat_context(chat_id: Optional[int]):
+    return bind_context(current_chat_id, chat_id)
@@ -0,0 +1,266 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from little_turtle.app_config import AppConfig
+from little_turtle.services import LoggerService
+from .protocols import LLMClient, LLMResponse, Tool
+
+MIN_LATENCY_SAMPLES = 10
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+
+        # Half-open: after the timeout a single probe is let through at a time
+        return (
+            not self.probing and time.monotonic() - self.opened_at >= self.reset_timeout
+        )
+
+    def acquire_probe(self) -> bool:
+        if self.opened_at is None or not self.allow():
+            return False
+
+        self.probing = True
+        return True
+
+    def release_probe(self):
+        # A probe that was cancelled says nothing about the provider
+        self.probing = False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        # Failures keep counting while open, so a failed probe reopens it
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.probing = False
+
+
+class LatencyTracker:
+    def __init__(self, window: int):
+        self.samples: deque[float] = deque(maxlen=window)
+
+    def record(self, latency: float):
+        self.samples.append(latency)
+
+    def p95(self) -> Optional[float]:
+        if len(self.samples) < MIN_LATENCY_SAMPLES:
+            return None
+
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class HedgedLLMClient:
+    def __init__(
+        self,
+        primary: LLMClient,
+        secondary: LLMClient,
+        config: AppConfig,
+        logger_service: LoggerService,
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.logger_service = logger_service
+        self.initial_delay = config.LLM_HEDGE_INITIAL_DELAY_SECONDS
+        self.min_delay = config.LLM_HEDGE_MIN_DELAY_SECONDS
+        self.latency_window = config.LLM_HEDGE_LATENCY_WINDOW
+
+        self._breakers = {
+            id(client): CircuitBreaker(
+                config.LLM_CIRCUIT_BREAKER_FAILURES,
+                config.LLM_CIRCUIT_BREAKER_RESET_SECONDS,
+            )
+            for client in (primary, secondary)
+        }
+        self._latencies: dict[str, LatencyTracker] = {}
+
+    async def create_completion(
+        self, messages: list[dict[str, str]], **kwargs
+    ) -> LLMResponse:
+        return await self.__hedge(
+            "completion",
+            lambda client: client.create_completion(
+                messages, **self.__get_kwargs(client, kwargs)
+            ),
+        )
+
+    async def create_completion_with_tools(
+        self, messages: list[dict[str, str]], tools: list[dict[str, Any]], **kwargs
+    ) -> LLMResponse:
+        # Tool definitions are provider specific, so they can't be hedged
+        return await self.primary.create_completion_with_tools(
+            messages, tools, **kwargs
+        )
+
+    async def stream_completion(
+        self, messages: list[dict[str, str]], **kwargs
+    ) -> AsyncIterator[str]:
+        chunk, queue, pump = await self.__hedge(
+            "stream",
+            lambda client: self.__start_stream(
+                client.stream_completion(messages, **self.__get_kwargs(client, kwargs))
+            ),
+            discard=lambda result: result[2].cancel(),
+        )
+
+        try:
+            while chunk is not None:
+                yield chunk
+                chunk = await queue.get()
+                if isinstance(chunk, Exception):
+                    raise chunk
+        finally:
+            pump.cancel()
+
+    async def generate_image(self, instructions: str, input_text: str, **kwargs) -> str:
+        return await self.primary.generate_image(instructions, input_text, **kwargs)
+
+    def get_search_tool(self) -> Optional[Tool]:
+        return self.primary.get_search_tool()
+
+    async def warm_up(self) -> None:
+        await asyncio.gather(self.primary.warm_up(), self.secondary.warm_up())
+
+    async def close(self) -> None:
+        # The wrapped clients are owned and closed by the container
+        pass
+
+    async def __hedge(
+        self,
+        operation: str,
+        start: Callable[[LLMClient], Awaitable[Any]],
+        discard: Optional[Callable[[Any], None]] = None,
+    ) -> Any:
+        clients = [
+            client
+            for client in (self.primary, self.secondary)
+            if self._breakers[id(client)].allow()
+        ] or [self.primary]
+        deadline = self.__get_deadline(operation)
+        started_at = time.monotonic()
+
+        tasks: dict[asyncio.Task, LLMClient] = {}
+        probes: set[asyncio.Task] = set()
+        errors: list[BaseException] = []
+
+        def launch(force: bool = False):
+            client = clients.pop(0)
+            breaker = self._breakers[id(client)]
+            # Another request may have taken the probe since clients were picked
+            if not breaker.allow() and not force:
+                return
+
+            task = asyncio.create_task(start(client))
+            tasks[task] = client
+            if breaker.acquire_probe():
+                probes.add(task)
+
+        # The first request goes out even when every breaker is open
+        launch(force=True)
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=deadline if clients else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    self.logger_service.info(
+                        "Hedging LLM request",
+                        operation=operation,
+                        deadline=round(deadline, 3),
+                    )
+                    launch()
+                    continue
+
+                result = None
+                for task in done:
+                    client = tasks.pop(task)
+                    if task.exception() is not None:
+                        self._breakers[id(client)].record_failure()
+                        errors.append(task.exception())
+                        continue
+
+                    self._breakers[id(client)].record_success()
+                    if result is None:
+                        result = (client, task.result())
+                    elif discard is not None:
+                        discard(task.result())
+
+                if result is not None:
+                    winner, response = result
+                    if winner is self.primary or self.primary in tasks.values():
+                        # A cancelled primary still tells how slow it was
+                        self.__get_latency(operation).record(
+                            time.monotonic() - started_at
+                        )
+                    return response
+
+                if not tasks and clients:
+                    launch()
+
+            raise errors[0]
+        finally:
+            for task, client in tasks.items():
+                task.cancel()
+                if task in probes:
+                    self._breakers[id(client)].release_probe()
+
+    @staticmethod
+    async def __start_stream(stream: AsyncIterator[str]):
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def pump():
+            try:
+                async for chunk in stream:
+                    queue.put_nowait(chunk)
+                queue.put_nowait(None)
+            except Exception as e:
+                queue.put_nowait(e)
+
+        # The stream is read by a single task for its whole life, the hedge
+        # only waits for the first chunk to decide which provider wins
+        pump_task = asyncio.create_task(pump())
+        try:
+            chunk = await queue.get()
+        except asyncio.CancelledError:
+            pump_task.cancel()
+            raise
+
+        if isinstance(chunk, Exception):
+            raise chunk
+
+        return chunk, queue, pump_task
+
+    def __get_kwargs(self, client: LLMClient, kwargs: dict[str, Any]) -> dict:
+        if client is self.primary:
+            return kwargs
+
+        # Model names are provider specific, the secondary uses its default
+        return {key: value for key, value in kwargs.items() if key != "model"}
+
+    def __get_deadline(self, operation: str) -> float:
+        p95 = self.__get_latency(operation).p95()
+        return self.initial_delay if p95 is None else max(self.min_delay, p95)
+
+    def __get_latency(self, operation: str) -> LatencyTracker:
+        if operation not in self._latencies:
+            self._latencies[operation] = LatencyTracker(self.latency_window)
+
+        return self._latencies[operation]
@@ -1,9 +1,17 @@
-from typing import Any
-from openai import OpenAI
+from typing import Any, AsyncIterator, Optional
+import openai
+from openai import AsyncOpenAI
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletion
+from openai.types.responses import Response
 
 from little_turtle.app_config import AppConfig
+from little_turtle.services import LoggerService
 from .base import BaseLLMAdapter
+from .cache import ResponseCache
+from .types import ProviderType
 from .protocols import LLMResponse
+from .usage import Usage, UsageTracker
 
 
 class OpenAIResponse:
@@ -17,44 +25,102 @@ class OpenAIResponse:
         return self.content or ""
 
 
+class OpenAIImageResponse:
+
+    def __init__(self, content: str, response: Optional[Response] = None):
+        self.raw_response = response
+        self.content = content
+
+    def __str__(self):
+        return self.content
+
+
 class OpenAIAdapter(BaseLLMAdapter):
 
-    def __init__(self, config: AppConfig):
-        super().__init__(config)
-        self.client = OpenAI(api_key=config.OPENAI_API_KEY)
+    provider = ProviderType.OPENAI
+    retryable_errors = (openai.APIConnectionError,)
+
+    def __init__(
+        self,
+        config: AppConfig,
+        response_cache: Optional[ResponseCache] = None,
+        logger_service: Optional[LoggerService] = None,
+        usage_tracker: Optional[UsageTracker] = None,
+    ):
+        super().__init__(config, response_cache, logger_service, usage_tracker)
+        # Retries are handled by the adapter so they share its rate limits
+        self.client = AsyncOpenAI(api_key=config.OPENAI_API_KEY, max_retries=0)
+        self.rpm_limit = config.OPENAI_RPM_LIMIT
+        self.tpm_limit = config.OPENAI_TPM_LIMIT
         self.model = config.OPENAI_MODEL
 
-    def create_completion(
+    async def _create_completion(
         self, messages: list[dict[str, str]], **kwargs
     ) -> LLMResponse:
-        response = self.client.chat.completions.create(
-            model=kwargs.get("model", self.model),
-            messages=messages,
-            **{k: v for k, v in kwargs.items() if k != "model"},
+        response = await self.client.chat.completions.create(
+            **self._prepare_request(messages, **kwargs)
         )
 
         return OpenAIResponse(response)
 
-    def create_completion_with_tools(
+    async def _create_completion_with_tools(
         self, messages: list[dict[str, str]], tools: list[dict[str, Any]], **kwargs
     ) -> LLMResponse:
-        response = self.client.chat.completions.create(
-            model=kwargs.get("model", self.model),
-            messages=messages,
-            tools=tools,
-            **{k: v for k, v in kwargs.items() if k not in ["model", "tools"]},
+        response = await self.client.chat.completions.create(
+            **self._prepare_request(messages, tools=tools, **kwargs)
         )
 
         return OpenAIResponse(response)
 
-    def generate_image(self, instructions: str, input_text: str, **kwargs) -> str:
-        resp = self.client.responses.create(
-            model=kwargs.get("model", "gpt-5"),
-            instructions=instructions,
-            input=input_text,
-            tools=[{"type": "image_generation"}],
+    async def _stream_completion(
+        self, messages: list[dict[str, str]], **kwargs
+    ) -> AsyncIterator[str | Usage]:
+        stream = await self.client.chat.completions.create(
+            **self._prepare_request(
+                messages,
+                stream=True,
+                stream_options={"include_usage": True},
+                **kwargs,
+            )
         )
 
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            if chunk.usage is not None:
+                yield self._to_usage(chunk.usage)
+
+    async def _generate_image(
+        self, instructions: str, input_text: str, **kwargs
+    ) -> LLMResponse:
+        resp = await self.client.responses.create(
+            **self._prepare_image_request(instructions, input_text, **kwargs)
+        )
+
+        return OpenAIImageResponse(self._extract_image(resp), resp)
+
+    def _prepare_request(
+        self, messages: list[dict[str, Any]], **kwargs
+    ) -> dict[str, Any]:
+        return {
+            **{k: v for k, v in kwargs.items() if k != "cache_prompt"},
+            "model": kwargs.get("model", self.model),
+            "messages": messages,
+        }
+
+    @staticmethod
+    def _prepare_image_request(
+        instructions: str, input_text: str, **kwargs
+    ) -> dict[str, Any]:
+        return {
+            "model": kwargs.get("model", "gpt-5"),
+            "instructions": instructions,
+            "input": input_text,
+            "tools": [{"type": "image_generation"}],
+        }
+
+    @staticmethod
+    def _extract_image(resp: Response) -> str:
         image_data = [
             output.result
             for output in resp.output
@@ -62,3 +128,56 @@ class OpenAIAdapter(BaseLLMAdapter):
         ]
 
         return image_data[0] if image_data else ""
+
+    def _count_tokens(self, response: Any) -> Optional[int]:
+        usage = getattr(getattr(response, "raw_response", None), "usage", None)
+        return usage.total_tokens if usage is not None else None
+
+    def _get_usage(self, response: Any) -> Optional[Usage]:
+        raw_response = getattr(response, "raw_response", None)
+        if isinstance(raw_response, ChatCompletion) and raw_response.usage:
+            return self._to_usage(raw_response.usage)
+
+        if not isinstance(raw_response, Response) or raw_response.usage is None:
+            return None
+
+        usage = raw_response.usage
+        cached_tokens = usage.input_tokens_details.cached_tokens or 0
+        output_types = [output.type for output in raw_response.output]
+
+        return Usage(
+            input_tokens=usage.input_tokens - cached_tokens,
+            output_tokens=usage.output_tokens,
+            cached_tokens=cached_tokens,
+            reasoning_tokens=usage.output_tokens_details.reasoning_tokens or 0,
+            web_searches=output_types.count("web_search_call"),
+            images=output_types.count("image_generation_call"),
+        )
+
+    @staticmethod
+    def _to_usage(usage: CompletionUsage) -> Usage:
+        prompt_details = usage.prompt_tokens_details
+        completion_details = usage.completion_tokens_details
+        cached_tokens = (prompt_details.cached_tokens if prompt_details else 0) or 0
+
+        return Usage(
+            input_tokens=usage.prompt_tokens - cached_tokens,
+            output_tokens=usage.completion_tokens,
+            cached_tokens=cached_tokens,
+            reasoning_tokens=(
+                completion_details.reasoning_tokens if completion_details else 0
+            )
+            or 0,
+        )
+
+    def _deserialize_response(self, data: str) -> LLMResponse:
+        return OpenAIResponse(ChatCompletion.model_validate_json(data))
+
+    def _deserialize_image(self, data: str) -> LLMResponse:
+        return OpenAIImageResponse(data)
+
+    async def warm_up(self) -> None:
+        await self.client.models.list()
+
+    async def close(self) -> None:
+        await self.client.close()
@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from .usage import Usage
+
+WEB_SEARCH_PRICE = 0.01
+IMAGE_PRICE = 0.042
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    # USD per million tokens
+    input: float
+    output: float
+    cached_input: float
+    cache_write: Optional[float] = None
+
+
+MODEL_PRICES = {
+    "gpt-5-nano": ModelPrice(input=0.05, output=0.4, cached_input=0.005),
+    "gpt-5-mini": ModelPrice(input=0.25, output=2, cached_input=0.025),
+    "gpt-5": ModelPrice(input=1.25, output=10, cached_input=0.125),
+    "gpt-4.1-mini": ModelPrice(input=0.4, output=1.6, cached_input=0.1),
+    "gpt-4.1": ModelPrice(input=2, output=8, cached_input=0.5),
+    "gpt-4o-mini": ModelPrice(input=0.15, output=0.6, cached_input=0.075),
+    "gpt-4o": ModelPrice(input=2.5, output=10, cached_input=1.25),
+    "gpt-4": ModelPrice(input=30, output=60, cached_input=30),
+    "claude-opus-4": ModelPrice(
+        input=15, output=75, cached_input=1.5, cache_write=18.75
+    ),
+    "claude-sonnet-4": ModelPrice(
+        input=3, output=15, cached_input=0.3, cache_write=3.75
+    ),
+    "claude-3-7-sonnet": ModelPrice(
+        input=3, output=15, cached_input=0.3, cache_write=3.75
+    ),
+    "claude-3-5-sonnet": ModelPrice(
+        input=3, output=15, cached_input=0.3, cache_write=3.75
+    ),
+    "claude-haiku-4": ModelPrice(input=1, output=5, cached_input=0.1, cache_write=1.25),
+    "claude-3-5-haiku": ModelPrice(
+        input=0.8, output=4, cached_input=0.08, cache_write=1
+    ),
+}
+
+
+def get_model_price(model: str) -> Optional[ModelPrice]:
+    # Dated snapshots like claude-sonnet-4-20250514 use their family price
+    matches = [name for name in MODEL_PRICES if model.startswith(name)]
+    return MODEL_PRICES[max(matches, key=len)] if matches else None
+
+
+def estimate_cost(model: str, usage: Usage) -> float:
+    cost = usage.web_searches * WEB_SEARCH_PRICE + usage.images * IMAGE_PRICE
+
+    price = get_model_price(model)
+    if price is not None:
+        cache_write = price.cache_write or price.input
+        cost += (
+            usage.input_tokens * price.input
+            + usage.cached_tokens * price.cached_input
+            + usage.cache_creation_tokens * cache_write
+            + usage.output_tokens * price.output
+        ) / 1_000_000
+
+    return round(cost, 6)
@@ -1,4 +1,4 @@
-from typing import Protocol, Any, Optional
+from typing import Protocol, Any, Optional, AsyncIterator
 from typing_extensions import TypedDict
 
 
@@ -15,14 +15,24 @@ class LLMResponse(Protocol):
 
 class LLMClient(Protocol):
 
-    def create_completion(
+    async def create_completion(
         self, messages: list[dict[str, str]], **kwargs
     ) -> LLMResponse: ...
 
-    def create_completion_with_tools(
+    async def create_completion_with_tools(
         self, messages: list[dict[str, str]], tools: list[dict[str, Any]], **kwargs
     ) -> LLMResponse: ...
 
-    def generate_image(self, instructions: str, input_text: str, **kwargs) -> str: ...
+    def stream_completion(
+        self, messages: list[dict[str, str]], **kwargs
+    ) -> AsyncIterator[str]: ...
+
+    async def generate_image(
+        self, instructions: str, input_text: str, **kwargs
+    ) -> str: ...
 
     def get_search_tool(self) -> Optional[Tool]: ...
+
+    async def warm_up(self) -> None: ...
+
+    async def close(self) -> None: ...
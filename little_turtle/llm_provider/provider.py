@@ -1,19 +1,43 @@
+from typing import Optional
+
 from little_turtle.app_config import AppConfig
+from little_turtle.services import LoggerService
 from .types import ProviderType
 from .protocols import LLMClient
 from .base import BaseLLMAdapter
+from .cache import ResponseCache
+from .usage import UsageTracker
 from .openai_adapter import OpenAIAdapter
 from .anthropic_adapter import AnthropicAdapter
+from .batch import (
+    AnthropicBatchBackend,
+    BatchBackend,
+    LocalBatchBackend,
+    OpenAIBatchBackend,
+)
 
 
 class LLMProvider:
 
-    def __init__(self, config: AppConfig):
+    def __init__(
+        self,
+        config: AppConfig,
+        response_cache: Optional[ResponseCache] = None,
+        logger_service: Optional[LoggerService] = None,
+        usage_tracker: Optional[UsageTracker] = None,
+    ):
         self.config = config
+        self.response_cache = response_cache
+        self.logger_service = logger_service
+        self.usage_tracker = usage_tracker
         self._adapters = {
             ProviderType.OPENAI: OpenAIAdapter,
             ProviderType.ANTHROPIC: AnthropicAdapter,
         }
+        self._batch_backends = {
+            ProviderType.OPENAI: OpenAIBatchBackend,
+            ProviderType.ANTHROPIC: AnthropicBatchBackend,
+        }
 
     def build(self, provider: ProviderType) -> LLMClient:
         if provider not in self._adapters:
@@ -23,7 +47,23 @@ class LLMProvider:
             )
 
         adapter_class = self._adapters[provider]
-        return adapter_class(self.config)
+        return adapter_class(
+            self.config, self.response_cache, self.logger_service, self.usage_tracker
+        )
+
+    def build_batch_backend(
+        self, provider: ProviderType, client: LLMClient
+    ) -> BatchBackend:
+        if self.config.BATCH_BACKEND == "local":
+            return LocalBatchBackend(client, self.config.BATCH_LOCAL_CONCURRENCY)
+
+        if provider not in self._batch_backends:
+            raise ValueError(
+                f"Provider {provider} has no batch API. "
+                f"Available providers: {list(self._batch_backends.keys())}"
+            )
+
+        return self._batch_backends[provider](client)
 
     def register_adapter(
         self, provider: str, adapter_class: type[BaseLLMAdapter]
@@ -0,0 +1,112 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional
+
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+class TokenBucket:
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.tokens = float(per_minute)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float) -> float:
+        amount = min(amount, self.capacity)
+
+        # The lock keeps waiters in FIFO order so large requests aren't starved
+        async with self._lock:
+            self.__refill()
+            wait = max(0.0, (amount - self.tokens) / self.rate)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                self.__refill()
+
+            self.tokens -= amount
+            return wait
+
+    def consume(self, amount: float):
+        self.__refill()
+        self.tokens -= amount
+
+    def __refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+
+class RateLimiter:
+    def __init__(self, rpm_limit: int, tpm_limit: int):
+        self.requests = TokenBucket(rpm_limit) if rpm_limit > 0 else None
+        self.tokens = TokenBucket(tpm_limit) if tpm_limit > 0 else None
+
+    async def acquire(self, estimated_tokens: int) -> float:
+        waited = 0.0
+        if self.requests is not None:
+            waited += await self.requests.acquire(1)
+        if self.tokens is not None:
+            waited += await self.tokens.acquire(estimated_tokens)
+
+        return waited
+
+    def record_usage(self, estimated_tokens: int, used_tokens: Optional[int]):
+        if self.tokens is not None and used_tokens is not None:
+            self.tokens.consume(used_tokens - estimated_tokens)
+
+
+class RetryPolicy:
+    def __init__(self, max_retries: int, base_delay: float, max_delay: float):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def get_delay(self, attempt: int, error: Exception) -> float:
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+
+        # Full jitter keeps concurrent retries from hitting the provider in waves
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+def is_retryable_status(status_code: Optional[int]) -> bool:
+    return status_code is not None and (
+        status_code in RETRYABLE_STATUS_CODES or status_code >= 500
+    )
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms is not None:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after is None:
+        return None
+
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -4,3 +4,13 @@ from enum import Enum
 class ProviderType(str, Enum):
     OPENAI = "openai"
     ANTHROPIC = "anthropic"
+
+    def __str__(self) -> str:
+        # Metric labels and log fields render providers with str()
+        return self.value
+
+
+class CacheMode(str, Enum):
+    OFF = "off"
+    AUTO = "auto"
+    FORCE = "force"
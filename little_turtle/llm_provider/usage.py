@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from pydantic import BaseModel
+from redis.asyncio import Redis
+
+from little_turtle.services import LoggerService
+
+STREAM_KEY = "little_turtle:llm_usage"
+
+
+@dataclass
+class Usage:
+    # Input tokens exclude the ones read from or written to the prompt cache
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    cache_creation_tokens: int = 0
+    reasoning_tokens: int = 0
+    web_searches: int = 0
+    images: int = 0
+
+
+class UsageTotals(BaseModel):
+    calls: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    web_searches: int = 0
+    images: int = 0
+    cost_usd: float = 0
+    latency_ms: int = 0
+    max_latency_ms: int = 0
+
+    @property
+    def avg_latency_ms(self) -> int:
+        requests = self.calls - self.cache_hits
+        return round(self.latency_ms / requests) if requests > 0 else 0
+
+    def add(self, record: dict[str, str]):
+        self.calls += 1
+        self.errors += record.get("status") == "error"
+        self.cache_hits += record.get("status") == "cached"
+        self.input_tokens += int(record.get("input_tokens", 0))
+        self.output_tokens += int(record.get("output_tokens", 0))
+        self.cached_tokens += int(record.get("cached_tokens", 0))
+        self.web_searches += int(record.get("web_searches", 0))
+        self.images += int(record.get("images", 0))
+        self.cost_usd += float(record.get("cost_usd", 0))
+        self.latency_ms += int(record.get("latency_ms", 0))
+        self.max_latency_ms = max(self.max_latency_ms, int(record.get("latency_ms", 0)))
+
+
+class UsageTracker:
+    def __init__(
+        self,
+        redis_client: Redis,
+        max_len: int,
+        tz_offset: int,
+        logger_service: Optional[LoggerService] = None,
+    ):
+        self.redis_client = redis_client
+        self.max_len = max_len
+        self.tz = timezone(timedelta(hours=tz_offset))
+        self.logger_service = logger_service
+
+    async def record(self, record: dict[str, Any]):
+        fields = {key: "" if value is None else value for key, value in record.items()}
+
+        # Accounting must never fail the generation it describes
+        try:
+            await self.redis_client.xadd(
+                STREAM_KEY, fields, maxlen=self.max_len, approximate=True
+            )
+        except Exception as e:
+            if self.logger_service is not None:
+                self.logger_service.error("Failed to record LLM usage", exc_info=e)
+
+    async def summarize(self, days: int) -> dict[str, dict[str, UsageTotals]]:
+        since = datetime.now(self.tz) - timedelta(days=days)
+        entries = await self.redis_client.xrange(
+            STREAM_KEY, min=f"{int(since.timestamp() * 1000)}-0"
+        )
+
+        summary: dict[str, dict[str, UsageTotals]] = {}
+        for entry_id, raw_record in entries:
+            record = {
+                key.decode("utf-8"): value.decode("utf-8")
+                for key, value in raw_record.items()
+            }
+            day = self.__get_day(entry_id.decode("utf-8"))
+            agents = summary.setdefault(day, {})
+            agents.setdefault(record.get("agent") or "unknown", UsageTotals()).add(
+                record
+            )
+
+        return summary
+
+    def __get_day(self, entry_id: str) -> str:
+        timestamp = int(entry_id.split("-")[0]) / 1000
+        return datetime.fromtimestamp(timestamp, self.tz).strftime("%d.%m.%Y")
@@ -1,8 +1,11 @@
 import asyncio
+import time
 
+from aiogram import Bot
 from dependency_injector.wiring import inject, Provide
 from dotenv import load_dotenv
 from phoenix.otel import register
+from redis import asyncio as redis
 
 from little_turtle.container import Container
 from little_turtle.handlers import TelegramHandlers
@@ -13,6 +16,10 @@ from little_turtle.handlers.routers import (
     AdminCommandsRouter,
 )
 from little_turtle.app_config import AppConfig
+from little_turtle.llm_provider import LLMClient
+from little_turtle.prompts.prompts_provider import PromptsProvider
+from little_turtle.resources import count_resource_instances, warm_up
+from little_turtle.services import LoggerService, TelegramService
 
 
 def initialize_telemetry(config: AppConfig):
@@ -32,6 +39,47 @@ def initialize_telemetry(config: AppConfig):
     )
 
 
+@inject
+async def warm_up_connections(
+    config: AppConfig = Provide[Container.config],
+    logger_service: LoggerService = Provide[Container.logger_service],
+    openai_client: LLMClient = Provide[Container.openai_client],
+    anthropic_client: LLMClient = Provide[Container.anthropic_client],
+    prompts_provider: PromptsProvider = Provide[Container.prompts_provider],
+    bot: Bot = Provide[Container.bot],
+    telegram_service: TelegramService = Provide[Container.telegram_service],
+    redis_client: redis.Redis = Provide[Container.redis_client],
+):
+    checks = {
+        "openai": openai_client.warm_up,
+        "anthropic": anthropic_client.warm_up,
+        "phoenix": prompts_provider.refresh_all,
+        "bot_api": bot.get_me,
+        "telethon": telegram_service.connect,
+        "redis": redis_client.ping,
+    }
+
+    started_at = time.perf_counter()
+    results = await warm_up(checks, config.WARMUP_TIMEOUT_SECONDS)
+
+    for name, duration_ms, error in results:
+        if error is None:
+            logger_service.info("Warm-up", dependency=name, duration_ms=duration_ms)
+        else:
+            logger_service.error(
+                "Warm-up failed",
+                dependency=name,
+                duration_ms=duration_ms,
+                error=repr(error),
+            )
+
+    logger_service.info(
+        "Warm-up finished",
+        total_ms=round((time.perf_counter() - started_at) * 1000),
+        failed=[name for name, _, error in results if error is not None],
+    )
+
+
 @inject
 async def main(
     callback_query_handler_router: CallbackQueryHandlerRouter = Provide[
@@ -43,7 +91,10 @@ async def main(
     telegram_handler: TelegramHandlers = Provide[Container.telegram_handlers],
     set_state_router: SetStateRouter = Provide[Container.set_state_router],
     system_router: SystemRouter = Provide[Container.system_router],
+    logger_service: LoggerService = Provide[Container.logger_service],
 ):
+    logger_service.info("Resources initialized", **count_resource_instances())
+
     telegram_handler.init_routers(
         system_router,
         set_state_router,
@@ -53,11 +104,21 @@ async def main(
     await telegram_handler.run()
 
 
+async def run(container: Container):
+    await container.init_resources()
+    try:
+        if container.config().WARMUP_ENABLED:
+            await warm_up_connections()
+
+        await main()
+    finally:
+        await container.shutdown_resources()
+
+
 if __name__ == "__main__":
     load_dotenv()
 
     container = Container()
-    container.init_resources()
     container.wire(modules=[__name__])
 
     config = container.config()
@@ -65,4 +126,4 @@ if __name__ == "__main__":
 
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
-    loop.run_until_complete(main())
+    loop.run_until_complete(run(container))
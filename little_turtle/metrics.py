@@ -0,0 +1,60 @@
+from aiohttp import web
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+LLM_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+TELEGRAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+LLM_REQUEST_SECONDS = Histogram(
+    "little_turtle_llm_request_seconds",
+    "Time spent on LLM requests, including throttling and retries",
+    ["provider", "model", "operation", "agent"],
+    buckets=LLM_BUCKETS,
+)
+LLM_REQUESTS = Counter(
+    "little_turtle_llm_requests",
+    "LLM requests by outcome",
+    ["provider", "model", "operation", "agent", "status"],
+)
+LLM_RETRIES = Counter("little_turtle_llm_retries", "Retried LLM requests", ["provider"])
+LLM_THROTTLED_SECONDS = Counter(
+    "little_turtle_llm_throttled_seconds",
+    "Time LLM requests waited for the rate limiter",
+    ["provider"],
+)
+LLM_CACHE_REQUESTS = Counter(
+    "little_turtle_llm_cache_requests",
+    "Response cache lookups",
+    ["provider", "operation", "result"],
+)
+TELEGRAM_REQUEST_SECONDS = Histogram(
+    "little_turtle_telegram_request_seconds",
+    "Time spent on Telegram Bot API calls",
+    ["method"],
+    buckets=TELEGRAM_BUCKETS,
+)
+TELEGRAM_REQUESTS = Counter(
+    "little_turtle_telegram_requests",
+    "Telegram Bot API calls by outcome",
+    ["method", "status"],
+)
+FSM_OPERATIONS = Counter(
+    "little_turtle_fsm_operations",
+    "FSM storage operations by outcome",
+    ["operation", "status"],
+)
+GENERATION_JOBS = Counter(
+    "little_turtle_generation_jobs",
+    "Finished generation jobs by outcome",
+    ["kind", "status"],
+)
+HANDLER_ERRORS = Counter(
+    "little_turtle_handler_errors",
+    "Unhandled errors while handling updates",
+    ["error"],
+)
+
+
+async def metrics_handler(_: web.Request) -> web.Response:
+    return web.Response(
+        body=generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST}
+    )
@@ -1,17 +1,210 @@
-from typing import TYPE_CHECKING, Mapping, Any
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Mapping, Any, Optional
 
-from phoenix.client import Client
+import httpx
+from phoenix.client import AsyncClient
+from phoenix.client.types import PromptVersion
+from phoenix.client.types.prompts import AnthropicPrompt, OpenAIPrompt
+from phoenix.client.utils.config import get_base_url, get_env_client_headers
+from phoenix.client.utils.template_formatters import NO_OP_FORMATTER
 
-if TYPE_CHECKING:
-    from phoenix.client.types import PromptVersion
+from little_turtle.app_config import AppConfig
+from little_turtle.services import LoggerService
+
+PROMPT_IDENTIFIERS = (
+    "little_turtle_story",
+    "little_turtle_image",
+    "little_turtle_historical_events",
+)
+
+PHOENIX_TIMEOUT = httpx.Timeout(10.0, read=30.0)
+
+SNAPSHOT_LOADERS = {
+    "openai": PromptVersion.from_openai,
+    "anthropic": PromptVersion.from_anthropic,
+}
+
+
+@dataclass
+class CachedPrompt:
+    prompt: PromptVersion
+    fetched_at: float
 
 
 class PromptsProvider:
-    @staticmethod
-    def get_prompt(prompt_identifier: str) -> "PromptVersion":
-        return Client().prompts.get(prompt_identifier=prompt_identifier)
+    def __init__(self, config: AppConfig, logger_service: LoggerService):
+        self.ttl = config.PROMPTS_CACHE_TTL_SECONDS
+        self.snapshot_path = config.PROMPTS_SNAPSHOT_PATH
+        self.logger_service = logger_service
+        # The HTTP client is owned here so it can be closed without
+        # reaching into the Phoenix client
+        self.http_client = httpx.AsyncClient(
+            base_url=get_base_url(),
+            headers=get_env_client_headers(),
+            timeout=PHOENIX_TIMEOUT,
+        )
+        self.client = AsyncClient(http_client=self.http_client)
 
-    @staticmethod
-    def format(prompt_identifier: str, prompt_vars: Mapping[str, Any]) -> any:
-        prompt = PromptsProvider.get_prompt(prompt_identifier)
+        self.hits = 0
+        self.misses = 0
+        self._cache: dict[str, CachedPrompt] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._snapshot_lock = asyncio.Lock()
+        self._snapshot_tasks: set[asyncio.Task] = set()
+
+        self._load_snapshot()
+
+    async def get_prompt(self, prompt_identifier: str) -> PromptVersion:
+        cached = self._cache.get(prompt_identifier)
+        if cached is None:
+            self.misses += 1
+            return await asyncio.shield(self._fetch(prompt_identifier))
+
+        self.hits += 1
+        is_stale = time.monotonic() - cached.fetched_at > self.ttl
+        if is_stale and prompt_identifier not in self._inflight:
+            self._fetch(prompt_identifier).add_done_callback(
+                lambda task: self._log_refresh(prompt_identifier, task)
+            )
+
+        return cached.prompt
+
+    async def format(
+        self, prompt_identifier: str, prompt_vars: Mapping[str, Any]
+    ) -> any:
+        prompt = await self.get_prompt(prompt_identifier)
         return prompt.format(variables=prompt_vars)
+
+    async def refresh_all(self):
+        await asyncio.gather(
+            *(self._fetch(identifier) for identifier in PROMPT_IDENTIFIERS)
+        )
+
+    async def close(self):
+        await asyncio.gather(*self._snapshot_tasks, return_exceptions=True)
+
+        await self.http_client.aclose()
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
+
+    def _fetch(self, prompt_identifier: str) -> asyncio.Task:
+        task = self._inflight.get(prompt_identifier)
+        if task is None:
+            task = asyncio.create_task(self._load(prompt_identifier))
+            task.add_done_callback(
+                lambda _: self._inflight.pop(prompt_identifier, None)
+            )
+            self._inflight[prompt_identifier] = task
+
+        return task
+
+    async def _load(self, prompt_identifier: str) -> PromptVersion:
+        prompt = await self.client.prompts.get(prompt_identifier=prompt_identifier)
+        self._cache[prompt_identifier] = CachedPrompt(
+            prompt=prompt, fetched_at=time.monotonic()
+        )
+        task = asyncio.create_task(self._save_snapshot())
+        self._snapshot_tasks.add(task)
+        task.add_done_callback(self._snapshot_tasks.discard)
+
+        return prompt
+
+    def _load_snapshot(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return
+
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+
+            for prompt_identifier, entry in snapshot.items():
+                # Snapshot entries are served right away but count as stale,
+                # so the first use refreshes them from Phoenix in the background
+                self._cache[prompt_identifier] = CachedPrompt(
+                    prompt=SNAPSHOT_LOADERS[entry["sdk"]](
+                        entry["params"],
+                        template_format=entry["template_format"],
+                        model_provider=entry["model_provider"],
+                        description=entry["description"],
+                    ),
+                    fetched_at=float("-inf"),
+                )
+        except (OSError, ValueError, KeyError, TypeError, AssertionError) as e:
+            self.logger_service.error(
+                "Failed to load prompts snapshot", path=self.snapshot_path, exc_info=e
+            )
+            return
+
+        self.logger_service.info(
+            "Prompts snapshot loaded", path=self.snapshot_path, prompts=list(snapshot)
+        )
+
+    async def _save_snapshot(self):
+        if not self.snapshot_path:
+            return
+
+        snapshot = {}
+        for prompt_identifier, cached in self._cache.items():
+            entry = self._get_snapshot_entry(cached.prompt)
+            if entry is not None:
+                snapshot[prompt_identifier] = entry
+
+        async with self._snapshot_lock:
+            try:
+                await asyncio.to_thread(self._write_snapshot, snapshot)
+            except OSError as e:
+                self.logger_service.error(
+                    "Failed to save prompts snapshot",
+                    path=self.snapshot_path,
+                    exc_info=e,
+                )
+
+    @staticmethod
+    def _get_snapshot_entry(prompt: PromptVersion) -> Optional[dict[str, Any]]:
+        # Templates are kept unformatted in the provider's request shape,
+        # which the public from_openai/from_anthropic constructors accept
+        formatted = prompt.format(formatter=NO_OP_FORMATTER)
+        if isinstance(formatted, AnthropicPrompt):
+            sdk = "anthropic"
+        elif isinstance(formatted, OpenAIPrompt):
+            sdk = "openai"
+        else:
+            return None
+
+        # Those constructors default to MUSTACHE, so the template format and
+        # the rest of the metadata PromptVersion has no getters for are kept too
+        return {
+            "sdk": sdk,
+            "params": dict(formatted),
+            "template_format": prompt._template_format,
+            "model_provider": prompt._model_provider,
+            "description": prompt._description,
+        }
+
+    def _write_snapshot(self, snapshot: dict[str, Any]):
+        os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(temp_path, self.snapshot_path)
+
+    def _log_refresh(self, prompt_identifier: str, task: asyncio.Task):
+        if task.cancelled():
+            return
+
+        if task.exception() is not None:
+            self.logger_service.error(
+                "Failed to refresh prompt, serving stale version",
+                prompt=prompt_identifier,
+                exc_info=task.exception(),
+            )
+            return
+
+        self.logger_service.info(
+            "Prompt refreshed", prompt=prompt_identifier, **self.stats()
+        )
@@ -0,0 +1,115 @@
+import asyncio
+import gc
+import time
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+import httpx
+from aiogram import Bot
+from aiohttp import web
+from anthropic import AsyncAnthropic
+from openai import AsyncOpenAI
+from redis import asyncio as redis
+from telethon import TelegramClient
+
+from little_turtle.app_config import AppConfig
+from little_turtle.handlers.middlewares import telegram_metrics_middleware
+from little_turtle.llm_provider import LLMClient, LLMProvider, ProviderType
+from little_turtle.metrics import metrics_handler
+from little_turtle.prompts.prompts_provider import PromptsProvider
+from little_turtle.services import LoggerService, TelegramService
+
+TRACKED_RESOURCES = {
+    "bot": Bot,
+    "redis": redis.Redis,
+    "openai": AsyncOpenAI,
+    "anthropic": AsyncAnthropic,
+    "telethon": TelegramClient,
+    "httpx": httpx.AsyncClient,
+}
+
+
+async def init_bot(config: AppConfig) -> AsyncIterator[Bot]:
+    bot = Bot(config.TELEGRAM_BOT_TOKEN)
+    bot.session.middleware(telegram_metrics_middleware)
+    yield bot
+    await bot.session.close()
+
+
+async def init_redis_client(config: AppConfig) -> AsyncIterator[redis.Redis]:
+    client = redis.from_url(config.REDIS_URL)
+    yield client
+    await client.aclose()
+
+
+async def init_telegram_service(config: AppConfig) -> AsyncIterator[TelegramService]:
+    service = TelegramService(config)
+    yield service
+    await service.disconnect()
+
+
+async def init_llm_client(
+    provider: LLMProvider, provider_type: ProviderType
+) -> AsyncIterator[LLMClient]:
+    client = provider.build(provider_type)
+    yield client
+    await client.close()
+
+
+async def init_prompts_provider(
+    config: AppConfig, logger_service: LoggerService
+) -> AsyncIterator[PromptsProvider]:
+    provider = PromptsProvider(config, logger_service)
+    yield provider
+    await provider.close()
+
+
+async def init_metrics_server(
+    config: AppConfig, logger_service: LoggerService
+) -> AsyncIterator[Optional[web.AppRunner]]:
+    if not config.METRICS_ENABLED:
+        yield None
+        return
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics_handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, config.METRICS_HOST, config.METRICS_PORT).start()
+    logger_service.info(
+        "Metrics server started", host=config.METRICS_HOST, port=config.METRICS_PORT
+    )
+
+    yield runner
+    await runner.cleanup()
+
+
+def count_resource_instances() -> dict[str, int]:
+    counts = dict.fromkeys(TRACKED_RESOURCES, 0)
+    for obj in gc.get_objects():
+        for name, resource_type in TRACKED_RESOURCES.items():
+            if isinstance(obj, resource_type):
+                counts[name] += 1
+
+    return counts
+
+
+async def warm_up(
+    checks: dict[str, Callable[[], Awaitable]], timeout: float
+) -> list[tuple[str, float, Optional[BaseException]]]:
+    async def timed(check: Callable[[], Awaitable]):
+        started_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(check(), timeout)
+            error = None
+        except Exception as e:
+            error = e
+
+        return round((time.perf_counter() - started_at) * 1000), error
+
+    results = await asyncio.gather(*(timed(check) for check in checks.values()))
+
+    return sorted(
+        ((name, duration, error) for name, (duration, error) in zip(checks, results)),
+        key=lambda row: row[1],
+        reverse=True,
+    )
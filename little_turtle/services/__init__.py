@@ -1,7 +1,14 @@
+from .drafts_storage import DraftsStorage, StoryDraft
+from .historical_events_cache import HistoricalEventsCache
+from .historical_events_service import HistoricalEventsService
 from .logger_service import LoggerService
 from .telegram_service import TelegramService
 
 __all__ = [
+    "DraftsStorage",
+    "HistoricalEventsCache",
+    "HistoricalEventsService",
     "LoggerService",
+    "StoryDraft",
     "TelegramService",
 ]
@@ -0,0 +1,40 @@
+from typing import Optional
+
+from pydantic import BaseModel
+from redis.asyncio import Redis
+
+from little_turtle.app_config import AppConfig
+
+KEY_PREFIX = "little_turtle:draft"
+
+
+class StoryDraft(BaseModel):
+    date: str
+    target_topics: list[str]
+    story: str
+    image: Optional[str] = None
+
+
+class DraftsStorage:
+    def __init__(self, redis_client: Redis, config: AppConfig):
+        self.redis_client = redis_client
+        self.ttl = config.DRAFTS_TTL_SECONDS
+
+    async def save(self, draft: StoryDraft):
+        await self.redis_client.set(
+            self.__key(draft.date), draft.model_dump_json(), ex=self.ttl
+        )
+
+    async def get(self, date: str) -> Optional[StoryDraft]:
+        value = await self.redis_client.get(self.__key(date))
+        if value is None:
+            return None
+
+        return StoryDraft.model_validate_json(value)
+
+    async def delete(self, date: str):
+        await self.redis_client.delete(self.__key(date))
+
+    @staticmethod
+    def __key(date: str) -> str:
+        return f"{KEY_PREFIX}:{date}"
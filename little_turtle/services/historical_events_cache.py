@@ -0,0 +1,45 @@
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from little_turtle.app_config import AppConfig
+
+KEY_PREFIX = "little_turtle:historical_events"
+
+
+class HistoricalEventsCache:
+    def __init__(self, redis_client: Redis, config: AppConfig):
+        self.redis_client = redis_client
+        self.ttl = config.HISTORICAL_EVENTS_CACHE_TTL_SECONDS
+
+    async def get(
+        self, day: int, month: int, language: str, prompt_version: str
+    ) -> Optional[str]:
+        value = await self.redis_client.get(
+            self.__key(day, month, language, prompt_version)
+        )
+
+        return value.decode("utf-8") if value is not None else None
+
+    async def set(
+        self, day: int, month: int, language: str, prompt_version: str, value: str
+    ):
+        await self.redis_client.set(
+            self.__key(day, month, language, prompt_version), value, ex=self.ttl
+        )
+
+    async def invalidate(self, day: int, month: int, language: str) -> int:
+        keys = [
+            key
+            async for key in self.redis_client.scan_iter(
+                match=self.__key(day, month, language, "*")
+            )
+        ]
+        if not keys:
+            return 0
+
+        return await self.redis_client.delete(*keys)
+
+    @staticmethod
+    def __key(day: int, month: int, language: str, prompt_version: str) -> str:
+        return f"{KEY_PREFIX}:{month:02d}-{day:02d}:{language}:{prompt_version}"
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import os
+import sqlite3
+from datetime import date, timedelta
+
+import aiohttp
+from dotenv import load_dotenv
+
+from little_turtle.app_config import create_app_config
+from little_turtle.services.historical_events_service import HistoricalEventsService
+from little_turtle.services.logger_service import LoggerService
+
+# Any leap year works, it's only used to enumerate all 366 month/day pairs
+LEAP_YEAR = 2024
+USER_AGENT = "little-turtle (https://github.com/pkarpovich/little-turtle)"
+
+
+async def fetch_day(
+    session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, day: date
+) -> tuple[int, int, list[str]]:
+    async with semaphore:
+        async with session.get(
+            f"{HistoricalEventsService.url}/{day.month:02d}/{day.day:02d}"
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+
+    events = [f"{event['year']} {event['text']}" for event in data["events"]]
+    return day.month, day.day, events
+
+
+async def fetch_all_days(concurrency: int) -> list[tuple[int, int, list[str]]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    first_day = date(LEAP_YEAR, 1, 1)
+
+    async with aiohttp.ClientSession(headers={"User-Agent": USER_AGENT}) as session:
+        return await asyncio.gather(
+            *(
+                fetch_day(session, semaphore, first_day + timedelta(days=offset))
+                for offset in range(366)
+            )
+        )
+
+
+def write_index(index_path: str, days: list[tuple[int, int, list[str]]]):
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    temp_path = f"{index_path}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    with sqlite3.connect(temp_path) as connection:
+        connection.execute(
+            "CREATE TABLE on_this_day ("
+            "month INTEGER NOT NULL, day INTEGER NOT NULL, events TEXT NOT NULL, "
+            "PRIMARY KEY (month, day)) WITHOUT ROWID"
+        )
+        connection.executemany(
+            "INSERT INTO on_this_day (month, day, events) VALUES (?, ?, ?)",
+            [
+                (month, day, json.dumps(events, ensure_ascii=False))
+                for month, day, events in days
+            ],
+        )
+    connection.close()
+
+    os.replace(temp_path, index_path)
+
+
+async def main():
+    config = create_app_config()
+    logger_service = LoggerService()
+
+    days = await fetch_all_days(config.HISTORICAL_EVENTS_IMPORT_CONCURRENCY)
+    await asyncio.to_thread(write_index, config.HISTORICAL_EVENTS_INDEX_PATH, days)
+
+    logger_service.info(
+        "Historical events index built",
+        path=config.HISTORICAL_EVENTS_INDEX_PATH,
+        days=len(days),
+        events=sum(len(events) for _, _, events in days),
+    )
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    asyncio.run(main())
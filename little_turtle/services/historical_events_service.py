@@ -1,19 +1,36 @@
-from time import strptime
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Optional
 
-import requests
+from little_turtle.app_config import AppConfig
 
 
 class HistoricalEventsService:
     url = "https://api.wikimedia.org/feed/v1/wikipedia/en/onthisday/events"
 
-    @staticmethod
-    def get_by_date(date: str) -> list[str]:
-        date_obj = strptime(date, "%d.%m.%Y")
+    def __init__(self, config: AppConfig):
+        self.index_path = config.HISTORICAL_EVENTS_INDEX_PATH
+        self._connection: Optional[sqlite3.Connection] = None
 
-        base_url = f"{HistoricalEventsService.url}/{date_obj.tm_mon}/{date_obj.tm_mday}"
-        response = requests.get(base_url)
-        if response.status_code != 200:
+    def get_by_date(self, date: str) -> list[str]:
+        connection = self.__get_connection()
+        if connection is None:
             return list()
 
-        data = response.json()
-        return list(map(lambda x: f"{x['year']} {x['text']}", data["events"]))
+        date_obj = datetime.strptime(date, "%d.%m.%Y")
+        row = connection.execute(
+            "SELECT events FROM on_this_day WHERE month = ? AND day = ?",
+            (date_obj.month, date_obj.day),
+        ).fetchone()
+
+        return json.loads(row[0]) if row else list()
+
+    def __get_connection(self) -> Optional[sqlite3.Connection]:
+        if self._connection is None and os.path.exists(self.index_path):
+            self._connection = sqlite3.connect(
+                f"file:{self.index_path}?mode=ro", uri=True, check_same_thread=False
+            )
+
+        return self._connection
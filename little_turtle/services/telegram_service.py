@@ -1,17 +1,23 @@
+import asyncio
+import io
 import os
 from datetime import datetime
-from tempfile import NamedTemporaryFile
 from typing import Union, BinaryIO, Optional
 
 from telethon import TelegramClient
+from telethon.tl.types import TypeInputFile
 
 from little_turtle.app_config import AppConfig
 
+PhotoData = Union[bytes, bytearray, memoryview, BinaryIO]
+
 
 class TelegramService:
     client: TelegramClient = None
 
     def __init__(self, config: AppConfig):
+        self.fanout_concurrency = config.TELEGRAM_FANOUT_CONCURRENCY
+
         session_path = os.path.join(
             os.path.dirname(os.path.abspath(__file__)), config.TELEGRAM_SESSION_NAME
         )
@@ -26,6 +32,14 @@ class TelegramService:
         await self.client.start()
         await self.client.connect()
 
+    async def connect(self):
+        if not self.client.is_connected():
+            await self.client.connect()
+
+    async def disconnect(self):
+        if self.client.is_connected():
+            await self.client.disconnect()
+
     async def get_messages(self, chat_id: str = None) -> list[str]:
         await self.ensure_connected()
         messages = []
@@ -55,23 +69,58 @@ class TelegramService:
     async def send_photo(
         self,
         chat_id: Union[str, int],
-        photo: BinaryIO,
+        photo: PhotoData,
         photo_name: str,
         message: str,
         schedule: datetime = None,
     ):
         await self.ensure_connected()
 
-        extension = os.path.splitext(photo_name)[1]
-        with NamedTemporaryFile(suffix=extension) as temp:
-            temp.write(photo.read())
-            temp.flush()
-            await self.client.send_file(
-                chat_id,
-                temp.name,
-                caption=message,
-                schedule=schedule,
-            )
+        await self.client.send_file(
+            chat_id,
+            await self.upload_photo(photo, photo_name),
+            caption=message,
+            schedule=schedule,
+        )
+
+    async def send_photo_to_chats(
+        self,
+        chat_ids: list[Union[str, int]],
+        photo: PhotoData,
+        photo_name: str,
+        message: str,
+        schedule: datetime = None,
+    ) -> dict[Union[str, int], Optional[Exception]]:
+        await self.ensure_connected()
+
+        uploaded_photo = await self.upload_photo(photo, photo_name)
+
+        semaphore = asyncio.Semaphore(self.fanout_concurrency)
+
+        async def send(chat_id: Union[str, int]):
+            async with semaphore:
+                await self.client.send_file(
+                    chat_id,
+                    uploaded_photo,
+                    caption=message,
+                    schedule=schedule,
+                )
+
+        results = await asyncio.gather(
+            *(send(chat_id) for chat_id in chat_ids), return_exceptions=True
+        )
+
+        return dict(zip(chat_ids, results))
+
+    async def upload_photo(self, photo: PhotoData, photo_name: str) -> TypeInputFile:
+        # Telethon reads bytes and seekable streams part by part straight
+        # from memory, other buffers are wrapped into a stream first
+        if isinstance(photo, (bytearray, memoryview)):
+            photo = io.BytesIO(photo)
+
+        return await self.client.upload_file(
+            photo, file_name=os.path.basename(photo_name)
+        )
 
     async def get_chats(self, limit: int) -> list[dict]:
         await self.ensure_connected()
@@ -1,8 +1,9 @@
 from .buttons import split_buttons_to_rows, prepare_buttons
 from .date import get_day_of_week, validate_date, parse_date
-from .file import get_image_path, read_file_from_disk
+from .file import get_image_path, read_file_from_disk, write_file_to_disk
 from .json import pretty_print_json
 from .random import random_pick_n
+from .stage_timer import StageTimer
 from .telegram_text import remove_optional_last_period
 
 __all__ = [
@@ -13,7 +14,9 @@ __all__ = [
     "parse_date",
     "get_image_path",
     "read_file_from_disk",
+    "write_file_to_disk",
     "pretty_print_json",
     "random_pick_n",
+    "StageTimer",
     "remove_optional_last_period",
 ]
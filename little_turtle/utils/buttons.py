@@ -16,6 +16,7 @@ def prepare_buttons(
     buttons: dict[str, CallbackData] | dict[str, None],
     builder_type: T = InlineKeyboardBuilder,
     markup_args: dict = None,
+    rows: list[int] = None,
 ) -> InlineKeyboardMarkup | ReplyKeyboardMarkup:
     builder = builder_type()
     button = (
@@ -34,6 +35,9 @@ def prepare_buttons(
             )
         )
 
+    if rows:
+        builder.adjust(*rows)
+
     return builder.as_markup(**markup_args) if markup_args else builder.as_markup()
 
 
@@ -15,3 +15,8 @@ def read_file_from_disk(file_name: str) -> bytes:
         binary_data = f.read()
 
     return binary_data
+
+
+def write_file_to_disk(file_name: str, binary_data: bytes):
+    with open(file_name, "wb") as f:
+        f.write(binary_data)
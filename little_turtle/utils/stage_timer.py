@@ -0,0 +1,16 @@
+import time
+
+
+class StageTimer:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.stages: dict[str, float] = {}
+
+    def mark(self, stage: str):
+        self.stages[f"{stage}_at"] = round(time.perf_counter() - self.started_at, 3)
+
+    def report(self) -> dict[str, float]:
+        return {
+            **self.stages,
+            "total": round(time.perf_counter() - self.started_at, 3),
+        }
@@ -0,0 +1,272 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from little_turtle.llm_provider import hedged_client
+from little_turtle.llm_provider.hedged_client import (
+    MIN_LATENCY_SAMPLES,
+    CircuitBreaker,
+    HedgedLLMClient,
+    LatencyTracker,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class FakeClient:
+    def __init__(self, name: str, result=None, error=None):
+        self.name = name
+        self.result = result if result is not None else SimpleNamespace(content=name)
+        self.error = error
+        self.release = asyncio.Event()
+        self.hang = False
+        self.calls: list[dict] = []
+        self.cancelled = 0
+
+    async def create_completion(self, messages, **kwargs):
+        self.calls.append(kwargs)
+        try:
+            if self.hang:
+                await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    async def warm_up(self):
+        pass
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class FakeLogger:
+    def info(self, *args, **kwargs):
+        pass
+
+
+def create_client(primary, secondary, **overrides) -> HedgedLLMClient:
+    config = SimpleNamespace(
+        LLM_HEDGE_INITIAL_DELAY_SECONDS=0.01,
+        LLM_HEDGE_MIN_DELAY_SECONDS=0.01,
+        LLM_HEDGE_LATENCY_WINDOW=50,
+        LLM_CIRCUIT_BREAKER_FAILURES=2,
+        LLM_CIRCUIT_BREAKER_RESET_SECONDS=30.0,
+    )
+    for key, value in overrides.items():
+        setattr(config, key, value)
+
+    return HedgedLLMClient(primary, secondary, config, FakeLogger())
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(hedged_client, "time", clock)
+    return clock
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+
+    breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert not breaker.allow()
+
+
+def test_breaker_admits_single_probe_when_half_open(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+
+    clock.now += 29
+    assert not breaker.acquire_probe()
+
+    clock.now += 1
+    assert breaker.allow()
+    assert breaker.acquire_probe()
+    assert not breaker.allow()
+    assert not breaker.acquire_probe()
+
+
+def test_breaker_closes_after_successful_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.acquire_probe()
+
+    breaker.record_success()
+
+    assert breaker.opened_at is None
+    assert breaker.allow()
+    assert not breaker.acquire_probe()
+
+
+def test_breaker_reopens_after_failed_probe(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.acquire_probe()
+
+    breaker.record_failure()
+
+    assert breaker.opened_at == clock.now
+    assert not breaker.allow()
+    clock.now += 30
+    assert breaker.acquire_probe()
+
+
+def test_breaker_released_probe_can_be_retaken(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.acquire_probe()
+
+    breaker.release_probe()
+
+    assert breaker.acquire_probe()
+
+
+def test_latency_p95_needs_enough_samples():
+    tracker = LatencyTracker(window=100)
+    for latency in range(MIN_LATENCY_SAMPLES - 1):
+        tracker.record(latency)
+    assert tracker.p95() is None
+
+    for latency in range(MIN_LATENCY_SAMPLES - 1, 20):
+        tracker.record(latency)
+    assert tracker.p95() == 19
+
+
+def test_fast_primary_is_not_hedged():
+    async def run():
+        primary, secondary = FakeClient("primary"), FakeClient("secondary")
+        client = create_client(primary, secondary)
+
+        response = await client.create_completion([], model="gpt")
+
+        assert response.content == "primary"
+        assert primary.calls == [{"model": "gpt"}]
+        assert secondary.calls == []
+
+    asyncio.run(run())
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    async def run():
+        primary, secondary = FakeClient("primary"), FakeClient("secondary")
+        primary.hang = True
+        client = create_client(primary, secondary)
+
+        response = await client.create_completion([], model="gpt", temperature=0.5)
+        await settle()
+
+        assert response.content == "secondary"
+        assert secondary.calls == [{"temperature": 0.5}]
+        assert primary.cancelled == 1
+
+    asyncio.run(run())
+
+
+def test_failed_primary_falls_back_without_waiting():
+    async def run():
+        primary = FakeClient("primary", error=RuntimeError("primary failed"))
+        secondary = FakeClient("secondary")
+        client = create_client(primary, secondary, LLM_HEDGE_INITIAL_DELAY_SECONDS=60)
+
+        response = await asyncio.wait_for(client.create_completion([]), timeout=5)
+
+        assert response.content == "secondary"
+
+    asyncio.run(run())
+
+
+def test_first_error_is_raised_when_both_fail():
+    async def run():
+        primary = FakeClient("primary", error=RuntimeError("primary failed"))
+        secondary = FakeClient("secondary", error=RuntimeError("secondary failed"))
+        client = create_client(primary, secondary)
+
+        with pytest.raises(RuntimeError, match="primary failed"):
+            await client.create_completion([])
+
+    asyncio.run(run())
+
+
+def test_open_primary_breaker_routes_to_secondary():
+    async def run():
+        primary = FakeClient("primary", error=RuntimeError("primary failed"))
+        secondary = FakeClient("secondary")
+        client = create_client(primary, secondary, LLM_CIRCUIT_BREAKER_FAILURES=1)
+        await client.create_completion([])
+        primary.calls.clear()
+
+        response = await client.create_completion([])
+
+        assert response.content == "secondary"
+        assert primary.calls == []
+
+    asyncio.run(run())
+
+
+def test_half_open_primary_gets_a_single_probe(clock):
+    async def run():
+        primary = FakeClient("primary", error=RuntimeError("primary failed"))
+        secondary = FakeClient("secondary")
+        client = create_client(primary, secondary, LLM_CIRCUIT_BREAKER_FAILURES=1)
+        await client.create_completion([])
+
+        clock.now += 30
+        primary.calls.clear()
+        secondary.calls.clear()
+        primary.error = None
+        primary.hang = True
+        secondary.hang = True
+        requests = [asyncio.create_task(client.create_completion([])) for _ in range(3)]
+        await settle()
+
+        assert len(primary.calls) == 1
+        assert len(secondary.calls) == 2
+
+        primary.release.set()
+        secondary.release.set()
+        await asyncio.gather(*requests)
+        assert client._breakers[id(primary)].opened_at is None
+
+    asyncio.run(run())
+
+
+def test_cancelled_probe_is_released(clock):
+    async def run():
+        primary = FakeClient("primary", error=RuntimeError("primary failed"))
+        secondary = FakeClient("secondary")
+        client = create_client(primary, secondary, LLM_CIRCUIT_BREAKER_FAILURES=1)
+        await client.create_completion([])
+
+        clock.now += 30
+        primary.error = None
+        primary.hang = True
+        request = asyncio.create_task(client.create_completion([]))
+        await settle()
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+
+        breaker = client._breakers[id(primary)]
+        assert breaker.opened_at is not None
+        assert breaker.acquire_probe()
+
+    asyncio.run(run())
@@ -0,0 +1,120 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from phoenix.client.types import PromptVersion
+
+from little_turtle.prompts.prompts_provider import PromptsProvider
+
+VARIABLES = {"date": "01.11.2025"}
+
+
+class FakeLogger:
+    def __init__(self):
+        self.errors: list[str] = []
+
+    def info(self, *args, **kwargs):
+        pass
+
+    def error(self, message: str, **kwargs):
+        self.errors.append(message)
+
+
+def create_provider(snapshot_path, logger=None) -> PromptsProvider:
+    config = SimpleNamespace(
+        PROMPTS_CACHE_TTL_SECONDS=60, PROMPTS_SNAPSHOT_PATH=str(snapshot_path)
+    )
+    return PromptsProvider(config, logger or FakeLogger())
+
+
+def round_trip(snapshot_path, prompt: PromptVersion) -> PromptVersion:
+    async def run() -> PromptVersion:
+        provider = create_provider(snapshot_path)
+        provider._cache["prompt"] = SimpleNamespace(prompt=prompt)
+        await provider._save_snapshot()
+        await provider.close()
+
+        restored = create_provider(snapshot_path)
+        await restored.close()
+        return restored._cache["prompt"].prompt
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("template_format", ["F_STRING", "MUSTACHE"])
+def test_openai_prompt_survives_snapshot(tmp_path, template_format):
+    template = "Date is {date}" if template_format == "F_STRING" else "Date is {{date}}"
+    prompt = PromptVersion(
+        [{"role": "user", "content": template}],
+        model_name="gpt-4o",
+        template_format=template_format,
+    )
+
+    restored = round_trip(tmp_path / "prompts.json", prompt)
+
+    formatted = restored.format(variables=VARIABLES)
+    assert formatted == prompt.format(variables=VARIABLES)
+    assert formatted["messages"][0]["content"] == "Date is 01.11.2025"
+
+
+def test_anthropic_prompt_survives_snapshot(tmp_path):
+    prompt = PromptVersion(
+        [
+            {"role": "system", "content": "You write stories"},
+            {"role": "user", "content": "Date is {date}"},
+        ],
+        model_name="claude-sonnet-4-0",
+        model_provider="ANTHROPIC",
+        template_format="F_STRING",
+        description="story",
+    )
+
+    restored = round_trip(tmp_path / "prompts.json", prompt)
+
+    assert restored.format(variables=VARIABLES) == prompt.format(variables=VARIABLES)
+
+
+def test_snapshot_keeps_prompt_metadata(tmp_path):
+    snapshot_path = tmp_path / "prompts.json"
+    prompt = PromptVersion(
+        [{"role": "user", "content": "Date is {date}"}],
+        model_name="gpt-4o",
+        template_format="F_STRING",
+        description="story",
+    )
+
+    round_trip(snapshot_path, prompt)
+
+    entry = json.loads(snapshot_path.read_text())["prompt"]
+    assert entry["template_format"] == "F_STRING"
+    assert entry["model_provider"] == "OPENAI"
+    assert entry["description"] == "story"
+
+
+def test_snapshot_without_template_format_is_ignored(tmp_path):
+    snapshot_path = tmp_path / "prompts.json"
+    snapshot_path.write_text(
+        json.dumps(
+            {
+                "prompt": {
+                    "sdk": "openai",
+                    "params": {
+                        "model": "gpt-4o",
+                        "messages": [{"role": "user", "content": "Date is {date}"}],
+                    },
+                }
+            }
+        )
+    )
+    logger = FakeLogger()
+
+    async def run() -> PromptsProvider:
+        provider = create_provider(snapshot_path, logger)
+        await provider.close()
+        return provider
+
+    provider = asyncio.run(run())
+
+    assert provider._cache == {}
+    assert logger.errors == ["Failed to load prompts snapshot"]
@@ -0,0 +1,176 @@
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import pytest
+
+from little_turtle.llm_provider import rate_limit
+from little_turtle.llm_provider.rate_limit import (
+    RateLimiter,
+    RetryPolicy,
+    TokenBucket,
+    get_retry_after,
+    is_retryable_status,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    monkeypatch.setattr(
+        rate_limit, "asyncio", SimpleNamespace(Lock=asyncio.Lock, sleep=clock.sleep)
+    )
+    return clock
+
+
+def error_with_headers(headers: dict[str, str]) -> Exception:
+    error = Exception("rate limited")
+    error.response = SimpleNamespace(headers=headers)
+    return error
+
+
+def test_bucket_starts_full(clock):
+    bucket = TokenBucket(per_minute=60)
+
+    assert asyncio.run(bucket.acquire(60)) == 0
+    assert clock.sleeps == []
+
+
+def test_bucket_refills_with_time(clock):
+    bucket = TokenBucket(per_minute=60)
+    bucket.consume(60)
+
+    clock.now += 10
+
+    assert asyncio.run(bucket.acquire(10)) == 0
+    assert bucket.tokens == pytest.approx(0)
+
+
+def test_bucket_refill_is_capped_at_capacity(clock):
+    bucket = TokenBucket(per_minute=60)
+
+    clock.now += 600
+    asyncio.run(bucket.acquire(1))
+
+    assert bucket.tokens == pytest.approx(59)
+
+
+def test_bucket_waits_for_missing_tokens(clock):
+    bucket = TokenBucket(per_minute=60)
+    bucket.consume(60)
+
+    wait = asyncio.run(bucket.acquire(5))
+
+    assert wait == pytest.approx(5)
+    assert clock.sleeps == [pytest.approx(5)]
+    assert bucket.tokens == pytest.approx(0)
+
+
+def test_bucket_caps_request_at_capacity(clock):
+    bucket = TokenBucket(per_minute=60)
+    bucket.consume(60)
+
+    assert asyncio.run(bucket.acquire(1000)) == pytest.approx(60)
+
+
+def test_limiter_refunds_overestimated_tokens(clock):
+    limiter = RateLimiter(rpm_limit=10, tpm_limit=1000)
+    asyncio.run(limiter.acquire(estimated_tokens=600))
+
+    limiter.record_usage(estimated_tokens=600, used_tokens=100)
+
+    assert limiter.tokens.tokens == pytest.approx(900)
+
+
+def test_limiter_without_limits_never_waits(clock):
+    limiter = RateLimiter(rpm_limit=0, tpm_limit=0)
+
+    assert asyncio.run(limiter.acquire(estimated_tokens=10**6)) == 0
+    limiter.record_usage(estimated_tokens=10, used_tokens=20)
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"retry-after-ms": "1500"}, 1.5),
+        ({"retry-after-ms": "soon", "retry-after": "3"}, 3.0),
+        ({"retry-after": "2.5"}, 2.5),
+        ({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}, 0.0),
+        ({"retry-after": "soon"}, None),
+        ({}, None),
+    ],
+)
+def test_retry_after_headers(headers, expected):
+    assert get_retry_after(error_with_headers(headers)) == expected
+
+
+def test_retry_after_http_date_in_future():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    error = error_with_headers({"retry-after": format_datetime(retry_at, usegmt=True)})
+
+    assert get_retry_after(error) == pytest.approx(30, abs=2)
+
+
+def test_retry_after_without_response():
+    assert get_retry_after(Exception("network")) is None
+
+
+def test_delay_uses_retry_after_capped_at_max_delay():
+    policy = RetryPolicy(max_retries=3, base_delay=1, max_delay=10)
+
+    assert policy.get_delay(0, error_with_headers({"retry-after": "4"})) == 4
+    assert policy.get_delay(0, error_with_headers({"retry-after": "60"})) == 10
+
+
+@pytest.mark.parametrize("attempt, cap", [(0, 1), (1, 2), (3, 8), (10, 10)])
+def test_jittered_delay_bounds(monkeypatch, attempt, cap):
+    policy = RetryPolicy(max_retries=3, base_delay=1, max_delay=10)
+    bounds = []
+    monkeypatch.setattr(
+        random, "uniform", lambda low, high: bounds.append((low, high)) or high
+    )
+
+    assert policy.get_delay(attempt, Exception("failed")) == cap
+    assert bounds == [(0, cap)]
+
+
+def test_jittered_delay_stays_in_range(monkeypatch):
+    policy = RetryPolicy(max_retries=3, base_delay=1, max_delay=10)
+    monkeypatch.setattr(rate_limit, "random", random.Random(0))
+
+    delays = [policy.get_delay(2, Exception("failed")) for _ in range(200)]
+
+    assert all(0 <= delay <= 4 for delay in delays)
+
+
+@pytest.mark.parametrize(
+    "status_code, retryable",
+    [
+        (None, False),
+        (400, False),
+        (404, False),
+        (408, True),
+        (409, True),
+        (429, True),
+        (500, True),
+        (503, True),
+    ],
+)
+def test_retryable_status(status_code, retryable):
+    assert is_retryable_status(status_code) is retryable
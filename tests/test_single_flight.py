@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from little_turtle.controlles.single_flight import SingleFlight
+
+
+class Call:
+    def __init__(self, result="result", error=None):
+        self.result = result
+        self.error = error
+        self.release = asyncio.Event()
+        self.calls = 0
+        self.cancelled = False
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_concurrent_callers_share_one_call():
+    async def run():
+        flight, call = SingleFlight(), Call()
+        waiters = [asyncio.create_task(flight.do("key", call)) for _ in range(3)]
+        await settle()
+
+        call.release.set()
+
+        assert await asyncio.gather(*waiters) == ["result"] * 3
+        assert call.calls == 1
+
+    asyncio.run(run())
+
+
+def test_different_keys_run_separately():
+    async def run():
+        flight = SingleFlight()
+        first, second = Call("first"), Call("second")
+        first.release.set()
+        second.release.set()
+
+        results = await asyncio.gather(
+            flight.do("first", first), flight.do("second", second)
+        )
+
+        assert results == ["first", "second"]
+        assert first.calls == second.calls == 1
+
+    asyncio.run(run())
+
+
+def test_key_is_forgotten_after_completion():
+    async def run():
+        flight, call = SingleFlight(), Call()
+        call.release.set()
+
+        await flight.do("key", call)
+        await flight.do("key", call)
+
+        assert call.calls == 2
+        assert flight._inflight == {}
+        assert flight._waiters == {}
+
+    asyncio.run(run())
+
+
+def test_error_reaches_every_caller_and_forgets_key():
+    async def run():
+        flight, call = SingleFlight(), Call(error=RuntimeError("failed"))
+        waiters = [asyncio.create_task(flight.do("key", call)) for _ in range(2)]
+        await settle()
+
+        call.release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert flight._inflight == {}
+
+    asyncio.run(run())
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    async def run():
+        flight, call = SingleFlight(), Call()
+        first = asyncio.create_task(flight.do("key", call))
+        second = asyncio.create_task(flight.do("key", call))
+        await settle()
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        call.release.set()
+
+        assert await second == "result"
+        assert not call.cancelled
+
+    asyncio.run(run())
+
+
+def test_last_cancelled_caller_cancels_call():
+    async def run():
+        flight, call = SingleFlight(), Call()
+        waiters = [asyncio.create_task(flight.do("key", call)) for _ in range(2)]
+        await settle()
+
+        for waiter in waiters:
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        await settle()
+
+        assert call.cancelled
+        assert flight._inflight == {}
+        assert flight._waiters == {}
+
+    asyncio.run(run())
@@ -0,0 +1,139 @@
+import asyncio
+from types import SimpleNamespace
+
+from little_turtle.agents.historical_events_agent import HistoricalEvents
+from little_turtle.controlles.stories_controller import StoriesController
+
+DATE = "01.11.2025"
+TOPICS = ["The first turtle landed on the Moon"]
+CHAT_ID = 1
+
+
+class FakeStoryAgent:
+    def __init__(self):
+        self.runs = 0
+        self.streams = 0
+        self.release = asyncio.Event()
+
+    async def run(self, prompt_vars) -> str:
+        self.runs += 1
+        story = f"pooled story {self.runs}"
+        await self.release.wait()
+        return story
+
+    async def stream(self, prompt_vars):
+        self.streams += 1
+        for chunk in ("streamed ", "story"):
+            yield chunk
+
+
+class FakeEventsCache:
+    def __init__(self, events: list[str]):
+        self.events = events
+
+    async def get(self, *args) -> str:
+        return HistoricalEvents(events=self.events).model_dump_json()
+
+
+def create_controller(story_agent: FakeStoryAgent, **services) -> StoriesController:
+    config = SimpleNamespace(
+        GENERATION_LANGUAGE="English",
+        STORY_POOL_SIZE=2,
+        DRAFT_PROVIDER_CONCURRENCY=1,
+    )
+    return StoriesController(
+        config,
+        story_agent,
+        image_agent=services.get("image_agent"),
+        historical_events_agent=services.get("historical_events_agent"),
+        telegram_service=services.get("telegram_service"),
+        historical_events_cache=services.get("historical_events_cache"),
+        historical_events_service=services.get("historical_events_service"),
+        drafts_storage=services.get("drafts_storage"),
+    )
+
+
+async def collect(controller: StoriesController) -> str:
+    chunks = [
+        chunk async for chunk in controller.stream_story(DATE, TOPICS, chat_id=CHAT_ID)
+    ]
+    return "".join(chunks)
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_first_stream_refills_pool_only_after_story():
+    async def run():
+        agent = FakeStoryAgent()
+        controller = create_controller(agent)
+
+        chunks = controller.stream_story(DATE, TOPICS, chat_id=CHAT_ID)
+        assert await anext(chunks) == "streamed "
+        await settle()
+        assert agent.runs == 0
+
+        assert [chunk async for chunk in chunks] == ["story"]
+        await settle()
+
+        assert agent.streams == 1
+        assert agent.runs == 2
+        controller.discard_story_pool(CHAT_ID)
+
+    asyncio.run(run())
+
+
+def test_stream_awaits_pending_candidate():
+    async def run():
+        agent = FakeStoryAgent()
+        controller = create_controller(agent)
+        await collect(controller)
+
+        story = asyncio.create_task(collect(controller))
+        await settle()
+        agent.release.set()
+
+        assert await story == "pooled story 1"
+        assert agent.streams == 1
+        # The taken candidate is replaced, nothing else is generated
+        assert agent.runs == 3
+        controller.discard_story_pool(CHAT_ID)
+
+    asyncio.run(run())
+
+
+def test_stream_takes_ready_candidate():
+    async def run():
+        agent = FakeStoryAgent()
+        controller = create_controller(agent)
+        await collect(controller)
+        agent.release.set()
+        await settle()
+
+        assert await collect(controller) == "pooled story 1"
+        assert agent.streams == 1
+        controller.discard_story_pool(CHAT_ID)
+
+    asyncio.run(run())
+
+
+def test_draft_without_topics_fails_with_clear_error():
+    async def get_draft(date):
+        return None
+
+    async def get_prompt_version():
+        return "latest"
+
+    controller = create_controller(
+        FakeStoryAgent(),
+        historical_events_agent=SimpleNamespace(get_prompt_version=get_prompt_version),
+        historical_events_cache=FakeEventsCache([]),
+        drafts_storage=SimpleNamespace(get=get_draft),
+    )
+
+    drafts = asyncio.run(controller.prepare_drafts([DATE]))
+
+    assert isinstance(drafts[DATE], ValueError)
+    assert str(drafts[DATE]) == f"No topics were found for {DATE}"